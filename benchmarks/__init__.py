@@ -0,0 +1 @@
+# Benchmarks of core user journeys, run with python -m benchmarks
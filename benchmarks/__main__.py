@@ -0,0 +1,99 @@
+import argparse
+import platform
+import sys
+from importlib.metadata import version
+
+from playwright.sync_api import sync_playwright
+
+from benchmarks.journeys import JOURNEYS
+from benchmarks.runner import BenchmarkRunner, compare, load_baseline, write_results
+from standin import FaultProfile, StandinServer
+from utils.settings import CONTEXT_OPTIONS, LIVE_BASE_URL
+
+
+def main() -> int:
+    """Time the core journeys and compare them with the baseline"""
+    parser = argparse.ArgumentParser(description="Benchmark core SauceDemo user journeys")
+    parser.add_argument("--target", choices=("live", "local"), default="local",
+                        help="Benchmark www.saucedemo.com (live) or the bundled stand-in server (local)")
+    parser.add_argument("--standin-config", help="Fault profile for --target=local")
+    parser.add_argument("--journeys", default=",".join(JOURNEYS),
+                        help=f"Comma separated journeys, default all of {', '.join(JOURNEYS)}")
+    parser.add_argument("--runs", type=int, default=10, help="Timed runs per journey and phase")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed runs priming the warm context")
+    parser.add_argument("--items", type=int, default=3, help="Products added to the cart")
+    parser.add_argument("--baseline", default="benchmarks/baseline.json", help="Baseline results to compare with")
+    parser.add_argument("--update-baseline", action="store_true", help="Save these results as the new baseline")
+    parser.add_argument("--output", default="reports/benchmarks.json", help="Where to write these results")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Significance level of the regression test")
+    parser.add_argument("--min-slowdown", type=float, default=0.05,
+                        help="Smallest median slowdown counted as a regression, 0.05 is 5%%")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.journeys.split(",") if name not in JOURNEYS]
+    if unknown:
+        parser.error(f"unknown journeys: {', '.join(unknown)}")
+    journeys = [JOURNEYS[name] for name in args.journeys.split(",")]
+
+    server = None
+    base_url = LIVE_BASE_URL
+    if args.target == "local":
+        server = StandinServer(profile=FaultProfile.load(args.standin_config) if args.standin_config else FaultProfile())
+        server.start()
+        base_url = server.url
+
+    environment = {
+        "target": args.target,
+        "items": args.items,
+        "runs": args.runs,
+        "warmup": args.warmup,
+        "playwright": version("playwright"),
+        "python": platform.python_version(),
+        "platform": platform.platform()
+    }
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=not args.headed)
+            runner = BenchmarkRunner(browser, base_url, CONTEXT_OPTIONS, args.runs, args.warmup, args.items)
+            results = runner.run(journeys)
+            browser.close()
+    finally:
+        if server is not None:
+            server.stop()
+
+    write_results(args.output, environment, results)
+    print(f"{'journey':<14}{'phase':<7}{'median ms':>11}{'p95 ms':>10}{'stdev ms':>10}")
+    for name, phases in results.items():
+        for phase, result in phases.items():
+            summary = result["summary"]
+            print(f"{name:<14}{phase:<7}{summary['median']:>11.1f}{summary['p95']:>10.1f}"
+                  f"{summary['variance'] ** 0.5:>10.1f}")
+
+    baseline = load_baseline(args.baseline)
+    regressions = []
+    if baseline:
+        mismatched = [
+            key for key in ("target", "items", "playwright")
+            if baseline.get("environment", {}).get(key) != environment[key]
+        ]
+        if mismatched:
+            print(f"warning: baseline differs in {', '.join(mismatched)}, comparison may not be meaningful")
+        for finding in compare(baseline, results, args.alpha, args.min_slowdown):
+            verdict = "REGRESSION" if finding["regression"] else "ok"
+            print(f"{finding['journey']:<14}{finding['phase']:<7}{finding['change']:>+8.1%}  "
+                  f"p={finding['p_value']:.4f}  {verdict}")
+            if finding["regression"]:
+                regressions.append(finding)
+    else:
+        print(f"no baseline at {args.baseline}")
+
+    if args.update_baseline:
+        write_results(args.baseline, environment, results)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from playwright.sync_api import Page
+
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutPage
+from pages.inventory_page import InventoryPage
+from pages.login_page import LoginPage
+from utils.auth_cache import DEFAULT_PASSWORD, DEFAULT_USER
+
+
+URL_TIMEOUT = 10000
+
+
+@dataclass(frozen=True)
+class Journey:
+    """User journey timed by the benchmark runner, prepare runs untimed before run"""
+    name: str
+    prepare: Callable[[Page, str, int], None]
+    run: Callable[[Page, str, int], None]
+
+
+def open_login(page: Page, base_url: str, items: int):
+    """Open login page"""
+    LoginPage(page).navigate(base_url)
+
+
+def login(page: Page, base_url: str, items: int):
+    """Login as the default user and wait for inventory"""
+    LoginPage(page).login(DEFAULT_USER, DEFAULT_PASSWORD)
+    page.wait_for_url("**/inventory.html", timeout=URL_TIMEOUT)
+
+
+def logged_in(page: Page, base_url: str, items: int):
+    """Open login page and login"""
+    open_login(page, base_url, items)
+    login(page, base_url, items)
+
+
+def add_to_cart(page: Page, base_url: str, items: int):
+    """Add the first items products and wait for the badge to count them"""
+    inventory_page = InventoryPage(page)
+    for index in range(items):
+        inventory_page.add_product_to_cart(index)
+    inventory_page.wait_until(
+        "(expected) => document.querySelector('.shopping_cart_badge')?.textContent === String(expected)",
+        arg=items, description=f"cart badge {items}"
+    )
+
+
+def logged_in_with_cart(page: Page, base_url: str, items: int):
+    """Login and fill the cart"""
+    logged_in(page, base_url, items)
+    add_to_cart(page, base_url, items)
+
+
+def review_cart(page: Page, base_url: str, items: int):
+    """Open cart and read every item"""
+    InventoryPage(page).click_cart()
+    page.wait_for_url("**/cart.html", timeout=URL_TIMEOUT)
+    cart_items = CartPage(page).get_cart_items()
+    assert len(cart_items) == items, f"Expected {items} cart items, got {len(cart_items)}"
+
+
+def ready_for_checkout(page: Page, base_url: str, items: int):
+    """Login, fill the cart and open it"""
+    logged_in_with_cart(page, base_url, items)
+    InventoryPage(page).click_cart()
+    page.wait_for_url("**/cart.html", timeout=URL_TIMEOUT)
+
+
+def checkout(page: Page, base_url: str, items: int):
+    """Go from cart through both checkout steps to the complete page"""
+    CartPage(page).proceed_to_checkout()
+    page.wait_for_url("**/checkout-step-one.html", timeout=URL_TIMEOUT)
+    checkout_page = CheckoutPage(page)
+    checkout_page.fill_checkout_info("John", "Doe", "12345")
+    checkout_page.continue_checkout()
+    page.wait_for_url("**/checkout-step-two.html", timeout=URL_TIMEOUT)
+    checkout_page.finish_checkout()
+    page.wait_for_url("**/checkout-complete.html", timeout=URL_TIMEOUT)
+    assert checkout_page.is_order_complete(), "Order should be complete"
+
+
+JOURNEYS = {
+    journey.name: journey for journey in (
+        Journey("login", open_login, login),
+        Journey("add_to_cart", logged_in, add_to_cart),
+        Journey("cart_review", logged_in_with_cart, review_cart),
+        Journey("checkout", ready_for_checkout, checkout)
+    )
+}
@@ -0,0 +1,112 @@
+import json
+import time
+from pathlib import Path
+from typing import Iterable, List
+
+from playwright.sync_api import Browser, BrowserContext
+
+from benchmarks.journeys import Journey
+from utils.context_pool import CLEAR_STORAGE_SCRIPT
+from utils.stats import mann_whitney_u, summarize
+
+
+PHASES = ("cold", "warm")
+
+
+class BenchmarkRunner:
+    """Times journeys in fresh contexts (cold) and in one context with a primed HTTP cache (warm)"""
+
+    def __init__(self, browser: Browser, base_url: str, context_options: dict = None,
+                 runs: int = 10, warmup: int = 2, items: int = 3):
+        self.browser = browser
+        self.base_url = base_url
+        self.context_options = context_options or {}
+        self.runs = runs
+        self.warmup = warmup
+        self.items = items
+
+    def measure(self, journey: Journey) -> dict:
+        """Get cold and warm samples of journey in ms"""
+        cold = []
+        for _ in range(self.runs):
+            context = self.browser.new_context(**self.context_options)
+            try:
+                cold.append(self._sample(context, journey))
+            finally:
+                context.close()
+        warm = []
+        context = self.browser.new_context(**self.context_options)
+        try:
+            for run in range(self.warmup + self.runs):
+                sample = self._sample(context, journey)
+                if run >= self.warmup:
+                    warm.append(sample)
+        finally:
+            context.close()
+        return {"cold": cold, "warm": warm}
+
+    def run(self, journeys: Iterable[Journey]) -> dict:
+        """Measure journeys and get results with raw samples and summaries"""
+        results = {}
+        for journey in journeys:
+            samples = self.measure(journey)
+            results[journey.name] = {
+                phase: {"samples": samples[phase], "summary": summarize(samples[phase])} for phase in PHASES
+            }
+        return results
+
+    def _sample(self, context: BrowserContext, journey: Journey) -> float:
+        """Prepare journey on a new page, time its run and clear session state, keeping the HTTP cache"""
+        page = context.new_page()
+        try:
+            journey.prepare(page, self.base_url, self.items)
+            start = time.perf_counter()
+            journey.run(page, self.base_url, self.items)
+            elapsed = (time.perf_counter() - start) * 1000
+            page.evaluate(CLEAR_STORAGE_SCRIPT)
+        finally:
+            page.close()
+        context.clear_cookies()
+        return elapsed
+
+
+def compare(baseline: dict, results: dict, alpha: float = 0.01, min_slowdown: float = 0.05) -> List[dict]:
+    """Compare results with baseline, flagging significant slowdowns
+
+    A journey phase regresses when Mann-Whitney U says the new samples are larger
+    with p < alpha and the median grew by more than min_slowdown.
+    """
+    findings = []
+    for name, phases in results.items():
+        for phase, result in phases.items():
+            base = baseline.get("journeys", {}).get(name, {}).get(phase)
+            if base is None:
+                continue
+            _, p_value = mann_whitney_u(base["samples"], result["samples"])
+            base_median = base["summary"]["median"]
+            change = result["summary"]["median"] / base_median - 1 if base_median else 0.0
+            findings.append({
+                "journey": name,
+                "phase": phase,
+                "baseline_median": base_median,
+                "median": result["summary"]["median"],
+                "change": change,
+                "p_value": p_value,
+                "regression": p_value < alpha and change > min_slowdown
+            })
+    return findings
+
+
+def load_baseline(path: str) -> dict:
+    """Get baseline file, empty when missing"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_results(path: str, environment: dict, results: dict):
+    """Write results with the environment they were measured in"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"environment": environment, "journeys": results}, indent=2), encoding="utf-8")
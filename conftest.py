@@ -2,41 +2,531 @@ import pytest
 from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
 import os
 from datetime import datetime
+from pathlib import Path
+
+from pages import instrumentation, read_only
+from pages.web_vitals import VITALS_INIT_SCRIPT, collect_vitals
+from standin import FaultProfile, StandinServer
+from utils.action_timings import ActionTimings
+from utils.async_sessions import AsyncSessionRunner
+from utils.auth_cache import AuthStateCache, auth_user
+from utils.browser_server import STATE_FILE as BROWSER_SERVER_STATE, connect_browser, read_state
+from utils.context_pool import ContextPool
+from utils.dom_baselines import DomBaselines
+from utils.duration_scheduling import DurationSchedulingPlugin, group_shared_setup
+from utils.failure_traces import FailureTracer, FailureTraceSummary
+from utils.har_network import HarNetwork, MATCHING, MODES, SCOPES
+from utils.impact import INDEX_FILE as IMPACT_INDEX, ImpactIndex, ImpactIndexWriter, ImpactRecorder, ImpactSelection
+from utils.network_cache import AssetCache, ResourceRouter
+from utils.result_shards import ResultRun, ResultShardWriter
+from utils.scenarios import ScenarioPages, ScenarioSource
+from utils.selector_audit import SelectorAuditPlugin
+from utils.settings import CONTEXT_OPTIONS, LIVE_BASE_URL
+from utils.state_seeding import seed, verify_seeded
+from utils.watch import WARM_SESSION
+from utils.web_vitals import PerformanceBudgets, WebVitalsSummary
+
+
+context_pool_key = pytest.StashKey[ContextPool]()
+resource_router_key = pytest.StashKey[ResourceRouter]()
+har_network_key = pytest.StashKey[HarNetwork]()
+action_timings_key = pytest.StashKey[ActionTimings]()
+web_vitals_key = pytest.StashKey[WebVitalsSummary]()
+perf_budgets_key = pytest.StashKey[PerformanceBudgets]()
+failure_traces_key = pytest.StashKey[FailureTraceSummary]()
+browser_server_key = pytest.StashKey[dict]()
+phase_reports_key = pytest.StashKey[dict]()
+impact_recorder_key = pytest.StashKey[ImpactRecorder]()
+impact_selection_key = pytest.StashKey[ImpactSelection]()
+scenario_pages_key = pytest.StashKey[ScenarioPages]()
+dom_baselines_key = pytest.StashKey[DomBaselines]()
+vitals_offset_key = pytest.StashKey[int]()
+
+
+def warm_session(config):
+    """Get objects kept open across runs by python -m utils.watch, None in a normal run"""
+    return config.pluginmanager.get_plugin(WARM_SESSION)
+
+
+def web_vitals_enabled(config) -> bool:
+    """Check if navigation timing is collected, budgets imply it"""
+    return config.getoption("--web-vitals") or bool(config.getoption("--perf-budgets"))
 
 
 @pytest.fixture(scope="session")
-def browser():
-    """Create browser instance for the session"""
+def browser(request):
+    """Create browser instance for the session, or connect to the persistent one with --reuse-browser"""
+    warm = warm_session(request.config)
+    if warm is not None:
+        # Owned by the watch runner, it stays open for the next run
+        yield warm.browser
+        return
     playwright = sync_playwright().start()
-    browser = playwright.chromium.launch(headless=True)
+    if request.config.getoption("--reuse-browser"):
+        # Closing a connected browser only disconnects, the server keeps running for the next session
+        browser, info = connect_browser(playwright, request.config.getoption("--browser-server-state"))
+        request.config.stash[browser_server_key] = info
+    else:
+        browser = playwright.chromium.launch(headless=True)
     yield browser
     browser.close()
     playwright.stop()
 
 
+@pytest.fixture(scope="session")
+def context_options(request):
+    """Options for every browser context created on this worker"""
+    options = dict(CONTEXT_OPTIONS)
+    if request.config.getoption("--network") != "live":
+        # Service worker requests bypass routing, so HAR archives would miss them
+        options["service_workers"] = "block"
+    return options
+
+
+def phase_failed(item) -> bool:
+    """Check if setup or call of the test failed so far"""
+    reports = item.stash.get(phase_reports_key, {})
+    return any(report.failed for report in reports.values())
+
+
 @pytest.fixture
-def context(browser):
-    """Create a new browser context for each test"""
-    context = browser.new_context(
-        viewport={"width": 1280, "height": 720},
-        ignore_https_errors=True
+def context(browser, context_options, resource_router, har_network, failure_tracer, request):
+    """Create a new browser context for each test, or reuse a reset one from the pool"""
+    storage_state = None
+    if "logged_in_page" in request.fixturenames:
+        auth_cache = request.getfixturevalue("auth_cache")
+        storage_state = auth_cache.storage_state(auth_user(request.node))
+    router = resource_router
+    har = har_network
+    use_pool = (
+        request.config.getoption("--context-pool")
+        and har is None
+        and not request.node.get_closest_marker("fresh_context")
     )
+    if use_pool:
+        pool = request.getfixturevalue("context_pool")
+        context = pool.acquire(storage_state)
+    else:
+        options = dict(context_options)
+        if storage_state is not None:
+            options["storage_state"] = storage_state
+        context = browser.new_context(**options)
+        if web_vitals_enabled(request.config):
+            add_web_vitals(context)
+        if router is not None:
+            router.install(context)
+        if har is not None:
+            har.attach(context, request.node.nodeid)
+    tracer = failure_tracer
+    if tracer is not None:
+        trace_start_ms = tracer.begin(context, request.node.nodeid)
     yield context
-    context.close()
+    if tracer is not None:
+        # Before the pool resets the context or it is closed, both would lose the chunk
+        trace = tracer.end(context, request.node.nodeid, phase_failed(request.node))
+        trace["overhead_ms"] += trace_start_ms
+        request.node.user_properties.append(("tracing", trace))
+    if use_pool:
+        pool.release(context)
+    else:
+        context.close()
+    if router is not None:
+        request.node.user_properties.append(("network", router.take_stats()))
+    if har is not None:
+        unmatched = har.take_unmatched(request.node.nodeid)
+        if unmatched:
+            request.node.user_properties.append(("har_unmatched", unmatched))
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser, context_options, resource_router, request):
+    """Pre-warmed contexts shared by every test on this worker"""
+    pool = ContextPool(
+        browser, context_options, size=request.config.getoption("--context-pool"),
+        setup=resource_router.install if resource_router is not None else None,
+        init=add_web_vitals if web_vitals_enabled(request.config) else None
+    )
+    pool.warm()
+    request.config.stash[context_pool_key] = pool
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def resource_router(request):
+    """Resource blocking and static asset cache shared by every context on this worker"""
+    blocked = [name for name in request.config.getoption("--block-resources").split(",") if name]
+    cache_dir = request.config.getoption("--asset-cache")
+    if not blocked and not cache_dir:
+        return None
+    router = ResourceRouter(blocked, AssetCache(cache_dir) if cache_dir else None)
+    request.config.stash[resource_router_key] = router
+    return router
+
+
+@pytest.fixture(scope="session")
+def har_network(request):
+    """HAR recorder or replayer for --network=record|replay, None when live"""
+    mode = request.config.getoption("--network")
+    if mode == "live":
+        yield None
+        return
+    har = HarNetwork(
+        mode,
+        request.config.getoption("--har-dir"),
+        scope=request.config.getoption("--har-scope"),
+        matching=request.config.getoption("--har-match"),
+        worker_id=os.environ.get("PYTEST_XDIST_WORKER", "master")
+    )
+    request.config.stash[har_network_key] = har
+    yield har
+    har.finish()
+
+
+@pytest.fixture(scope="session")
+def failure_tracer(request):
+    """Per-test trace chunks kept only for failed tests, None without --trace-on-failure"""
+    if not request.config.getoption("--trace-on-failure"):
+        yield None
+        return
+    tracer = FailureTracer(
+        request.config.getoption("--trace-dir"),
+        retain=request.config.getoption("--trace-retain"),
+        history=request.config.getoption("--trace-history"),
+        buffer_bytes=request.config.getoption("--trace-buffer-mb") * 1024 * 1024
+    )
+    yield tracer
+    tracer.close()
+
+
+def add_web_vitals(context: BrowserContext):
+    """Record navigation timing in every page of context"""
+    context.add_init_script(VITALS_INIT_SCRIPT)
+
+
+def setup_context(router: ResourceRouter, har: HarNetwork):
+    """Get callback installing routing on contexts created outside the context fixture"""
+    def setup(context, label):
+        if router is not None:
+            router.install(context)
+        if har is not None:
+            har.attach(context, label)
+    return setup
 
 
 @pytest.fixture
-def page(context):
-    """Create a new page for each test"""
-    page = context.new_page()
+def page(request):
+    """Create a new page for each test, or hand read_only tests the page their class shares"""
+    if request.node.get_closest_marker("read_only"):
+        if {"seed_state", "logged_in_page"} & set(request.fixturenames):
+            pytest.fail("read_only tests get their page prepared by the marker, drop seed_state and logged_in_page")
+        page = request.getfixturevalue("shared_page")
+        if web_vitals_enabled(request.config):
+            # Navigations before this test, the seed included, belong to the tests before it
+            request.node.stash[vitals_offset_key] = len(collect_vitals(page))
+        tracer = request.getfixturevalue("failure_tracer")
+        if tracer is not None:
+            trace_start_ms = tracer.begin(page.context, request.node.nodeid)
+        yield page
+        if tracer is not None:
+            trace = tracer.end(page.context, request.node.nodeid, phase_failed(request.node))
+            trace["overhead_ms"] += trace_start_ms
+            request.node.user_properties.append(("tracing", trace))
+        har = request.getfixturevalue("har_network")
+        if har is not None:
+            # The class context records under the class node id, each test takes what arrived during it
+            owner = request.node.getparent(pytest.Class) or request.node.getparent(pytest.Module)
+            unmatched = har.take_unmatched(owner.nodeid)
+            if unmatched:
+                request.node.user_properties.append(("har_unmatched", unmatched))
+        return
+    page = request.getfixturevalue("context").new_page()
     yield page
     page.close()
 
 
-@pytest.fixture
-def base_url():
+@pytest.fixture(scope="class")
+def shared_page(browser, context_options, base_url, resource_router, har_network, request):
+    """Page seeded once per class from its read_only marker, mutating page-object calls fail on it"""
+    marker = request.node.get_closest_marker("read_only")
+    kwargs = marker.kwargs if marker is not None else {}
+    context = browser.new_context(**context_options)
+    if web_vitals_enabled(request.config):
+        add_web_vitals(context)
+    setup_context(resource_router, har_network)(context, request.node.nodeid)
+    page = context.new_page()
+    state = seed(page, base_url, auth_user(request.node), kwargs.get("cart", ()), kwargs.get("at", "inventory"))
+    if not request.config.getoption("--skip-seed-verification"):
+        verify_seeded(page, state)
+    read_only.guard(page)
+    yield page
+    read_only.release(page)
+    context.close()
+
+
+@pytest.fixture(scope="session")
+def base_url(request):
     """Base URL for the application"""
-    return "https://www.saucedemo.com/"
+    if request.config.getoption("--target") == "local":
+        return request.getfixturevalue("standin_server").url
+    return LIVE_BASE_URL
+
+
+@pytest.fixture(scope="session")
+def standin_server(request):
+    """Local SauceDemo stand-in, one per worker"""
+    config_path = request.config.getoption("--standin-config")
+    
+    def start():
+        server = StandinServer(profile=FaultProfile.load(config_path) if config_path else FaultProfile())
+        server.start()
+        return server
+    warm = warm_session(request.config)
+    if warm is not None:
+        # Same URL on every watch run, so cached logins stay valid
+        yield warm.keep(("standin", config_path), start)
+        return
+    server = start()
+    yield server
+    server.stop()
+
+
+def pytest_addoption(parser):
+    """Add command line options"""
+    parser.addoption(
+        "--target", choices=("live", "local"), default="live",
+        help="Run against www.saucedemo.com (live) or the bundled stand-in server (local)"
+    )
+    parser.addoption(
+        "--standin-config", default=None,
+        help="JSON file with latency, jitter and error injection rules for --target=local"
+    )
+    parser.addoption(
+        "--block-resources", default="", metavar="TYPES",
+        help="Comma separated resource types to abort, e.g. image,font,media"
+    )
+    parser.addoption(
+        "--asset-cache", default=None, metavar="DIR",
+        help="Serve repeated images, fonts, scripts and stylesheets from a content-addressed cache in DIR"
+    )
+    parser.addoption(
+        "--context-pool", type=int, default=0, metavar="SIZE",
+        help="Reuse up to SIZE pre-warmed browser contexts per worker, reset between tests"
+    )
+    parser.addoption(
+        "--network", choices=MODES, default="live",
+        help="Use the network (live), record traffic to HAR archives (record) or replay them (replay)"
+    )
+    parser.addoption(
+        "--har-dir", default="hars", metavar="DIR",
+        help="Directory of HAR archives for --network=record|replay"
+    )
+    parser.addoption(
+        "--har-scope", choices=SCOPES, default="test",
+        help="One archive per test (test) or one merged archive per worker (shared)"
+    )
+    parser.addoption(
+        "--har-match", choices=MATCHING, default="strict",
+        help="Replay exact URLs only (strict) or fall back to URLs ignoring the query string (lenient)"
+    )
+    parser.addoption(
+        "--instrument-actions", action="store_true", default=False,
+        help="Time every BasePage action and report the slowest ones"
+    )
+    parser.addoption(
+        "--actions-json", default="reports/actions.json", metavar="PATH",
+        help="Where --instrument-actions writes per-test and per-selector timings"
+    )
+    parser.addoption(
+        "--skip-seed-verification", action="store_true", default=False,
+        help="Trust seed_state without checking that the app shows the seeded session and cart"
+    )
+    parser.addoption(
+        "--duration-schedule", action="store_true", default=False,
+        help="Remember test durations and run the longest tests first across -n workers, "
+             "keeping xdist_group tests on one worker"
+    )
+    parser.addoption(
+        "--web-vitals", action="store_true", default=False,
+        help="Record navigation timing, LCP, CLS and long tasks of every page load"
+    )
+    parser.addoption(
+        "--perf-budgets", default=None, metavar="PATH",
+        help="JSON budgets per page object, e.g. {\"InventoryPage\": {\"lcp\": 2500}}, failing tests over them"
+    )
+    parser.addoption(
+        "--web-vitals-json", default="reports/web-vitals.json", metavar="PATH",
+        help="Where the run summary of --web-vitals is written, medians are appended to a -history.jsonl next to it"
+    )
+    parser.addoption(
+        "--trace-on-failure", action="store_true", default=False,
+        help="Trace every test with screenshots and DOM snapshots, keeping the trace only when it fails"
+    )
+    parser.addoption(
+        "--trace-dir", default="reports/traces", metavar="DIR",
+        help="Where --trace-on-failure saves traces of failed tests"
+    )
+    parser.addoption(
+        "--trace-retain", type=int, default=10, metavar="N",
+        help="Save traces of at most N failed tests per worker, later failures are not traced"
+    )
+    parser.addoption(
+        "--trace-history", type=int, default=0, metavar="N",
+        help="Also keep traces of the N tests before each failure in a tmpfs ring buffer and save them with it"
+    )
+    parser.addoption(
+        "--trace-buffer-mb", type=int, default=64, metavar="MB",
+        help="Size limit of the --trace-history ring buffer per worker"
+    )
+    parser.addoption(
+        "--reuse-browser", action="store_true", default=False,
+        help="Connect to a long-lived browser server, launching it on first use, instead of starting Chromium"
+    )
+    parser.addoption(
+        "--browser-server-state", default=BROWSER_SERVER_STATE, metavar="PATH",
+        help="State file recording the endpoint of the --reuse-browser server"
+    )
+    parser.addoption(
+        "--results-dir", default=None, metavar="DIR",
+        help="Stream one JSON line per test to a shard per worker under DIR/<run id>"
+    )
+    parser.addoption(
+        "--dashboard-dir", default=None, metavar="DIR",
+        help="Merge --results-dir runs into the dashboard in DIR when the session ends"
+    )
+    parser.addoption(
+        "--dom-baselines", default="tests/dom_baselines", metavar="DIR",
+        help="Structural DOM baselines of the page-object regions, one sub-directory per --target"
+    )
+    parser.addoption(
+        "--update-dom-baselines", action="store_true", default=False,
+        help="Record the current DOM regions as the new baselines instead of comparing"
+    )
+    parser.addoption(
+        "--audit-selectors", action="store_true", default=False,
+        help="Profile every page-object selector constant after the tests, from the controller, and rank them in the terminal summary"
+    )
+    parser.addoption(
+        "--selector-audit-json", default="reports/selector-audit.json", metavar="PATH",
+        help="Where --audit-selectors writes the full report"
+    )
+    parser.addoption(
+        "--record-impact", action="store_true", default=False,
+        help="Record the page-object methods each test calls into the --impact-index"
+    )
+    parser.addoption(
+        "--impact-index", default=IMPACT_INDEX, metavar="PATH",
+        help="Test to page-object method index used by --changed-since"
+    )
+    parser.addoption(
+        "--changed-since", default=None, metavar="REF",
+        help="Only run tests the changes since git REF can affect according to the --impact-index"
+    )
+    parser.addoption(
+        "--impact-always", default="smoke", metavar="MARKERS",
+        help="Comma-separated markers of tests --changed-since always runs"
+    )
+
+
+@pytest.fixture(scope="session")
+def async_sessions(context_options):
+    """Async browser running concurrent user sessions on one event loop"""
+    runner = AsyncSessionRunner(context_options)
+    runner.start()
+    yield runner
+    runner.stop()
+
+
+@pytest.fixture(scope="session")
+def auth_cache(browser, base_url, context_options, resource_router, har_network, tmp_path_factory, request):
+    """Logged-in storage states shared by every test on this worker"""
+    warm = warm_session(request.config)
+    
+    def create(directory):
+        return AuthStateCache(
+            browser, base_url, directory, context_options,
+            context_setup=setup_context(resource_router, har_network)
+        )
+    if warm is not None:
+        return warm.keep(("auth", base_url), lambda: create(warm.new_directory()))
+    return create(tmp_path_factory.mktemp("auth"))
+
+
+@pytest.fixture(scope="session")
+def scenario_pages(browser, base_url, context_options, resource_router, har_network, request):
+    """Login and checkout pages every scenario row on this worker runs on"""
+    pages = ScenarioPages(browser, base_url, context_options, context_setup=setup_context(resource_router, har_network))
+    request.config.stash[scenario_pages_key] = pages
+    yield pages
+    pages.close()
+
+
+@pytest.fixture(scope="session")
+def dom_baselines(request):
+    """DOM region baselines of the --target, shared by every test on this worker"""
+    config = request.config
+    directory = config.rootpath / config.getoption("--dom-baselines") / config.getoption("--target")
+    baselines = DomBaselines(directory, update=config.getoption("--update-dom-baselines"))
+    config.stash[dom_baselines_key] = baselines
+    return baselines
+
+
+@pytest.fixture
+def assert_dom_unchanged(dom_baselines, request):
+    """Callable failing the test with a diff when regions of a page object differ from their baselines"""
+    if not dom_baselines.update and not dom_baselines.exist():
+        pytest.skip(
+            f"no DOM baselines for --target={request.config.getoption('--target')} in {dom_baselines.directory}, "
+            f"record them with --update-dom-baselines"
+        )
+    def assert_dom_unchanged(page_object, *regions):
+        problems = dom_baselines.check(page_object, *regions)
+        if problems:
+            pytest.fail("DOM structure changed:\n" + "\n\n".join(problems), pytrace=False)
+    return assert_dom_unchanged
+
+
+@pytest.fixture
+def scenario(request):
+    """Row of the scenarios marker's file, read when the test runs"""
+    row = request.param
+    request.node.user_properties.append(("scenario", {"file": row.source.path.name, "row": row.number}))
+    return row.load()
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize scenario with one test per row of the file given to the scenarios marker"""
+    marker = metafunc.definition.get_closest_marker("scenarios")
+    if marker is None or "scenario" not in metafunc.fixturenames:
+        return
+    rows = list(ScenarioSource(metafunc.config.rootpath / marker.args[0]).rows())
+    metafunc.parametrize("scenario", rows, indirect=True, ids=[row.id for row in rows])
+
+
+@pytest.fixture
+def logged_in_page(page, auth_cache, request):
+    """Page opened on inventory with the cached session of the test's auth user"""
+    auth_cache.open_inventory(page, auth_user(request.node))
+    return page
+
+
+@pytest.fixture
+def seed_state(page, base_url, request):
+    """Callable seeding session and cart of the test's auth user and deep-linking to a page"""
+    verify = not request.config.getoption("--skip-seed-verification")
+    
+    def seed_state(cart=(), at="inventory", user=None):
+        state = seed(page, base_url, user or auth_user(request.node), cart, at)
+        if verify:
+            verify_seeded(page, state)
+        return state
+    return seed_state
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items):
+    """Group tests sharing class-scoped setup before xdist's loadgroup reads the groups"""
+    group_shared_setup(items)
 
 
 def pytest_configure(config):
@@ -59,3 +549,229 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "checkout: mark test as checkout test"
     )
+    config.addinivalue_line(
+        "markers", "auth(user): log in as user through the cached storage state"
+    )
+    config.addinivalue_line(
+        "markers", "fresh_context: always create a new browser context, bypassing --context-pool"
+    )
+    config.addinivalue_line(
+        "markers", "scenarios(path): run the test once per row of a CSV or JSONL file, passed as scenario"
+    )
+    config.addinivalue_line(
+        "markers",
+        "read_only(cart=(), at='inventory'): tests of the class share one page seeded with cart at a page, "
+        "mutating page-object calls fail"
+    )
+    if config.getoption("--instrument-actions"):
+        instrumentation.enable()
+        if not hasattr(config, "workerinput"):
+            # Workers ship their summaries in reports, so only the controller aggregates
+            timings = ActionTimings(config.getoption("--actions-json"))
+            config.stash[action_timings_key] = timings
+            config.pluginmanager.register(timings, "action-timings")
+    if config.getoption("--duration-schedule") and not hasattr(config, "workerinput"):
+        if config.getoption("dist", "no") == "load":
+            # Makes workers tag xdist_group tests so the scheduler can keep each group together
+            config.option.dist = "loadgroup"
+        config.pluginmanager.register(DurationSchedulingPlugin(config), "duration-scheduling")
+    if config.getoption("--perf-budgets"):
+        config.stash[perf_budgets_key] = PerformanceBudgets.load(config.getoption("--perf-budgets"))
+    if web_vitals_enabled(config) and not hasattr(config, "workerinput"):
+        json_path = config.getoption("--web-vitals-json")
+        summary = WebVitalsSummary(json_path, json_path.rsplit(".", 1)[0] + "-history.jsonl")
+        config.stash[web_vitals_key] = summary
+        config.pluginmanager.register(summary, "web-vitals")
+    if config.getoption("--trace-on-failure") and not hasattr(config, "workerinput"):
+        traces = FailureTraceSummary()
+        config.stash[failure_traces_key] = traces
+        config.pluginmanager.register(traces, "failure-traces")
+    if config.getoption("--audit-selectors") and not hasattr(config, "workerinput"):
+        warm = warm_session(config)
+        config.pluginmanager.register(SelectorAuditPlugin(
+            config.getoption("--selector-audit-json"),
+            LIVE_BASE_URL if config.getoption("--target") == "live" else None,
+            CONTEXT_OPTIONS, config.getoption("--standin-config"),
+            warm.browser if warm is not None else None
+        ), "selector-audit")
+    if config.getoption("--results-dir"):
+        if hasattr(config, "workerinput"):
+            run_dir = config.workerinput["results_run_dir"]
+        else:
+            run = ResultRun(config, config.getoption("--results-dir"), config.getoption("--dashboard-dir"))
+            config.pluginmanager.register(run, "result-run")
+            run_dir = run.run_dir
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "master")
+        config.pluginmanager.register(ResultShardWriter(run_dir, worker), "result-shard")
+    index_path = config.rootpath / config.getoption("--impact-index")
+    if config.getoption("--record-impact"):
+        recorder = ImpactRecorder()
+        recorder.install()
+        config.stash[impact_recorder_key] = recorder
+        if not hasattr(config, "workerinput"):
+            config.pluginmanager.register(ImpactIndexWriter(ImpactIndex(index_path)), "impact-index")
+    if config.getoption("--changed-since"):
+        # Workers collect too and xdist needs their collections to match, so every process selects
+        selection = ImpactSelection(
+            config.getoption("--changed-since"), ImpactIndex(index_path), config.rootpath,
+            config.getoption("--impact-always").split(",")
+        )
+        config.stash[impact_selection_key] = selection
+        config.pluginmanager.register(selection, "impact-selection")
+
+
+def pytest_runtest_setup(item):
+    """Start timing actions and recording called page-object methods of the test from empty buffers"""
+    if instrumentation.active_recorder is not None:
+        instrumentation.active_recorder.clear()
+    recorder = item.config.stash.get(impact_recorder_key, None)
+    if recorder is not None:
+        recorder.clear()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    """Record action timings and called page-object methods of the test, fixtures included, before the teardown report"""
+    yield
+    if instrumentation.active_recorder is not None:
+        item.user_properties.append(("actions", instrumentation.active_recorder.summary()))
+    recorder = item.config.stash.get(impact_recorder_key, None)
+    if recorder is not None:
+        item.user_properties.append(("impact", recorder.take()))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Check performance budgets and attach user properties recorded by fixtures to the HTML report"""
+    outcome = yield
+    report = outcome.get_result()
+    item.stash.setdefault(phase_reports_key, {})[report.when] = report
+    page = getattr(item, "funcargs", {}).get("page")
+    if report.when == "call" and page is not None and web_vitals_enabled(item.config):
+        # The page is still open here, teardown has not run yet
+        records = collect_vitals(page)[item.stash.get(vitals_offset_key, 0):]
+        item.user_properties.append(("web_vitals", records))
+        budgets = item.config.stash.get(perf_budgets_key, None)
+        violations = budgets.violations(records) if budgets is not None and report.passed else []
+        if violations:
+            report.outcome = "failed"
+            report.longrepr = "Performance budget exceeded:\n" + "\n".join(violations)
+    pytest_html = item.config.pluginmanager.getplugin("html")
+    if pytest_html is None or report.when != "teardown":
+        return
+    extras = getattr(report, "extras", [])
+    report_dir = os.path.dirname(os.path.abspath(item.config.option.htmlpath or "report.html"))
+    for name, value in item.user_properties:
+        extras.append(pytest_html.extras.json(value, name=name))
+        if name == "tracing":
+            for path in value["paths"]:
+                link = os.path.relpath(os.path.abspath(path), report_dir)
+                extras.append(pytest_html.extras.url(link, name=os.path.basename(path)))
+    report.extras = extras
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Report browser server, context pool, network, HAR, action timing, web vitals, failure trace, DOM baseline, scenario and impact counters"""
+    server = config.stash.get(browser_server_key, None)
+    if server is None and config.getoption("--reuse-browser"):
+        # With -n the workers connected, so only the totals in the state file are known here
+        state = read_state(Path(config.getoption("--browser-server-state")))
+        if state:
+            terminalreporter.write_sep("-", "browser server")
+            terminalreporter.write_line(
+                f"{state['ws_endpoint']}: {state['reuses']} sessions reused it, saved {state['saved_seconds']:.1f} s"
+            )
+    if server is not None:
+        terminalreporter.write_sep("-", "browser server")
+        if server["reused"]:
+            terminalreporter.write_line(
+                f"reused {server['endpoint']}: connected in {server['connect_seconds']:.2f} s, "
+                f"saved {server['saved_seconds']:.2f} s ({server['total_saved_seconds']:.1f} s over "
+                f"{server['reuses']} sessions)"
+            )
+        else:
+            terminalreporter.write_line(
+                f"launched {server['endpoint']} in {server['launch_seconds']:.2f} s ({server['relaunch_reason']}), "
+                f"later sessions connect to it"
+            )
+    pool = config.stash.get(context_pool_key, None)
+    if pool is not None:
+        stats = pool.stats()
+        terminalreporter.write_sep("-", "context pool")
+        terminalreporter.write_line(
+            f"hits: {stats['hits']}, misses: {stats['misses']}, resets: {stats['resets']}, "
+            f"fresh fallbacks: {stats['fresh_fallbacks']}, avg create: {stats['avg_create_ms']:.1f} ms, "
+            f"avg reset: {stats['avg_reset_ms']:.1f} ms, saved: {stats['saved_ms'] / 1000:.2f} s"
+        )
+    har = config.stash.get(har_network_key, None)
+    if har is not None and (har.unmatched_counts or har.unmatched):
+        terminalreporter.write_sep("-", f"HAR {har.mode}: unmatched requests (listed in each test's report)")
+        counts = dict(har.unmatched_counts)
+        for label, requests in har.unmatched.items():
+            # Labels no fixture has taken
+            counts[label] = counts.get(label, 0) + len(requests)
+        for label, count in sorted(counts.items()):
+            terminalreporter.write_line(f"{label}: {count} unmatched")
+    router = config.stash.get(resource_router_key, None)
+    if router is not None:
+        totals = router.totals
+        terminalreporter.write_sep("-", "network")
+        terminalreporter.write_line(
+            f"requests: {totals['requests']}, blocked: {totals['blocked']}, "
+            f"cache hits: {totals['cache_hits']}, cache misses: {totals['cache_misses']}, "
+            f"saved: {totals['bytes_saved'] / 1024:.1f} KiB, fetched: {totals['bytes_fetched'] / 1024:.1f} KiB"
+        )
+    timings = config.stash.get(action_timings_key, None)
+    if timings is not None and timings.tests:
+        terminalreporter.write_sep("-", "slowest page actions")
+        for record in timings.slowest_actions(10):
+            terminalreporter.write_line(
+                f"{record['ms']:8.1f} ms  {record['owner']} -> {record['action']}({record['selector']})  {record['test']}"
+            )
+        terminalreporter.write_line(f"details: {timings.json_path}")
+    vitals = config.stash.get(web_vitals_key, None)
+    if vitals is not None and vitals.records:
+        terminalreporter.write_sep("-", "web vitals (median / p95)")
+        for page, summary in vitals.pages().items():
+            metrics = ", ".join(
+                f"{metric} {summary[metric]['median']:.3g}/{summary[metric]['p95']:.3g}"
+                for metric in ("ttfb", "load", "render", "lcp", "cls", "longTaskMs") if metric in summary
+            )
+            terminalreporter.write_line(f"{page}: {summary['navigations']} navigations, {metrics}")
+        terminalreporter.write_line(f"details: {vitals.json_path}")
+    traces = config.stash.get(failure_traces_key, None)
+    if traces is not None and traces.traced:
+        terminalreporter.write_sep("-", "failure traces")
+        terminalreporter.write_line(
+            f"traced: {len(traces.traced)} tests, saved: {len(traces.traces)}, over --trace-retain: {traces.dropped}, "
+            f"overhead: {traces.overhead_ms / 1000:.2f} s ({traces.overhead_percent():.1f}% of traced test time)"
+        )
+        for nodeid, paths in sorted(traces.traces.items()):
+            terminalreporter.write_line(f"{nodeid}: playwright show-trace {paths[0]}")
+    baselines = config.stash.get(dom_baselines_key, None)
+    if baselines is not None and (baselines.matched or baselines.mismatched or baselines.recorded or baselines.missing):
+        terminalreporter.write_sep("-", "DOM baselines")
+        terminalreporter.write_line(
+            f"matched: {baselines.matched}, changed: {baselines.mismatched}, missing: {baselines.missing}, "
+            f"recorded: {baselines.recorded} in {baselines.directory}"
+        )
+    scenarios = config.stash.get(scenario_pages_key, None)
+    if scenarios is not None and scenarios.rows:
+        stats = scenarios.stats()
+        terminalreporter.write_sep("-", "scenario pages")
+        terminalreporter.write_line(
+            f"rows: {stats['rows']} on {stats['pages']} pages, in-page resets: {stats['resets']}, "
+            f"reloads: {stats['reloads']}"
+        )
+    selection = config.stash.get(impact_selection_key, None)
+    if selection is not None:
+        terminalreporter.write_sep("-", f"impact since {selection.ref}")
+        if selection.run_all:
+            terminalreporter.write_line(f"ran every test: {selection.reason}")
+        else:
+            terminalreporter.write_line(
+                f"selected {selection.selected}, deselected {selection.deselected}; "
+                f"changed methods: {len(selection.methods)}, "
+                f"constants: {', '.join(sorted(selection.constants)) or 'none'}, "
+                f"test changes: {len(selection.test_prefixes)}"
+            )
@@ -0,0 +1 @@
+# Test run dashboard merged from streamed result shards, run with python -m dashboard
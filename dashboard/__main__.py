@@ -0,0 +1,24 @@
+import argparse
+import sys
+
+from dashboard.merge import merge_results
+
+
+def main() -> int:
+    """Merge result shards of new runs into the dashboard"""
+    parser = argparse.ArgumentParser(description="Build the test run dashboard from --results-dir shards")
+    parser.add_argument("--results", default="reports/results", help="Directory with one sub-directory per run")
+    parser.add_argument("--site", default="reports/dashboard", help="Dashboard directory, updated in place")
+    parser.add_argument("--keep-runs", type=int, default=100, help="Runs listed in the dashboard, 0 keeps all")
+    parser.add_argument("--history", type=int, default=50, help="Runs included in the per-test trends")
+    args = parser.parse_args()
+    if args.history < 1 or args.keep_runs < 0:
+        parser.error("--history must be at least 1 and --keep-runs not negative")
+
+    merged = merge_results(args.results, args.site, keep_runs=args.keep_runs, history=args.history)
+    print(f"merged {len(merged)} run(s) into {args.site}: {', '.join(merged) or 'nothing new'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import List, Tuple
+
+
+META_FILE = "meta.json"
+SHARD_PATTERN = "shard-*.jsonl"
+TEMPLATE = Path(__file__).with_name("index.html")
+# Failing tests listed in runs.json per run, the run index has all of them
+FAILURES_PER_RUN = 50
+FAILED = ("failed", "error")
+
+
+def detail_key(nodeid: str) -> str:
+    """Get file name stem of the detail file of a test"""
+    return hashlib.sha1(nodeid.encode("utf-8")).hexdigest()[:16]
+
+
+def read_json(path: Path, default):
+    """Load JSON file, default when it does not exist yet"""
+    if not path.exists():
+        return default
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_json(path: Path, data):
+    """Write compact JSON, creating parent directories"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, separators=(",", ":"), default=str), encoding="utf-8")
+
+
+def shard_bytes(run_dir: Path) -> int:
+    """Get combined size of the shards of a run, grows while the run is still going"""
+    return sum(shard.stat().st_size for shard in run_dir.glob(SHARD_PATTERN))
+
+
+def read_run(run_dir: Path) -> Tuple[dict, List[dict]]:
+    """Get metadata and test records of a run, skipping a line still being written"""
+    meta = read_json(run_dir / META_FILE, {})
+    tests = []
+    for shard in sorted(run_dir.glob(SHARD_PATTERN)):
+        with shard.open(encoding="utf-8") as lines:
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("type") == "test":
+                    tests.append(record)
+    return meta, tests
+
+
+def summarize_run(meta: dict, tests: List[dict], source_bytes: int) -> dict:
+    """Get the runs.json entry of a run"""
+    counts = {}
+    for test in tests:
+        counts[test["outcome"]] = counts.get(test["outcome"], 0) + 1
+    finished = meta.get("finished")
+    wall = (finished - meta["started"]) if finished else None
+    return {
+        "id": meta["id"],
+        "started": meta["started"],
+        "finished": finished,
+        "exitstatus": meta.get("exitstatus"),
+        "commit": meta.get("commit"),
+        "branch": meta.get("branch"),
+        "tests": len(tests),
+        "counts": counts,
+        "wall": wall,
+        "test_time": round(sum(test["duration"] for test in tests), 3),
+        "workers": sorted({test["worker"] for test in tests}),
+        "failures": [test["nodeid"] for test in tests if test["outcome"] in FAILED][:FAILURES_PER_RUN],
+        "source_bytes": source_bytes
+    }
+
+
+def write_run(site: Path, summary: dict, tests: List[dict]):
+    """Write the compact test index of a run and one detail file per test that has details"""
+    run_site = site / "runs" / summary["id"]
+    shutil.rmtree(run_site / "details", ignore_errors=True)
+    rows = []
+    for test in sorted(tests, key=lambda test: test["start"]):
+        row = {
+            "nodeid": test["nodeid"],
+            "outcome": test["outcome"],
+            "duration": test["duration"],
+            "worker": test["worker"]
+        }
+        if test.get("longrepr") or test.get("properties"):
+            row["detail"] = detail_key(test["nodeid"])
+            write_json(run_site / "details" / f"{row['detail']}.json", test)
+        rows.append(row)
+    write_json(run_site / "index.json", {"run": summary, "tests": rows})
+
+
+def merge_results(results_dir: str, site_dir: str, keep_runs: int = 100, history: int = 50) -> List[str]:
+    """Fold new or still growing runs of results_dir into the dashboard at site_dir, get their ids
+
+    Runs merged before and unchanged since are skipped, so the cost follows the new results,
+    not the history.
+    """
+    site = Path(site_dir)
+    runs = {run["id"]: run for run in read_json(site / "runs.json", {"runs": []})["runs"]}
+    trends = read_json(site / "tests.json", {"runs": [], "tests": {}})
+    merged = []
+    for run_dir in sorted(Path(results_dir).glob(f"*/{META_FILE}")):
+        run_dir = run_dir.parent
+        source_bytes = shard_bytes(run_dir)
+        known = runs.get(run_dir.name)
+        if known is not None and known["finished"] and known["source_bytes"] == source_bytes:
+            continue
+        meta, tests = read_run(run_dir)
+        if "id" not in meta:
+            continue
+        summary = summarize_run(meta, tests, source_bytes)
+        write_run(site, summary, tests)
+        runs[summary["id"]] = summary
+        outcomes = {test["nodeid"]: [summary["id"], test["outcome"], test["duration"]] for test in tests}
+        for entries in trends["tests"].values():
+            entries[:] = [entry for entry in entries if entry[0] != summary["id"]]
+        for nodeid, entry in outcomes.items():
+            trends["tests"].setdefault(nodeid, []).append(entry)
+        merged.append(summary["id"])
+
+    ordered = sorted(runs.values(), key=lambda run: run["started"])
+    for dropped in ordered[:-keep_runs] if keep_runs else []:
+        shutil.rmtree(site / "runs" / dropped["id"], ignore_errors=True)
+    ordered = ordered[-keep_runs:] if keep_runs else ordered
+    recent = [run["id"] for run in ordered[-history:]]
+    position = {run_id: index for index, run_id in enumerate(recent)}
+    tests = {}
+    for nodeid, entries in trends["tests"].items():
+        entries = sorted((entry for entry in entries if entry[0] in position), key=lambda entry: position[entry[0]])
+        if entries:
+            tests[nodeid] = entries
+    write_json(site / "runs.json", {"runs": ordered})
+    write_json(site / "tests.json", {"runs": recent, "tests": tests})
+    if not (site / "index.html").exists() or (site / "index.html").read_bytes() != TEMPLATE.read_bytes():
+        shutil.copyfile(TEMPLATE, site / "index.html")
+    return merged
@@ -0,0 +1 @@
+# Virtual-user load generation over the async page objects, run with python -m loadgen
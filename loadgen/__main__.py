@@ -0,0 +1,113 @@
+import argparse
+import multiprocessing
+import queue
+import sys
+import time
+
+from loadgen.results import LoadResults
+from loadgen.scenario import STEPS
+from loadgen.worker import LoadPlan, run_worker
+from standin import FaultProfile, StandinServer
+from utils.settings import CONTEXT_OPTIONS, LIVE_BASE_URL
+
+
+READY_TIMEOUT = 120
+
+
+def main() -> int:
+    """Run virtual users through the checkout flow and stream step latencies to a JSONL file"""
+    parser = argparse.ArgumentParser(description="Generate load with virtual users driving the page objects")
+    parser.add_argument("--base-url", help=f"Application URL, default {LIVE_BASE_URL}")
+    parser.add_argument("--target", choices=("live", "local"), default="live",
+                        help="Load www.saucedemo.com (live) or a bundled stand-in server (local)")
+    parser.add_argument("--standin-config", help="Fault profile for --target=local")
+    parser.add_argument("--users", type=int, default=10, help="Target number of concurrent virtual users")
+    parser.add_argument("--ramp-up", type=float, default=30, help="Seconds to start all users, evenly spaced")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to hold the full load after ramp-up")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes, each with its own browser")
+    parser.add_argument("--items", type=int, default=3, help="Products added to the cart per iteration")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds to pause after each step")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between streamed snapshots")
+    parser.add_argument("--output", default="reports/load.jsonl", help="JSONL results file")
+    args = parser.parse_args()
+    if args.users < 1 or args.processes < 1:
+        parser.error("--users and --processes must be at least 1")
+
+    server = None
+    base_url = args.base_url or LIVE_BASE_URL
+    if args.target == "local" and not args.base_url:
+        server = StandinServer(profile=FaultProfile.load(args.standin_config) if args.standin_config else FaultProfile())
+        server.start()
+        base_url = server.url
+
+    plan = LoadPlan(
+        base_url, args.users, args.ramp_up, args.duration, args.items, args.think_time, args.interval,
+        dict(CONTEXT_OPTIONS)
+    )
+    processes = min(args.processes, args.users)
+    # Spawned processes start their own Playwright driver instead of inheriting this one's state
+    spawn = multiprocessing.get_context("spawn")
+    messages = spawn.Queue()
+    start_event = spawn.Event()
+    start_time = spawn.Value("d", 0.0)
+    workers = [
+        spawn.Process(target=run_worker, args=(index, processes, plan, messages, start_event, start_time))
+        for index in range(processes)
+    ]
+    results = LoadResults(args.output, plan)
+    try:
+        for worker in workers:
+            worker.start()
+        ready = 0
+        while ready < processes:
+            message = _next_message(messages, workers, READY_TIMEOUT)
+            ready += message["type"] == "ready"
+        start_time.value = time.time()
+        start_event.set()
+        print(f"{args.users} users over {processes} process(es) against {base_url}, "
+              f"ramp-up {args.ramp_up:g}s, duration {args.duration:g}s", flush=True)
+
+        done = 0
+        while done < processes:
+            message = _next_message(messages, workers, args.interval * 2 + 60)
+            if message["type"] == "interval":
+                results.add(message)
+                print(f"{message['elapsed']:7.1f}s worker {message['worker']}: "
+                      f"{message['active_users']} users, {message['iterations']} iterations", flush=True)
+            elif message["type"] == "done":
+                results.crashed_users.extend(message["crashed_users"])
+                done += 1
+        summary = results.finish(time.time() - start_time.value)
+    finally:
+        for worker in workers:
+            worker.join(timeout=30)
+            if worker.is_alive():
+                worker.terminate()
+        if server is not None:
+            server.stop()
+
+    print(f"{'step':<22}{'count':>7}{'errors':>8}{'/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for step in [name for name, _ in STEPS] + [name for name in summary["steps"] if name not in dict(STEPS)]:
+        stats = summary["steps"].get(step)
+        if stats is not None:
+            print(f"{step:<22}{stats['count']:>7}{stats['errors']:>8}{stats['per_second']:>8.2f}"
+                  f"{stats['p50_ms']:>9.0f}{stats['p95_ms']:>9.0f}{stats['p99_ms']:>9.0f}")
+    print(f"iterations: {summary['iterations']} ({summary['iterations_per_second']:.2f}/s), results: {args.output}")
+    return 1 if summary["crashed_users"] else 0
+
+
+def _next_message(messages, workers, timeout: float) -> dict:
+    """Get next worker message, failing when a worker died without reporting"""
+    deadline = time.time() + timeout
+    while True:
+        try:
+            return messages.get(timeout=1)
+        except queue.Empty:
+            if any(worker.exitcode not in (None, 0) for worker in workers):
+                raise RuntimeError("a load worker process exited unexpectedly")
+            if time.time() > deadline:
+                raise RuntimeError(f"no message from load workers for {timeout:g}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+
+from utils.stats import LatencyHistogram
+
+
+PERCENTILES = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+
+
+def step_stats(histogram: LatencyHistogram, errors: int, seconds: float) -> dict:
+    """Get count, errors, throughput and latency percentiles of a step"""
+    stats = {
+        "count": histogram.total,
+        "errors": errors,
+        "per_second": histogram.total / seconds if seconds else 0.0
+    }
+    for name, fraction in PERCENTILES:
+        stats[f"{name}_ms"] = histogram.percentile(fraction)
+    return stats
+
+
+class LoadResults:
+    """Streams worker snapshots to a JSONL file as they arrive and keeps run totals"""
+
+    def __init__(self, path: str, plan):
+        self.path = Path(path)
+        self.plan = plan
+        self.iterations = 0
+        self.crashed_users = []
+        self._histograms = {}
+        self._errors = {}
+        self._error_types = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w", encoding="utf-8")
+        self._write({
+            "type": "plan",
+            "base_url": plan.base_url,
+            "users": plan.users,
+            "ramp_up": plan.ramp_up,
+            "duration": plan.duration,
+            "items": plan.items,
+            "think_time": plan.think_time
+        })
+
+    def add(self, snapshot: dict):
+        """Write interval snapshot of one worker with its percentiles and fold it into the totals"""
+        steps = {}
+        for step, data in snapshot["steps"].items():
+            histogram = LatencyHistogram(data["histogram"])
+            steps[step] = dict(step_stats(histogram, data["errors"], self.plan.interval), histogram=data["histogram"])
+            self._histograms.setdefault(step, LatencyHistogram()).merge(histogram)
+            self._errors[step] = self._errors.get(step, 0) + data["errors"]
+            types = self._error_types.setdefault(step, {})
+            for name, count in data["error_types"].items():
+                types[name] = types.get(name, 0) + count
+        self.iterations += snapshot["iterations"]
+        self._write({
+            "type": "interval",
+            "worker": snapshot["worker"],
+            "elapsed": round(snapshot["elapsed"], 3),
+            "active_users": snapshot["active_users"],
+            "iterations": snapshot["iterations"],
+            "steps": steps
+        })
+
+    def finish(self, seconds: float) -> dict:
+        """Write and get the run summary"""
+        summary = {
+            "type": "summary",
+            "seconds": round(seconds, 3),
+            "iterations": self.iterations,
+            "iterations_per_second": self.iterations / seconds if seconds else 0.0,
+            "crashed_users": self.crashed_users,
+            "steps": {
+                step: dict(
+                    step_stats(self._histograms.get(step, LatencyHistogram()), self._errors.get(step, 0), seconds),
+                    error_types=self._error_types.get(step, {})
+                )
+                for step in sorted(set(self._histograms) | set(self._errors))
+            }
+        }
+        self._write(summary)
+        self._file.close()
+        return summary
+
+    def _write(self, record: dict):
+        """Append one JSON line and flush it so the file can be tailed during the run"""
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
@@ -0,0 +1,58 @@
+from playwright.async_api import Page
+
+from pages.async_api import AsyncCartPage, AsyncCheckoutPage, AsyncInventoryPage, AsyncLoginPage
+from utils.auth_cache import DEFAULT_PASSWORD, DEFAULT_USER
+
+
+URL_TIMEOUT = 30000
+
+
+async def login(page: Page, base_url: str, items: int):
+    """Open login page and login"""
+    login_page = AsyncLoginPage(page)
+    await login_page.navigate(base_url)
+    await login_page.login(DEFAULT_USER, DEFAULT_PASSWORD)
+    await page.wait_for_url("**/inventory.html", timeout=URL_TIMEOUT)
+
+
+async def add_to_cart(page: Page, base_url: str, items: int):
+    """Add the first items products"""
+    inventory_page = AsyncInventoryPage(page)
+    for index in range(items):
+        await inventory_page.add_product_to_cart(index)
+    await inventory_page.wait_until(
+        "(expected) => document.querySelector('.shopping_cart_badge')?.textContent === String(expected)",
+        arg=items, timeout=URL_TIMEOUT, description=f"cart badge {items}"
+    )
+
+
+async def proceed_to_checkout(page: Page, base_url: str, items: int):
+    """Open cart and start checkout"""
+    await AsyncInventoryPage(page).click_cart()
+    await page.wait_for_url("**/cart.html", timeout=URL_TIMEOUT)
+    await AsyncCartPage(page).proceed_to_checkout()
+    await page.wait_for_url("**/checkout-step-one.html", timeout=URL_TIMEOUT)
+
+
+async def fill_checkout_info(page: Page, base_url: str, items: int):
+    """Fill buyer info and continue to the overview"""
+    checkout_page = AsyncCheckoutPage(page)
+    await checkout_page.fill_checkout_info("John", "Doe", "12345")
+    await checkout_page.continue_checkout()
+    await page.wait_for_url("**/checkout-step-two.html", timeout=URL_TIMEOUT)
+
+
+async def finish_checkout(page: Page, base_url: str, items: int):
+    """Place the order"""
+    await AsyncCheckoutPage(page).finish_checkout()
+    await page.wait_for_url("**/checkout-complete.html", timeout=URL_TIMEOUT)
+
+
+# One virtual-user iteration, each step timed separately
+STEPS = (
+    ("login", login),
+    ("add_to_cart", add_to_cart),
+    ("proceed_to_checkout", proceed_to_checkout),
+    ("fill_checkout_info", fill_checkout_info),
+    ("finish_checkout", finish_checkout)
+)
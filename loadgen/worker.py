@@ -0,0 +1,134 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List
+
+from playwright.async_api import Error as PlaywrightError, async_playwright
+
+from loadgen.scenario import STEPS
+from utils.stats import LatencyHistogram
+
+
+@dataclass(frozen=True)
+class LoadPlan:
+    """Virtual-user count, linear ramp-up and duration shared by every worker process"""
+    base_url: str
+    users: int
+    ramp_up: float
+    duration: float
+    items: int = 3
+    think_time: float = 0.0
+    interval: float = 5.0
+    context_options: dict = None
+
+    def start_offset(self, user: int) -> float:
+        """Get seconds after start when user begins, spreading users evenly over the ramp-up"""
+        return self.ramp_up * user / self.users
+
+    def users_of(self, worker: int, workers: int) -> List[int]:
+        """Get users run by worker, interleaved so every process ramps up at the same pace"""
+        return list(range(worker, self.users, workers))
+
+
+class StepRecorder:
+    """Per-step latencies, errors and completed iterations since the last snapshot"""
+
+    def __init__(self):
+        self.iterations = 0
+        self.active_users = 0
+        self._steps = {}
+
+    def record(self, step: str, ms: float):
+        """Add latency of a successful step"""
+        self._stats(step)["histogram"].record(ms)
+
+    def error(self, step: str, error: BaseException):
+        """Count failed step by error type"""
+        stats = self._stats(step)
+        stats["errors"] += 1
+        name = type(error).__name__
+        stats["error_types"][name] = stats["error_types"].get(name, 0) + 1
+
+    def snapshot(self) -> dict:
+        """Get counters and start a new interval"""
+        snapshot = {
+            "iterations": self.iterations,
+            "active_users": self.active_users,
+            "steps": {
+                step: {
+                    "histogram": stats["histogram"].to_dict(),
+                    "errors": stats["errors"],
+                    "error_types": stats["error_types"]
+                }
+                for step, stats in self._steps.items()
+            }
+        }
+        self.iterations = 0
+        self._steps = {}
+        return snapshot
+
+    def _stats(self, step: str) -> dict:
+        """Get counters of step"""
+        stats = self._steps.get(step)
+        if stats is None:
+            stats = self._steps[step] = {"histogram": LatencyHistogram(), "errors": 0, "error_types": {}}
+        return stats
+
+
+async def virtual_user(browser, plan: LoadPlan, user: int, started: float, recorder: StepRecorder):
+    """Run scenario iterations in fresh contexts from the user's ramp-up slot until the test ends"""
+    await asyncio.sleep(max(started + plan.start_offset(user) - time.time(), 0))
+    stop_at = started + plan.ramp_up + plan.duration
+    recorder.active_users += 1
+    try:
+        while time.time() < stop_at:
+            try:
+                context = await browser.new_context(**(plan.context_options or {}))
+            except PlaywrightError as error:
+                recorder.error("new_context", error)
+                await asyncio.sleep(1)
+                continue
+            try:
+                page = await context.new_page()
+                for step, run in STEPS:
+                    start = time.perf_counter()
+                    try:
+                        await run(page, plan.base_url, plan.items)
+                    except (PlaywrightError, AssertionError) as error:
+                        recorder.error(step, error)
+                        break
+                    recorder.record(step, (time.perf_counter() - start) * 1000)
+                    if plan.think_time:
+                        await asyncio.sleep(plan.think_time)
+                else:
+                    recorder.iterations += 1
+            finally:
+                await context.close()
+    finally:
+        recorder.active_users -= 1
+
+
+async def _run(worker: int, workers: int, plan: LoadPlan, queue, start_event, start_time):
+    """Launch browser, wait for the common start and stream snapshots until every user is done"""
+    recorder = StepRecorder()
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        queue.put({"type": "ready", "worker": worker})
+        await asyncio.get_running_loop().run_in_executor(None, start_event.wait)
+        started = start_time.value
+        users = [
+            asyncio.create_task(virtual_user(browser, plan, user, started, recorder))
+            for user in plan.users_of(worker, workers)
+        ]
+        done = asyncio.gather(*users, return_exceptions=True)
+        while not done.done():
+            await asyncio.wait([done], timeout=plan.interval)
+            queue.put(dict(recorder.snapshot(), type="interval", worker=worker, elapsed=time.time() - started))
+        await browser.close()
+    crashed = [f"{type(result).__name__}: {result}" for result in done.result() if isinstance(result, BaseException)]
+    queue.put({"type": "done", "worker": worker, "crashed_users": crashed})
+
+
+def run_worker(worker: int, workers: int, plan: LoadPlan, queue, start_event, start_time):
+    """Process entry point"""
+    asyncio.run(_run(worker, workers, plan, queue, start_event, start_time))
@@ -3,11 +3,19 @@ from pages.login_page import LoginPage
 from pages.inventory_page import InventoryPage
 from pages.cart_page import CartPage
 from pages.checkout_page import CheckoutPage
+from pages.records import ProductRecord, CartItemRecord
+from pages.catalog_index import CatalogIndex, CatalogEntry
+from pages.dom_snapshot import RegionSnapshot
 
 __all__ = [
     "BasePage",
     "LoginPage",
     "InventoryPage",
     "CartPage",
-    "CheckoutPage"
+    "CheckoutPage",
+    "ProductRecord",
+    "CartItemRecord",
+    "CatalogIndex",
+    "CatalogEntry",
+    "RegionSnapshot"
 ]
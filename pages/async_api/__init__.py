@@ -0,0 +1,13 @@
+from pages.async_api.base_page import AsyncBasePage
+from pages.async_api.login_page import AsyncLoginPage
+from pages.async_api.inventory_page import AsyncInventoryPage
+from pages.async_api.cart_page import AsyncCartPage
+from pages.async_api.checkout_page import AsyncCheckoutPage
+
+__all__ = [
+    "AsyncBasePage",
+    "AsyncLoginPage",
+    "AsyncInventoryPage",
+    "AsyncCartPage",
+    "AsyncCheckoutPage"
+]
@@ -0,0 +1,104 @@
+import logging
+import time
+
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+
+from pages.base_page import (
+    BasePage,
+    COUNT_PREDICATE,
+    MUTATION_WAIT_SCRIPT,
+    ORDER_CHANGED_PREDICATE,
+    ROW_SNAPSHOT_SCRIPT
+)
+from pages.instrumentation import timed_action
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBasePage:
+    """Async twin of BasePage for pages driven by playwright.async_api"""
+    
+    WAIT_STRATEGY = BasePage.WAIT_STRATEGY
+    POLLING_INTERVAL = BasePage.POLLING_INTERVAL
+    
+    def __init__(self, page: Page):
+        self.page = page
+        self.wait_log = []
+    
+    @timed_action
+    async def navigate(self, url: str):
+        """Navigate to URL"""
+        await self.page.goto(url)
+    
+    @timed_action
+    async def click(self, selector: str):
+        """Click element"""
+        await self.page.click(selector)
+    
+    @timed_action
+    async def fill(self, selector: str, text: str):
+        """Fill input field"""
+        await self.page.fill(selector, text)
+    
+    @timed_action
+    async def get_text(self, selector: str) -> str:
+        """Get element text"""
+        return await self.page.text_content(selector)
+    
+    @timed_action
+    async def is_visible(self, selector: str) -> bool:
+        """Check if element is visible"""
+        return await self.page.is_visible(selector)
+    
+    @timed_action
+    async def wait_for_element(self, selector: str, timeout: int = 5000):
+        """Wait for element to appear"""
+        await self.page.wait_for_selector(selector, timeout=timeout)
+    
+    async def wait_until(self, predicate: str, arg=None, timeout: int = 5000,
+                         strategy: str = None, description: str = "condition") -> float:
+        """Wait until JS predicate(arg) is true and return how long it took in ms"""
+        strategy = strategy or self.WAIT_STRATEGY
+        start = time.perf_counter()
+        if strategy == "mutation":
+            met = await self.page.evaluate(
+                MUTATION_WAIT_SCRIPT, {"predicate": predicate, "value": arg, "timeout": timeout}
+            )
+            if not met:
+                raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded waiting for {description}")
+        elif strategy == "polling":
+            await self.page.wait_for_function(predicate, arg=arg, polling=self.POLLING_INTERVAL, timeout=timeout)
+        else:
+            raise ValueError(f"Unknown wait strategy: {strategy}")
+        elapsed = (time.perf_counter() - start) * 1000
+        self.wait_log.append((description, strategy, elapsed))
+        logger.info("Waited %.1f ms for %s (%s)", elapsed, description, strategy)
+        return elapsed
+    
+    async def wait_for_count(self, selector: str, count: int, timeout: int = 5000, strategy: str = None) -> float:
+        """Wait until exactly count elements match selector"""
+        return await self.wait_until(
+            COUNT_PREDICATE, {"selector": selector, "count": count}, timeout, strategy,
+            description=f"{count} x {selector}"
+        )
+    
+    async def wait_for_order_change(self, selector: str, previous: list, timeout: int = 5000,
+                                    strategy: str = None) -> float:
+        """Wait until texts of elements matching selector differ from previous"""
+        return await self.wait_until(
+            ORDER_CHANGED_PREDICATE, {"selector": selector, "previous": previous}, timeout, strategy,
+            description=f"order change of {selector}"
+        )
+    
+    async def snapshot_rows(self, row_selector: str, fields: dict) -> list:
+        """Get text of child selectors for every matching row in a single round-trip"""
+        return await self.page.eval_on_selector_all(row_selector, ROW_SNAPSHOT_SCRIPT, fields)
+    
+    async def get_title(self) -> str:
+        """Get page title"""
+        return await self.page.title()
+    
+    def get_url(self) -> str:
+        """Get current URL"""
+        return self.page.url
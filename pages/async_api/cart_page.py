@@ -0,0 +1,74 @@
+from typing import List
+
+from pages.async_api.base_page import AsyncBasePage
+from pages.cart_page import CartPage
+from pages.records import CartItemRecord, parse_price
+
+
+class AsyncCartPage(AsyncBasePage):
+    """Async shopping cart page object model"""
+    
+    # Selectors
+    CART_CONTAINER = CartPage.CART_CONTAINER
+    CART_ITEM = CartPage.CART_ITEM
+    ITEM_NAME = CartPage.ITEM_NAME
+    ITEM_PRICE = CartPage.ITEM_PRICE
+    ITEM_QUANTITY = CartPage.ITEM_QUANTITY
+    REMOVE_BUTTON = CartPage.REMOVE_BUTTON
+    CONTINUE_SHOPPING = CartPage.CONTINUE_SHOPPING
+    CHECKOUT_BUTTON = CartPage.CHECKOUT_BUTTON
+    EMPTY_MESSAGE = CartPage.EMPTY_MESSAGE
+    
+    async def is_cart_page(self) -> bool:
+        """Check if we're on cart page"""
+        return await self.is_visible(self.CART_CONTAINER)
+    
+    async def get_cart_items_count(self) -> int:
+        """Get number of items in cart"""
+        return await self.page.locator(self.CART_ITEM).count()
+    
+    async def get_cart_items(self) -> List[CartItemRecord]:
+        """Get a snapshot of all cart rows in a single round-trip"""
+        rows = await self.snapshot_rows(
+            self.CART_ITEM,
+            {"name": self.ITEM_NAME, "price": self.ITEM_PRICE, "quantity": self.ITEM_QUANTITY}
+        )
+        return [
+            CartItemRecord(
+                index=i,
+                name=row["name"],
+                price=parse_price(row["price"]),
+                price_text=row["price"],
+                quantity=int(row["quantity"] or 0),
+                button_test_id=row["buttonTestId"]
+            )
+            for i, row in enumerate(rows)
+        ]
+    
+    async def get_cart_item_names(self) -> list:
+        """Get all item names in cart"""
+        return [item.name for item in await self.get_cart_items()]
+    
+    async def get_cart_item_prices(self) -> list:
+        """Get all item prices in cart"""
+        return [item.price_text for item in await self.get_cart_items()]
+    
+    async def remove_item_from_cart(self, item_index: int = 0):
+        """Remove item from cart by index"""
+        await self.page.locator(self.REMOVE_BUTTON).nth(item_index).click()
+    
+    async def continue_shopping(self):
+        """Click continue shopping button"""
+        await self.click(self.CONTINUE_SHOPPING)
+    
+    async def proceed_to_checkout(self):
+        """Click checkout button"""
+        await self.click(self.CHECKOUT_BUTTON)
+    
+    async def is_cart_empty(self) -> bool:
+        """Check if cart is empty"""
+        return await self.get_cart_items_count() == 0
+    
+    async def wait_for_cart_empty(self, timeout: int = 2000) -> float:
+        """Wait until removed items have left the DOM"""
+        return await self.wait_for_count(self.CART_ITEM, 0, timeout=timeout)
@@ -0,0 +1,62 @@
+from pages.async_api.base_page import AsyncBasePage
+from pages.checkout_page import CheckoutPage
+
+
+class AsyncCheckoutPage(AsyncBasePage):
+    """Async checkout page object model"""
+    
+    # Selectors - Step One
+    FIRST_NAME_INPUT = CheckoutPage.FIRST_NAME_INPUT
+    LAST_NAME_INPUT = CheckoutPage.LAST_NAME_INPUT
+    POSTAL_CODE_INPUT = CheckoutPage.POSTAL_CODE_INPUT
+    CONTINUE_BUTTON = CheckoutPage.CONTINUE_BUTTON
+    ERROR_MESSAGE = CheckoutPage.ERROR_MESSAGE
+    
+    # Selectors - Step Two
+    FINISH_BUTTON = CheckoutPage.FINISH_BUTTON
+    TOTAL_PRICE = CheckoutPage.TOTAL_PRICE
+    
+    # Selectors - Complete
+    COMPLETE_HEADER = CheckoutPage.COMPLETE_HEADER
+    COMPLETE_TEXT = CheckoutPage.COMPLETE_TEXT
+    BACK_HOME_BUTTON = CheckoutPage.BACK_HOME_BUTTON
+    
+    async def fill_checkout_info(self, first_name: str, last_name: str, postal_code: str):
+        """Fill checkout information"""
+        await self.fill(self.FIRST_NAME_INPUT, first_name)
+        await self.fill(self.LAST_NAME_INPUT, last_name)
+        await self.fill(self.POSTAL_CODE_INPUT, postal_code)
+    
+    async def continue_checkout(self):
+        """Click continue button"""
+        await self.click(self.CONTINUE_BUTTON)
+    
+    async def finish_checkout(self):
+        """Click finish button"""
+        await self.click(self.FINISH_BUTTON)
+    
+    async def get_error_message(self) -> str:
+        """Get error message"""
+        if await self.is_visible(self.ERROR_MESSAGE):
+            return await self.get_text(self.ERROR_MESSAGE)
+        return ""
+    
+    async def is_error_visible(self) -> bool:
+        """Check if error message is visible"""
+        return await self.is_visible(self.ERROR_MESSAGE)
+    
+    async def get_total_price(self) -> str:
+        """Get total price"""
+        return await self.get_text(self.TOTAL_PRICE)
+    
+    async def is_order_complete(self) -> bool:
+        """Check if order is complete"""
+        return await self.is_visible(self.COMPLETE_HEADER)
+    
+    async def get_complete_message(self) -> str:
+        """Get complete message"""
+        return await self.get_text(self.COMPLETE_TEXT)
+    
+    async def back_to_home(self):
+        """Click back to home button"""
+        await self.click(self.BACK_HOME_BUTTON)
@@ -0,0 +1,130 @@
+from typing import Callable, List
+
+from playwright.async_api import Page
+
+from pages.async_api.base_page import AsyncBasePage
+from pages.catalog_index import CatalogEntry, CatalogIndex
+from pages.inventory_page import InventoryPage, SORTED_PREDICATE, cart_state_error
+from pages.records import ProductRecord, parse_price
+
+
+class AsyncInventoryPage(AsyncBasePage):
+    """Async inventory/products page object model"""
+    
+    # Selectors
+    INVENTORY_CONTAINER = InventoryPage.INVENTORY_CONTAINER
+    PRODUCT_ITEM = InventoryPage.PRODUCT_ITEM
+    PRODUCT_NAME = InventoryPage.PRODUCT_NAME
+    PRODUCT_PRICE = InventoryPage.PRODUCT_PRICE
+    ADD_TO_CART_BUTTON = InventoryPage.ADD_TO_CART_BUTTON
+    REMOVE_BUTTON = InventoryPage.REMOVE_BUTTON
+    CART_BADGE = InventoryPage.CART_BADGE
+    CART_LINK = InventoryPage.CART_LINK
+    SORT_DROPDOWN = InventoryPage.SORT_DROPDOWN
+    
+    SORT_ORDERS = InventoryPage.SORT_ORDERS
+    
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self._catalog = None
+    
+    async def is_inventory_page(self) -> bool:
+        """Check if we're on inventory page"""
+        return await self.is_visible(self.INVENTORY_CONTAINER)
+    
+    async def get_product_count(self) -> int:
+        """Get number of products displayed"""
+        return await self.page.locator(self.PRODUCT_ITEM).count()
+    
+    async def get_products(self) -> List[ProductRecord]:
+        """Get a snapshot of all product rows in a single round-trip"""
+        rows = await self.snapshot_rows(
+            self.PRODUCT_ITEM,
+            {"name": self.PRODUCT_NAME, "price": self.PRODUCT_PRICE}
+        )
+        return [
+            ProductRecord(
+                index=i,
+                name=row["name"],
+                price=parse_price(row["price"]),
+                price_text=row["price"],
+                button_test_id=row["buttonTestId"]
+            )
+            for i, row in enumerate(rows)
+        ]
+    
+    async def get_product_names(self) -> list:
+        """Get all product names"""
+        return [product.name for product in await self.get_products()]
+    
+    async def get_product_prices(self) -> list:
+        """Get all product prices"""
+        return [product.price_text for product in await self.get_products()]
+    
+    async def catalog(self) -> CatalogIndex:
+        """Get product index, rebuilt after sorting, navigation or changes to the product list"""
+        if self._catalog is None or not await self._catalog.is_current_async(self.page):
+            await self.wait_for_element(self.PRODUCT_ITEM)
+            self._catalog = await CatalogIndex.build_async(
+                self.page, self.PRODUCT_ITEM, self.PRODUCT_NAME, self.PRODUCT_PRICE, parse_price
+            )
+        return self._catalog
+    
+    def invalidate_catalog(self):
+        """Drop product index so the next lookup reads the page again"""
+        self._catalog = None
+    
+    async def add_product_to_cart(self, product_index: int = 0):
+        """Add product to cart by its position in the displayed list"""
+        await self._toggle(lambda catalog: catalog[product_index], True)
+    
+    async def add_product_by_name(self, product_name: str):
+        """Add product to cart by name"""
+        await self._toggle(lambda catalog: catalog.by_name(product_name), True)
+    
+    async def add_product_by_id(self, product_id: int):
+        """Add product to cart by id"""
+        await self._toggle(lambda catalog: catalog.by_id(product_id), True)
+    
+    async def remove_product_from_cart(self, product_index: int = 0):
+        """Remove product from cart by its position in the displayed list"""
+        await self._toggle(lambda catalog: catalog[product_index], False)
+    
+    async def _toggle(self, find: Callable[[CatalogIndex], CatalogEntry], add: bool):
+        """Click the add or remove button of a product, raising ValueError at once when it shows the other one"""
+        catalog = await self.catalog()
+        entry = find(catalog)
+        if catalog.in_cart(entry) == add:
+            # The index may predate a toggle made without this page object, read the page once more
+            self.invalidate_catalog()
+            catalog = await self.catalog()
+            entry = find(catalog)
+            if catalog.in_cart(entry) == add:
+                raise ValueError(cart_state_error(entry, add))
+        await (entry.add_button if add else entry.remove_button).click()
+        catalog.mark(entry, add)
+    
+    async def get_cart_badge_count(self) -> str:
+        """Get cart badge count"""
+        if await self.is_visible(self.CART_BADGE):
+            return await self.get_text(self.CART_BADGE)
+        return "0"
+    
+    async def click_cart(self):
+        """Click on cart link"""
+        await self.click(self.CART_LINK)
+    
+    async def sort_products(self, sort_option: str):
+        """Sort products by option"""
+        dropdown = self.page.locator(self.SORT_DROPDOWN)
+        await dropdown.select_option(sort_option, timeout=5000)
+        await self.wait_for_sorted(sort_option)
+        self.invalidate_catalog()
+    
+    async def wait_for_sorted(self, sort_option: str, timeout: int = 5000) -> float:
+        """Wait until products are displayed in the order of sort option"""
+        selector, numeric, reverse = self.SORT_ORDERS[sort_option]
+        return await self.wait_until(
+            SORTED_PREDICATE, {"selector": selector, "numeric": numeric, "reverse": reverse}, timeout,
+            description=f"products sorted by {sort_option}"
+        )
@@ -0,0 +1,31 @@
+from pages.async_api.base_page import AsyncBasePage
+from pages.login_page import LoginPage
+
+
+class AsyncLoginPage(AsyncBasePage):
+    """Async login page object model"""
+    
+    # Selectors
+    USERNAME_INPUT = LoginPage.USERNAME_INPUT
+    PASSWORD_INPUT = LoginPage.PASSWORD_INPUT
+    LOGIN_BUTTON = LoginPage.LOGIN_BUTTON
+    ERROR_MESSAGE = LoginPage.ERROR_MESSAGE
+    CONTAINER = LoginPage.CONTAINER
+    
+    async def login(self, username: str, password: str):
+        """Perform login"""
+        await self.fill(self.USERNAME_INPUT, username)
+        await self.fill(self.PASSWORD_INPUT, password)
+        await self.click(self.LOGIN_BUTTON)
+    
+    async def get_error_message(self) -> str:
+        """Get error message"""
+        return await self.get_text(self.ERROR_MESSAGE)
+    
+    async def is_error_visible(self) -> bool:
+        """Check if error message is visible"""
+        return await self.is_visible(self.ERROR_MESSAGE)
+    
+    async def is_login_page(self) -> bool:
+        """Check if we're on login page"""
+        return await self.is_visible(self.CONTAINER)
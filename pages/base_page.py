@@ -1,36 +1,183 @@
-from playwright.sync_api import Page
+import logging
+import time
+from typing import Dict
+
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+
+from pages.dom_snapshot import RegionSnapshot, snapshot_regions
+from pages.instrumentation import timed_action
+from pages.read_only import mutating
+from pages.web_vitals import collect_vitals
+
+
+logger = logging.getLogger(__name__)
+
+# Reads child text and the row button's data-test for every row in one call
+ROW_SNAPSHOT_SCRIPT = """
+(rows, fields) => rows.map(row => {
+    const record = {};
+    for (const [key, selector] of Object.entries(fields)) {
+        const element = row.querySelector(selector);
+        record[key] = element ? element.textContent : "";
+    }
+    const button = row.querySelector("button");
+    record.buttonTestId = button ? (button.getAttribute("data-test") || "") : "";
+    return record;
+})
+"""
+
+# Re-checks the predicate, passed as source text, on every DOM mutation, resolves false on timeout
+MUTATION_WAIT_SCRIPT = """
+(arg) => new Promise(resolve => {
+    const predicate = new Function(`return (${arg.predicate});`)();
+    if (predicate(arg.value)) {
+        resolve(true);
+        return;
+    }
+    const observer = new MutationObserver(() => {
+        if (predicate(arg.value)) {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(true);
+        }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        resolve(false);
+    }, arg.timeout);
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+})
+"""
+
+# Closes the form error so the next submit renders a new one, removing it where there is no close button
+DISMISS_ERROR_SCRIPT = """
+([message, button]) => {
+    const close = document.querySelector(button);
+    if (close) {
+        close.click();
+        return;
+    }
+    const error = document.querySelector(message);
+    if (error) error.remove();
+}
+"""
+
+COUNT_PREDICATE = "({selector, count}) => document.querySelectorAll(selector).length === count"
+
+ORDER_CHANGED_PREDICATE = """
+({selector, previous}) => {
+    const current = Array.from(document.querySelectorAll(selector), element => element.textContent);
+    return current.length !== previous.length || current.some((text, i) => text !== previous[i]);
+}
+"""
 
 
 class BasePage:
     """Base page class with common methods"""
     
+    # "mutation" re-checks on DOM changes, "polling" re-checks every POLLING_INTERVAL ms
+    WAIT_STRATEGY = "mutation"
+    POLLING_INTERVAL = 50
+    
+    # URL paths this page object owns, used to attribute navigation timing records
+    PATHS = ()
+    
+    # DOM regions this page object owns, name -> selector, covered by dom_snapshot()
+    REGIONS = {}
+    
+    # Form error shown by the login and checkout pages
+    ERROR_MESSAGE = "[data-test='error']"
+    ERROR_BUTTON = "[data-test='error-button']"
+    
     def __init__(self, page: Page):
         self.page = page
+        self.wait_log = []
     
+    @timed_action
+    @mutating
     def navigate(self, url: str):
         """Navigate to URL"""
         self.page.goto(url)
     
+    @timed_action
+    @mutating
     def click(self, selector: str):
         """Click element"""
         self.page.click(selector)
     
+    @timed_action
+    @mutating
     def fill(self, selector: str, text: str):
         """Fill input field"""
         self.page.fill(selector, text)
     
+    @timed_action
     def get_text(self, selector: str) -> str:
         """Get element text"""
         return self.page.text_content(selector)
     
+    @timed_action
     def is_visible(self, selector: str) -> bool:
         """Check if element is visible"""
         return self.page.is_visible(selector)
     
+    @timed_action
     def wait_for_element(self, selector: str, timeout: int = 5000):
         """Wait for element to appear"""
         self.page.wait_for_selector(selector, timeout=timeout)
     
+    @mutating
+    def dismiss_error(self):
+        """Close the form error, in one round-trip"""
+        self.page.evaluate(DISMISS_ERROR_SCRIPT, [self.ERROR_MESSAGE, self.ERROR_BUTTON])
+    
+    def wait_until(self, predicate: str, arg=None, timeout: int = 5000,
+                   strategy: str = None, description: str = "condition") -> float:
+        """Wait until JS predicate(arg) is true and return how long it took in ms"""
+        strategy = strategy or self.WAIT_STRATEGY
+        start = time.perf_counter()
+        if strategy == "mutation":
+            met = self.page.evaluate(MUTATION_WAIT_SCRIPT, {"predicate": predicate, "value": arg, "timeout": timeout})
+            if not met:
+                raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded waiting for {description}")
+        elif strategy == "polling":
+            self.page.wait_for_function(predicate, arg=arg, polling=self.POLLING_INTERVAL, timeout=timeout)
+        else:
+            raise ValueError(f"Unknown wait strategy: {strategy}")
+        elapsed = (time.perf_counter() - start) * 1000
+        self.wait_log.append((description, strategy, elapsed))
+        logger.info("Waited %.1f ms for %s (%s)", elapsed, description, strategy)
+        return elapsed
+    
+    def wait_for_count(self, selector: str, count: int, timeout: int = 5000, strategy: str = None) -> float:
+        """Wait until exactly count elements match selector"""
+        return self.wait_until(
+            COUNT_PREDICATE, {"selector": selector, "count": count}, timeout, strategy,
+            description=f"{count} x {selector}"
+        )
+    
+    def wait_for_order_change(self, selector: str, previous: list, timeout: int = 5000, strategy: str = None) -> float:
+        """Wait until texts of elements matching selector differ from previous"""
+        return self.wait_until(
+            ORDER_CHANGED_PREDICATE, {"selector": selector, "previous": previous}, timeout, strategy,
+            description=f"order change of {selector}"
+        )
+    
+    def snapshot_rows(self, row_selector: str, fields: dict) -> list:
+        """Get text of child selectors for every matching row in a single round-trip"""
+        return self.page.eval_on_selector_all(row_selector, ROW_SNAPSHOT_SCRIPT, fields)
+    
+    def web_vitals(self) -> list:
+        """Get navigation timing and web vitals records of this page object's URL paths"""
+        return [record for record in collect_vitals(self.page) if record["path"] in self.PATHS]
+    
+    def dom_snapshot(self, *names: str) -> Dict[str, RegionSnapshot]:
+        """Get structural snapshots of the named regions, all of them by default"""
+        unknown = set(names) - set(self.REGIONS)
+        if unknown:
+            raise ValueError(f"{type(self).__name__} has no region {', '.join(sorted(unknown))}")
+        return snapshot_regions(self.page, {name: self.REGIONS[name] for name in names or self.REGIONS})
+    
     def get_title(self) -> str:
         """Get page title"""
         return self.page.title()
@@ -1,9 +1,16 @@
+from typing import List
+
 from pages.base_page import BasePage
+from pages.read_only import mutating
+from pages.records import CartItemRecord, parse_price
 
 
 class CartPage(BasePage):
     """Shopping cart page object model"""
     
+    PATHS = ("/cart.html",)
+    REGIONS = {"cart_list": ".cart_list"}
+    
     # Selectors
     CART_CONTAINER = ".cart_list"
     CART_ITEM = ".cart_item"
@@ -23,37 +30,51 @@ class CartPage(BasePage):
         """Get number of items in cart"""
         return self.page.locator(self.CART_ITEM).count()
     
+    def get_cart_items(self) -> List[CartItemRecord]:
+        """Get a snapshot of all cart rows in a single round-trip"""
+        rows = self.snapshot_rows(
+            self.CART_ITEM,
+            {"name": self.ITEM_NAME, "price": self.ITEM_PRICE, "quantity": self.ITEM_QUANTITY}
+        )
+        return [
+            CartItemRecord(
+                index=i,
+                name=row["name"],
+                price=parse_price(row["price"]),
+                price_text=row["price"],
+                quantity=int(row["quantity"] or 0),
+                button_test_id=row["buttonTestId"]
+            )
+            for i, row in enumerate(rows)
+        ]
+    
     def get_cart_item_names(self) -> list:
         """Get all item names in cart"""
-        names = []
-        for i in range(self.get_cart_items_count()):
-            name = self.page.locator(self.ITEM_NAME).nth(i).text_content()
-            names.append(name)
-        return names
+        return [item.name for item in self.get_cart_items()]
     
     def get_cart_item_prices(self) -> list:
         """Get all item prices in cart"""
-        prices = []
-        for i in range(self.get_cart_items_count()):
-            price = self.page.locator(self.ITEM_PRICE).nth(i).text_content()
-            prices.append(price)
-        return prices
+        return [item.price_text for item in self.get_cart_items()]
     
+    @mutating
     def remove_item_from_cart(self, item_index: int = 0):
         """Remove item from cart by index"""
         self.page.locator(self.REMOVE_BUTTON).nth(item_index).click()
     
+    @mutating
     def continue_shopping(self):
         """Click continue shopping button"""
         self.click(self.CONTINUE_SHOPPING)
     
+    @mutating
     def proceed_to_checkout(self):
         """Click checkout button"""
         self.click(self.CHECKOUT_BUTTON)
     
     def is_cart_empty(self) -> bool:
         """Check if cart is empty"""
-        # Wait a moment for page to update
-        self.page.wait_for_timeout(500)
-        # Check if cart items are gone
-        return self.page.locator(self.CART_ITEM).count() == 0
+        return self.get_cart_items_count() == 0
+    
+    def wait_for_cart_empty(self, timeout: int = 2000) -> float:
+        """Wait until removed items have left the DOM"""
+        return self.wait_for_count(self.CART_ITEM, 0, timeout=timeout)
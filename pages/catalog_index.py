@@ -0,0 +1,176 @@
+import bisect
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+from playwright.sync_api import Locator, Page
+
+
+# Reads every product row once and starts counting structural changes of the product list.
+# The generation changes with every new document (token) and every added, removed or
+# reordered row (changes), but not when a row's button toggles between add and remove.
+CATALOG_SCRIPT = """
+(rows, fields) => {
+    const state = window.__inventoryCatalog
+        || (window.__inventoryCatalog = {token: Math.random().toString(36).slice(2), changes: 0, list: null});
+    const list = rows.length ? rows[0].parentElement : null;
+    if (list && state.list !== list) {
+        state.list = list;
+        new MutationObserver(() => { state.changes += 1; }).observe(list, {childList: true});
+    }
+    return {
+        generation: state.token + ":" + state.changes,
+        rows: rows.map(row => {
+            const text = (selector) => {
+                const element = row.querySelector(selector);
+                return element ? element.textContent : "";
+            };
+            const button = row.querySelector("button");
+            const testId = button ? (button.getAttribute("data-test") || "") : "";
+            const link = row.querySelector("a[id$='_title_link']");
+            const id = link ? link.id.match(/^item_(\\d+)_title_link$/) : null;
+            return {
+                name: text(fields.name),
+                price: text(fields.price),
+                slug: testId.replace(/^(add-to-cart|remove)-/, ""),
+                inCart: testId.startsWith("remove-"),
+                id: id ? Number(id[1]) : null
+            };
+        })
+    };
+}
+"""
+GENERATION_SCRIPT = """
+() => {
+    const state = window.__inventoryCatalog;
+    return state ? state.token + ":" + state.changes : null;
+}
+"""
+
+
+def css_string(value: str) -> str:
+    """Quote value for a CSS attribute selector, safe for quotes and backslashes"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Product of the inventory page with locators built once per index"""
+
+    index: int
+    id: Optional[int]
+    name: str
+    slug: str
+    price: float
+    price_text: str
+    row: Locator
+    add_button: Locator
+    remove_button: Locator
+
+
+class CatalogIndex:
+    """Products of one inventory render keyed by name, slug and id, sorted by price"""
+
+    def __init__(self, entries: List[CatalogEntry], url: str, generation: str, in_cart: Iterable[int] = ()):
+        self.entries = entries
+        self.url = url
+        self.generation = generation
+        # Positions showing a remove button, kept up to date by mark() as buttons toggle
+        self._in_cart = set(in_cart)
+        self._by_name = {entry.name: entry for entry in entries}
+        self._by_slug = {entry.slug: entry for entry in entries}
+        self._by_id = {entry.id: entry for entry in entries if entry.id is not None}
+        self._by_price = sorted(entries, key=lambda entry: entry.price)
+        self._prices = [entry.price for entry in self._by_price]
+
+    @classmethod
+    def build(cls, page: Page, item_selector: str, name_selector: str, price_selector: str,
+              parse_price) -> "CatalogIndex":
+        """Read product rows in one round-trip and prebuild their locators"""
+        snapshot = page.eval_on_selector_all(
+            item_selector, CATALOG_SCRIPT, {"name": name_selector, "price": price_selector}
+        )
+        return cls.from_snapshot(page, snapshot, item_selector, parse_price)
+
+    @classmethod
+    async def build_async(cls, page, item_selector: str, name_selector: str, price_selector: str,
+                          parse_price) -> "CatalogIndex":
+        """Read product rows of a playwright.async_api page in one round-trip and prebuild their locators"""
+        snapshot = await page.eval_on_selector_all(
+            item_selector, CATALOG_SCRIPT, {"name": name_selector, "price": price_selector}
+        )
+        return cls.from_snapshot(page, snapshot, item_selector, parse_price)
+
+    @classmethod
+    def from_snapshot(cls, page, snapshot: dict, item_selector: str, parse_price) -> "CatalogIndex":
+        """Index rows read by CATALOG_SCRIPT, locators are built without a round-trip in either API"""
+        entries = []
+        for index, row in enumerate(snapshot["rows"]):
+            add = f"[data-test={css_string('add-to-cart-' + row['slug'])}]"
+            remove = f"[data-test={css_string('remove-' + row['slug'])}]"
+            entries.append(CatalogEntry(
+                index=index,
+                id=row["id"],
+                name=row["name"],
+                slug=row["slug"],
+                price=parse_price(row["price"]),
+                price_text=row["price"],
+                row=page.locator(f"{item_selector}:has({add}, {remove})"),
+                add_button=page.locator(add),
+                remove_button=page.locator(remove)
+            ))
+        in_cart = [index for index, row in enumerate(snapshot["rows"]) if row.get("inCart")]
+        return cls(entries, page.url, snapshot["generation"], in_cart)
+
+    def is_current(self, page: Page) -> bool:
+        """Check the page still shows the render this index was built from"""
+        return page.url == self.url and page.evaluate(GENERATION_SCRIPT) == self.generation
+
+    async def is_current_async(self, page) -> bool:
+        """Check a playwright.async_api page still shows the render this index was built from"""
+        return page.url == self.url and await page.evaluate(GENERATION_SCRIPT) == self.generation
+
+    def in_cart(self, entry: CatalogEntry) -> bool:
+        """Check if the product showed a remove button when indexed or was last added"""
+        return entry.index in self._in_cart
+
+    def mark(self, entry: CatalogEntry, in_cart: bool):
+        """Record that the product's button toggled"""
+        if in_cart:
+            self._in_cart.add(entry.index)
+        else:
+            self._in_cart.discard(entry.index)
+
+    def by_name(self, name: str) -> CatalogEntry:
+        """Get product by display name"""
+        return self._lookup(self._by_name, name, "name")
+
+    def by_slug(self, slug: str) -> CatalogEntry:
+        """Get product by slug used in data-test ids, e.g. sauce-labs-backpack"""
+        return self._lookup(self._by_slug, slug, "slug")
+
+    def by_id(self, product_id: int) -> CatalogEntry:
+        """Get product by the id in its item_<id>_title_link"""
+        return self._lookup(self._by_id, product_id, "id")
+
+    def in_price_range(self, low: float = 0.0, high: float = float("inf")) -> List[CatalogEntry]:
+        """Get products priced from low to high inclusive, cheapest first"""
+        start = bisect.bisect_left(self._prices, low)
+        end = bisect.bisect_right(self._prices, high)
+        return self._by_price[start:end]
+
+    def __getitem__(self, index: int) -> CatalogEntry:
+        return self.entries[index]
+
+    def __iter__(self) -> Iterator[CatalogEntry]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def _lookup(mapping: dict, key, kind: str) -> CatalogEntry:
+        """Get entry or raise KeyError naming what was looked up"""
+        try:
+            return mapping[key]
+        except KeyError:
+            raise KeyError(f"No product with {kind} {key!r} on the inventory page") from None
@@ -1,9 +1,13 @@
 from pages.base_page import BasePage
+from pages.read_only import mutating
 
 
 class CheckoutPage(BasePage):
     """Checkout page object model"""
     
+    PATHS = ("/checkout-step-one.html", "/checkout-step-two.html", "/checkout-complete.html")
+    REGIONS = {"form": ".checkout_info", "summary": ".summary_info"}
+    
     # Selectors - Step One
     FIRST_NAME_INPUT = "[data-test='firstName']"
     LAST_NAME_INPUT = "[data-test='lastName']"
@@ -20,16 +24,19 @@ class CheckoutPage(BasePage):
     COMPLETE_TEXT = ".complete-text"
     BACK_HOME_BUTTON = "[data-test='back-to-products']"
     
+    @mutating
     def fill_checkout_info(self, first_name: str, last_name: str, postal_code: str):
         """Fill checkout information"""
         self.fill(self.FIRST_NAME_INPUT, first_name)
         self.fill(self.LAST_NAME_INPUT, last_name)
         self.fill(self.POSTAL_CODE_INPUT, postal_code)
     
+    @mutating
     def continue_checkout(self):
         """Click continue button"""
         self.click(self.CONTINUE_BUTTON)
     
+    @mutating
     def finish_checkout(self):
         """Click finish button"""
         self.click(self.FINISH_BUTTON)
@@ -56,6 +63,7 @@ class CheckoutPage(BasePage):
         """Get complete message"""
         return self.get_text(self.COMPLETE_TEXT)
     
+    @mutating
     def back_to_home(self):
         """Click back to home button"""
         self.click(self.BACK_HOME_BUTTON)
@@ -0,0 +1,111 @@
+import difflib
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from playwright.sync_api import Page
+
+
+MISSING = "<missing>"
+TEXT_LIMIT = 60
+HASH_LENGTH = 16
+
+# Outlines each region in one call: one line per element with its tag, classes, data-test and own
+# text, indented by depth. Runs of identical sibling subtrees collapse into their first with a count.
+OUTLINE_SCRIPT = """
+({regions, textLimit}) => {
+    const describe = (element) => {
+        let line = element.tagName.toLowerCase();
+        const classes = Array.from(element.classList).sort();
+        if (classes.length) line += "." + classes.join(".");
+        for (const name of ["data-test", "type", "placeholder", "role"]) {
+            const value = element.getAttribute(name);
+            if (value) line += `[${name}=${value}]`;
+        }
+        if (element.tagName === "IMG") {
+            line += `[src=${(element.getAttribute("src") || "").split("/").pop().split(".")[0]}]`;
+        }
+        if (!element.getClientRects().length) line += " !hidden";
+        const text = Array.from(element.childNodes)
+            .filter(node => node.nodeType === Node.TEXT_NODE)
+            .map(node => node.textContent)
+            .join(" ").replace(/\\s+/g, " ").trim();
+        if (text) line += ` "${text.slice(0, textLimit)}"`;
+        if (element.tagName === "INPUT" && element.value) line += ` ="${element.value.slice(0, textLimit)}"`;
+        return line;
+    };
+    const outline = (element, depth) => {
+        const lines = ["  ".repeat(depth) + describe(element)];
+        let previous = null, count = 0, first = 0;
+        const flush = () => {
+            if (count > 1) lines[first] += ` x${count}`;
+        };
+        for (const child of element.children) {
+            if (child.tagName === "SCRIPT" || child.tagName === "STYLE") continue;
+            const childLines = outline(child, depth + 1);
+            const key = childLines.join("\\n");
+            if (key === previous) {
+                count += 1;
+                continue;
+            }
+            flush();
+            previous = key;
+            count = 1;
+            first = lines.length;
+            lines.push(...childLines);
+        }
+        flush();
+        return lines;
+    };
+    const result = {};
+    for (const [name, selector] of Object.entries(regions)) {
+        const root = document.querySelector(selector);
+        result[name] = root ? outline(root, 0) : null;
+    }
+    return result;
+}
+"""
+
+
+@dataclass(frozen=True)
+class RegionSnapshot:
+    """Normalized outline of a DOM region and its structural hash"""
+    region: str
+    outline: Tuple[str, ...]
+
+    @property
+    def hash(self) -> str:
+        """Get short hash of the outline"""
+        return hashlib.sha1("\n".join(self.outline).encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+    @property
+    def missing(self) -> bool:
+        """Check if the region was not on the page"""
+        return self.outline == (MISSING,)
+
+    def diff(self, baseline: "RegionSnapshot", context: int = 1, limit: int = 40) -> List[str]:
+        """Get unified diff lines from baseline to this snapshot, at most limit of them"""
+        lines = list(difflib.unified_diff(
+            list(baseline.outline), list(self.outline), "baseline", "current", n=context, lineterm=""
+        ))
+        if len(lines) > limit:
+            lines = lines[:limit] + [f"... {len(lines) - limit} more diff lines"]
+        return lines
+
+    def to_dict(self) -> dict:
+        """Get JSON-friendly form for a baseline file"""
+        return {"hash": self.hash, "outline": list(self.outline)}
+
+    @classmethod
+    def from_dict(cls, region: str, data: dict) -> "RegionSnapshot":
+        """Rebuild a snapshot stored by to_dict()"""
+        return cls(region, tuple(data["outline"]))
+
+
+def snapshot_regions(page: Page, regions: Dict[str, str]) -> Dict[str, RegionSnapshot]:
+    """Get snapshots of the regions (name -> selector) in a single round-trip"""
+    outlines = page.evaluate(OUTLINE_SCRIPT, {"regions": regions, "textLimit": TEXT_LIMIT})
+    return {
+        name: RegionSnapshot(name, tuple(outline) if outline is not None else (MISSING,))
+        for name, outline in outlines.items()
+    }
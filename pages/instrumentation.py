@@ -0,0 +1,122 @@
+import functools
+import inspect
+import sys
+from array import array
+from time import perf_counter
+
+
+# Set by enable(), checked on every action so the disabled path costs one global lookup
+active_recorder = None
+# Code of wrappers that stand between a page-object method and the actions it calls
+transparent_frames = set()
+
+
+class ActionRecorder:
+    """Preallocated buffer of timed page-object actions for the current test"""
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.count = 0
+        self.dropped = 0
+        self._owners = [None] * capacity
+        self._actions = [None] * capacity
+        self._selectors = [None] * capacity
+        self._durations = array("d", bytes(8 * capacity))
+
+    def record(self, owner: str, action: str, selector: str, duration: float):
+        """Store one action, counting it as dropped when the buffer is full"""
+        i = self.count
+        if i >= self.capacity:
+            self.dropped += 1
+            return
+        self._owners[i] = owner
+        self._actions[i] = action
+        self._selectors[i] = selector
+        self._durations[i] = duration
+        self.count = i + 1
+
+    def clear(self):
+        """Start over without reallocating"""
+        self.count = 0
+        self.dropped = 0
+
+    def records(self) -> list:
+        """Get recorded actions as dicts, durations in ms"""
+        return [
+            {
+                "owner": self._owners[i],
+                "action": self._actions[i],
+                "selector": self._selectors[i],
+                "ms": self._durations[i] * 1000
+            }
+            for i in range(self.count)
+        ]
+
+    def summary(self, slowest: int = 5) -> dict:
+        """Get per-selector totals and slowest actions of the buffer"""
+        records = self.records()
+        by_selector = {}
+        for record in records:
+            count, total, longest = by_selector.get(record["selector"], (0, 0.0, 0.0))
+            by_selector[record["selector"]] = (count + 1, total + record["ms"], max(longest, record["ms"]))
+        return {
+            "actions": len(records),
+            "dropped": self.dropped,
+            "total_ms": sum(record["ms"] for record in records),
+            "by_selector": {selector: list(values) for selector, values in by_selector.items()},
+            "slowest": sorted(records, key=lambda record: record["ms"], reverse=True)[:slowest]
+        }
+
+
+def enable(capacity: int = 4096) -> ActionRecorder:
+    """Start timing page-object actions"""
+    global active_recorder
+    active_recorder = ActionRecorder(capacity)
+    return active_recorder
+
+
+def disable():
+    """Stop timing page-object actions"""
+    global active_recorder
+    active_recorder = None
+
+
+def _owner(page_object, action: str) -> str:
+    """Get Class.method of the page-object method that triggered the action"""
+    caller = sys._getframe(2)
+    while caller.f_code in transparent_frames:
+        caller = caller.f_back
+    if caller.f_locals.get("self") is page_object:
+        return f"{type(page_object).__name__}.{caller.f_code.co_name}"
+    return f"{type(page_object).__name__}.{action}"
+
+
+def timed_action(method):
+    """Time a BasePage action when a recorder is active"""
+    action = method.__name__
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            recorder = active_recorder
+            if recorder is None:
+                return await method(self, *args, **kwargs)
+            owner = _owner(self, action)
+            start = perf_counter()
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                recorder.record(owner, action, args[0] if args else None, perf_counter() - start)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        recorder = active_recorder
+        if recorder is None:
+            return method(self, *args, **kwargs)
+        start = perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            recorder.record(_owner(self, action), action, args[0] if args else None, perf_counter() - start)
+    return wrapper
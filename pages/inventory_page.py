@@ -1,9 +1,41 @@
+from typing import Callable, List
+
+from playwright.sync_api import Page
+
 from pages.base_page import BasePage
+from pages.catalog_index import CatalogEntry, CatalogIndex
+from pages.read_only import mutating
+from pages.records import ProductRecord, parse_price
+
+
+# True once the displayed values are in the requested order
+SORTED_PREDICATE = """
+({selector, numeric, reverse}) => {
+    const values = Array.from(document.querySelectorAll(selector),
+        element => numeric ? parseFloat(element.textContent.replace("$", "")) : element.textContent);
+    const expected = [...values].sort(numeric ? (a, b) => a - b : undefined);
+    if (reverse) {
+        expected.reverse();
+    }
+    return values.length > 0 && values.every((value, i) => value === expected[i]);
+}
+"""
+
+
+
+def cart_state_error(entry: CatalogEntry, add: bool) -> str:
+    """Get explanation of why a product's add or remove button isn't there"""
+    if add:
+        return f"{entry.name} is already in the cart, it shows a remove button"
+    return f"{entry.name} is not in the cart, it shows an add to cart button"
 
 
 class InventoryPage(BasePage):
     """Inventory/Products page object model"""
     
+    PATHS = ("/inventory.html",)
+    REGIONS = {"header": ".header_secondary_container", "grid": ".inventory_list"}
+    
     # Selectors
     INVENTORY_CONTAINER = ".inventory_container"
     PRODUCT_ITEM = ".inventory_item"
@@ -15,6 +47,18 @@ class InventoryPage(BasePage):
     CART_LINK = ".shopping_cart_link"
     SORT_DROPDOWN = "[data-test='product_sort_container']"
     
+    # Sort option -> (selector, numeric, reverse)
+    SORT_ORDERS = {
+        "az": (PRODUCT_NAME, False, False),
+        "za": (PRODUCT_NAME, False, True),
+        "lohi": (PRODUCT_PRICE, True, False),
+        "hilo": (PRODUCT_PRICE, True, True)
+    }
+    
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self._catalog = None
+    
     def is_inventory_page(self) -> bool:
         """Check if we're on inventory page"""
         return self.is_visible(self.INVENTORY_CONTAINER)
@@ -23,36 +67,77 @@ class InventoryPage(BasePage):
         """Get number of products displayed"""
         return self.page.locator(self.PRODUCT_ITEM).count()
     
+    def get_products(self) -> List[ProductRecord]:
+        """Get a snapshot of all product rows in a single round-trip"""
+        rows = self.snapshot_rows(
+            self.PRODUCT_ITEM,
+            {"name": self.PRODUCT_NAME, "price": self.PRODUCT_PRICE}
+        )
+        return [
+            ProductRecord(
+                index=i,
+                name=row["name"],
+                price=parse_price(row["price"]),
+                price_text=row["price"],
+                button_test_id=row["buttonTestId"]
+            )
+            for i, row in enumerate(rows)
+        ]
+    
     def get_product_names(self) -> list:
         """Get all product names"""
-        names = []
-        for i in range(self.get_product_count()):
-            name = self.page.locator(self.PRODUCT_NAME).nth(i).text_content()
-            names.append(name)
-        return names
+        return [product.name for product in self.get_products()]
     
     def get_product_prices(self) -> list:
         """Get all product prices"""
-        prices = []
-        for i in range(self.get_product_count()):
-            price = self.page.locator(self.PRODUCT_PRICE).nth(i).text_content()
-            prices.append(price)
-        return prices
+        return [product.price_text for product in self.get_products()]
+    
+    def catalog(self) -> CatalogIndex:
+        """Get product index, rebuilt after sorting, navigation or changes to the product list"""
+        if self._catalog is None or not self._catalog.is_current(self.page):
+            self.wait_for_element(self.PRODUCT_ITEM)
+            self._catalog = CatalogIndex.build(
+                self.page, self.PRODUCT_ITEM, self.PRODUCT_NAME, self.PRODUCT_PRICE, parse_price
+            )
+        return self._catalog
     
+    def invalidate_catalog(self):
+        """Drop product index so the next lookup reads the page again"""
+        self._catalog = None
+    
+    @mutating
     def add_product_to_cart(self, product_index: int = 0):
-        """Add product to cart by index"""
-        self.page.locator(self.ADD_TO_CART_BUTTON).nth(product_index).click()
+        """Add product to cart by its position in the displayed list"""
+        self._toggle(lambda catalog: catalog[product_index], True)
     
+    @mutating
     def add_product_by_name(self, product_name: str):
         """Add product to cart by name"""
-        product_locator = self.page.locator(
-            f"//div[contains(text(), '{product_name}')]/ancestor::div[@class='inventory_item']//button[contains(@data-test, 'add-to-cart')]"
-        )
-        product_locator.click()
+        self._toggle(lambda catalog: catalog.by_name(product_name), True)
     
+    @mutating
+    def add_product_by_id(self, product_id: int):
+        """Add product to cart by id"""
+        self._toggle(lambda catalog: catalog.by_id(product_id), True)
+    
+    @mutating
     def remove_product_from_cart(self, product_index: int = 0):
-        """Remove product from cart by index"""
-        self.page.locator(self.REMOVE_BUTTON).nth(product_index).click()
+        """Remove product from cart by its position in the displayed list"""
+        self._toggle(lambda catalog: catalog[product_index], False)
+    
+    def _toggle(self, find: Callable[[CatalogIndex], CatalogEntry], add: bool):
+        """Click the add or remove button of a product, raising ValueError at once when it shows the other one"""
+        catalog = self.catalog()
+        entry = find(catalog)
+        if catalog.in_cart(entry) == add:
+            # The index may predate a toggle made without this page object, read the page once more
+            self.invalidate_catalog()
+            catalog = self.catalog()
+            entry = find(catalog)
+            if catalog.in_cart(entry) == add:
+                raise ValueError(cart_state_error(entry, add))
+        (entry.add_button if add else entry.remove_button).click()
+        catalog.mark(entry, add)
     
     def get_cart_badge_count(self) -> str:
         """Get cart badge count"""
@@ -60,12 +145,24 @@ class InventoryPage(BasePage):
             return self.get_text(self.CART_BADGE)
         return "0"
     
+    @mutating
     def click_cart(self):
         """Click on cart link"""
         self.click(self.CART_LINK)
     
+    @mutating
     def sort_products(self, sort_option: str):
         """Sort products by option"""
         # Use click and select instead of select_option for better compatibility
         dropdown = self.page.locator(self.SORT_DROPDOWN)
         dropdown.select_option(sort_option, timeout=5000)
+        self.wait_for_sorted(sort_option)
+        self.invalidate_catalog()
+    
+    def wait_for_sorted(self, sort_option: str, timeout: int = 5000) -> float:
+        """Wait until products are displayed in the order of sort option"""
+        selector, numeric, reverse = self.SORT_ORDERS[sort_option]
+        return self.wait_until(
+            SORTED_PREDICATE, {"selector": selector, "numeric": numeric, "reverse": reverse}, timeout,
+            description=f"products sorted by {sort_option}"
+        )
@@ -1,9 +1,13 @@
 from pages.base_page import BasePage
+from pages.read_only import mutating
 
 
 class LoginPage(BasePage):
     """Login page object model"""
     
+    PATHS = ("/",)
+    REGIONS = {"form": ".login_container"}
+    
     # Selectors
     USERNAME_INPUT = "[data-test='username']"
     PASSWORD_INPUT = "[data-test='password']"
@@ -11,6 +15,7 @@ class LoginPage(BasePage):
     ERROR_MESSAGE = "[data-test='error']"
     CONTAINER = ".login_container"
     
+    @mutating
     def login(self, username: str, password: str):
         """Perform login"""
         self.fill(self.USERNAME_INPUT, username)
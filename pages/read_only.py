@@ -0,0 +1,38 @@
+import functools
+import weakref
+
+
+# Pages shared by read_only tests, checked by every mutating page-object method
+_guarded = weakref.WeakSet()
+
+
+class ReadOnlyViolation(AssertionError):
+    """A read_only test called a page-object method that changes the shared page"""
+
+
+def guard(page):
+    """Make mutating page-object methods fail on page"""
+    _guarded.add(page)
+
+
+def release(page):
+    """Allow mutating page-object methods on page again"""
+    _guarded.discard(page)
+
+
+def is_guarded(page) -> bool:
+    """Check if page is shared by read_only tests"""
+    return page in _guarded
+
+
+def mutating(method):
+    """Mark a page-object method as changing page or app state, failing it on guarded pages"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if _guarded and self.page in _guarded:
+            raise ReadOnlyViolation(
+                f"{type(self).__name__}.{method.__name__}() changes the page shared by the read_only "
+                f"tests of this class, move the test to a class without the marker"
+            )
+        return method(self, *args, **kwargs)
+    return wrapper
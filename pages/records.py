@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+
+
+def parse_price(price_text: str) -> float:
+    """Convert a displayed price such as '$29.99' to a float"""
+    return float(price_text.strip().replace("$", "").replace(",", ""))
+
+
+@dataclass(frozen=True)
+class ProductRecord:
+    """Snapshot of a single product row on the inventory page"""
+
+    index: int
+    name: str
+    price: float
+    price_text: str
+    button_test_id: str
+
+    @property
+    def in_cart(self) -> bool:
+        """Check if the row shows a remove button"""
+        return self.button_test_id.startswith("remove")
+
+
+@dataclass(frozen=True)
+class CartItemRecord:
+    """Snapshot of a single row in the shopping cart"""
+
+    index: int
+    name: str
+    price: float
+    price_text: str
+    quantity: int
+    button_test_id: str
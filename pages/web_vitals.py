@@ -0,0 +1,92 @@
+from playwright.sync_api import Error as PlaywrightError, Page
+
+
+# Installed with context.add_init_script. Keeps one record per navigation in sessionStorage so
+# records survive full page loads, and starts a new record on history.pushState/replaceState/popstate
+# for client-side route changes. LCP and navigation timing only exist for full loads, soft
+# navigations get "render" (route change to the second animation frame) instead.
+VITALS_INIT_SCRIPT = """
+(() => {
+    if (window.top !== window || window.__webVitals) return;
+    const KEY = "__web_vitals";
+    const load = () => {
+        try { return JSON.parse(sessionStorage.getItem(KEY) || "[]"); } catch (e) { return []; }
+    };
+    const save = (records) => {
+        try { sessionStorage.setItem(KEY, JSON.stringify(records)); } catch (e) {}
+    };
+    const start = (kind, at) => ({
+        kind, url: location.href, path: location.pathname, start: at,
+        ttfb: null, domContentLoaded: null, load: null, render: null, lcp: null,
+        cls: 0, longTasks: 0, longTaskMs: 0
+    });
+    let current = start("hard", 0);
+    const finalize = (record, end) => {
+        if (record.kind === "hard") {
+            const nav = performance.getEntriesByType("navigation")[0];
+            if (nav) {
+                record.ttfb = nav.responseStart - nav.startTime;
+                record.domContentLoaded = nav.domContentLoadedEventEnd > 0 ? nav.domContentLoadedEventEnd - nav.startTime : null;
+                record.load = nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null;
+                record.transferSize = nav.transferSize;
+            }
+        }
+        const resources = performance.getEntriesByType("resource")
+            .filter((entry) => entry.startTime >= record.start && entry.startTime < end);
+        record.resources = resources.length;
+        record.resourceBytes = resources.reduce((total, entry) => total + (entry.transferSize || 0), 0);
+        const slowest = resources.reduce((found, entry) => (!found || entry.duration > found.duration ? entry : found), null);
+        record.slowestResource = slowest ? {url: slowest.name, ms: slowest.duration} : null;
+        return record;
+    };
+    const close = () => {
+        const records = load();
+        records.push(finalize(current, performance.now()));
+        save(records);
+    };
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver((list) => list.getEntries().forEach(callback)).observe({type, buffered: true});
+        } catch (e) {}
+    };
+    observe("largest-contentful-paint", (entry) => {
+        if (current.kind === "hard") current.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+    });
+    observe("layout-shift", (entry) => {
+        if (!entry.hadRecentInput) current.cls += entry.value;
+    });
+    observe("longtask", (entry) => {
+        current.longTasks += 1;
+        current.longTaskMs += entry.duration;
+    });
+    const soft = () => {
+        if (location.href === current.url) return;
+        close();
+        const record = current = start("soft", performance.now());
+        requestAnimationFrame(() => requestAnimationFrame(() => {
+            record.render = performance.now() - record.start;
+        }));
+    };
+    for (const name of ["pushState", "replaceState"]) {
+        const original = history[name];
+        history[name] = function (...args) {
+            const result = original.apply(this, args);
+            soft();
+            return result;
+        };
+    }
+    addEventListener("popstate", soft);
+    addEventListener("pagehide", close);
+    window.__webVitals = {records: () => load().concat([finalize(Object.assign({}, current), performance.now())])};
+})();
+"""
+
+COLLECT_SCRIPT = "() => window.__webVitals ? window.__webVitals.records() : []"
+
+
+def collect_vitals(page: Page) -> list:
+    """Get timing records of every navigation of page so far, empty when nothing was recorded"""
+    try:
+        return page.evaluate(COLLECT_SCRIPT)
+    except PlaywrightError:
+        return []
@@ -0,0 +1 @@
+# Memory-leak soak runs of cart add/remove cycles, run with python -m soak
@@ -0,0 +1,95 @@
+import argparse
+import platform
+import sys
+from importlib.metadata import version
+
+from playwright.sync_api import sync_playwright
+
+from soak.runner import SoakRunner, Thresholds, analyze, write_results
+from standin import FaultProfile, StandinServer
+from utils.auth_cache import DEFAULT_USER
+from utils.settings import CONTEXT_OPTIONS, LIVE_BASE_URL
+
+
+def main() -> int:
+    """Soak cart add/remove cycles in one page and flag memory growth and latency drift"""
+    parser = argparse.ArgumentParser(description="Loop cart add/remove cycles and check for memory leaks")
+    parser.add_argument("--target", choices=("live", "local"), default="local",
+                        help="Soak www.saucedemo.com (live) or the bundled stand-in server (local)")
+    parser.add_argument("--standin-config", help="Fault profile for --target=local")
+    parser.add_argument("--base-url", help="Soak the app at this URL instead of --target")
+    parser.add_argument("--user", default=DEFAULT_USER, help="User whose session is seeded")
+    parser.add_argument("--iterations", type=int, default=2000, help="Timed add/remove cycles")
+    parser.add_argument("--warmup", type=int, default=50, help="Untimed cycles before the first sample")
+    parser.add_argument("--items", type=int, default=3, help="Products added per cycle, at least 2")
+    parser.add_argument("--sample-every", type=int, default=50, help="Cycles between memory samples")
+    parser.add_argument("--no-gc", action="store_true", help="Sample without forcing a garbage collection first")
+    parser.add_argument("--max-heap-kb", type=float, default=Thresholds.heap_kb,
+                        help="Largest JS heap growth in KB per 1000 iterations")
+    parser.add_argument("--max-nodes", type=float, default=Thresholds.nodes,
+                        help="Largest DOM node growth per 1000 iterations")
+    parser.add_argument("--max-listeners", type=float, default=Thresholds.listeners,
+                        help="Largest event listener growth per 1000 iterations")
+    parser.add_argument("--max-drift", type=float, default=Thresholds.drift,
+                        help="Largest latency drift from the first to the last tenth, 0.25 is 25%%")
+    parser.add_argument("--output", default="reports/soak.json", help="Where to write the results")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    args = parser.parse_args()
+    if args.items < 2:
+        parser.error("--items must be at least 2")
+
+    thresholds = Thresholds(args.max_heap_kb, args.max_nodes, args.max_listeners, args.max_drift)
+    server = None
+    base_url = args.base_url or LIVE_BASE_URL
+    if args.base_url is None and args.target == "local":
+        server = StandinServer(profile=FaultProfile.load(args.standin_config) if args.standin_config else FaultProfile())
+        server.start()
+        base_url = server.url
+    base_url = base_url if base_url.endswith("/") else base_url + "/"
+
+    environment = {
+        "target": "url" if args.base_url else args.target,
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "items": args.items,
+        "sample_every": args.sample_every,
+        "gc": not args.no_gc,
+        "playwright": version("playwright"),
+        "python": platform.python_version(),
+        "platform": platform.platform()
+    }
+
+    def progress(iteration: int, sample: dict, cycle_ms: float):
+        print(f"{iteration:>8}{sample['JSHeapUsedSize'] / 1024 / 1024:>10.2f}{sample['Nodes']:>8.0f}"
+              f"{sample['JSEventListeners']:>11.0f}{cycle_ms:>10.1f}", flush=True)
+
+    print(f"{'iter':>8}{'heap MB':>10}{'nodes':>8}{'listeners':>11}{'cycle ms':>10}")
+    try:
+        with sync_playwright() as p:
+            # The memory metrics come from the Chromium DevTools protocol
+            browser = p.chromium.launch(headless=not args.headed)
+            page = browser.new_context(**CONTEXT_OPTIONS).new_page()
+            runner = SoakRunner(page, base_url, args.user, args.items, args.sample_every, not args.no_gc)
+            result = runner.run(args.iterations, args.warmup, progress)
+            browser.close()
+    finally:
+        if server is not None:
+            server.stop()
+
+    findings = analyze(result, thresholds)
+    write_results(args.output, environment, result, findings, thresholds)
+    print(f"\n{'metric':<18}{'first':>10}{'last':>10}{'growth':>10}  {'unit':<19}verdict")
+    for finding in findings:
+        if "drift" in finding:
+            verdict = f"drift {finding['drift']:+.1%} (limit {finding['limit']:.0%})"
+        else:
+            verdict = f"limit {finding['limit']:g}"
+        verdict += "  LEAK" if finding["leak"] else "  ok"
+        print(f"{finding['metric']:<18}{finding['first']:>10.1f}{finding['last']:>10.1f}"
+              f"{finding['growth']:>+10.1f}  {finding['unit']:<19}{verdict}")
+    print(f"details: {args.output}")
+    return 1 if any(finding["leak"] for finding in findings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
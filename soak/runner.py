@@ -0,0 +1,191 @@
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from playwright.sync_api import Page
+
+from pages.cart_page import CartPage
+from pages.inventory_page import InventoryPage
+from utils.auth_cache import DEFAULT_USER
+from utils.state_seeding import seed
+from utils.stats import summarize
+
+
+# Performance.getMetrics names sampled after every --sample-every cycles
+METRICS = ("JSHeapUsedSize", "Nodes", "JSEventListeners")
+STEPS = ("add", "remove", "cart_remove", "cycle")
+# Growth is reported per this many iterations
+PER = 1000
+URL_TIMEOUT = 10000
+BADGE_SCRIPT = (
+    "(expected) => (document.querySelector('.shopping_cart_badge')?.textContent || '0') === String(expected)"
+)
+
+
+@dataclass(frozen=True)
+class Thresholds:
+    """Largest growth per 1000 iterations, and latency drift, still counted as steady"""
+    heap_kb: float = 512.0
+    nodes: float = 50.0
+    listeners: float = 20.0
+    drift: float = 0.25
+
+
+class MemorySampler:
+    """Reads JS heap, DOM node and event listener counts of a page over the Chromium DevTools protocol"""
+
+    def __init__(self, page: Page, collect_garbage: bool = True):
+        self.session = page.context.new_cdp_session(page)
+        self.session.send("Performance.enable")
+        self.collect_garbage = collect_garbage
+
+    def sample(self) -> Dict[str, float]:
+        """Get the current metrics, after a full garbage collection unless disabled"""
+        if self.collect_garbage:
+            # Otherwise garbage not collected yet shows up as growth
+            self.session.send("HeapProfiler.collectGarbage")
+        metrics = {metric["name"]: metric["value"] for metric in self.session.send("Performance.getMetrics")["metrics"]}
+        return {name: metrics.get(name, 0.0) for name in METRICS}
+
+    def close(self):
+        """Detach from the page"""
+        self.session.detach()
+
+
+class SoakRunner:
+    """Loops cart add/remove cycles in one page, timing every step and sampling memory at intervals"""
+
+    def __init__(self, page: Page, base_url: str, user: str = DEFAULT_USER, items: int = 3,
+                 sample_every: int = 50, collect_garbage: bool = True):
+        if items < 2:
+            raise ValueError("A soak cycle needs at least 2 items, one removed on each page")
+        self.page = page
+        self.base_url = base_url
+        self.user = user
+        self.items = items
+        self.sample_every = sample_every
+        self.collect_garbage = collect_garbage
+
+    def run(self, iterations: int, warmup: int = 50,
+            progress: Callable[[int, Dict[str, float], float], None] = None) -> dict:
+        """Run warmup untimed cycles, then iterations timed ones, and get latencies and memory samples"""
+        seed(self.page, self.base_url, self.user, (), "inventory")
+        sampler = MemorySampler(self.page, self.collect_garbage)
+        latencies = {step: [] for step in STEPS}
+        samples = []
+        try:
+            for _ in range(warmup):
+                self.cycle()
+            for iteration in range(iterations):
+                for step, ms in self.cycle().items():
+                    latencies[step].append(ms)
+                if iteration % self.sample_every == 0 or iteration == iterations - 1:
+                    samples.append(dict(sampler.sample(), iteration=iteration))
+                    if progress is not None:
+                        progress(iteration, samples[-1], latencies["cycle"][-1])
+        finally:
+            sampler.close()
+        return {"latencies": latencies, "samples": samples}
+
+    def cycle(self) -> Dict[str, float]:
+        """Add items on the inventory page, remove one there and the rest in the cart, then go back"""
+        inventory_page = InventoryPage(self.page)
+        cycle_start = start = time.perf_counter()
+        for index in range(self.items):
+            inventory_page.add_product_to_cart(index)
+        inventory_page.wait_until(BADGE_SCRIPT, arg=self.items, description=f"cart badge {self.items}")
+        add = _elapsed(start)
+
+        start = time.perf_counter()
+        inventory_page.remove_product_from_cart(0)
+        inventory_page.wait_until(BADGE_SCRIPT, arg=self.items - 1, description=f"cart badge {self.items - 1}")
+        remove = _elapsed(start)
+
+        inventory_page.click_cart()
+        self.page.wait_for_url("**/cart.html", timeout=URL_TIMEOUT)
+        cart_page = CartPage(self.page)
+        start = time.perf_counter()
+        for _ in range(self.items - 1):
+            cart_page.remove_item_from_cart(0)
+        cart_page.wait_for_cart_empty()
+        cart_remove = _elapsed(start)
+
+        cart_page.continue_shopping()
+        self.page.wait_for_url("**/inventory.html", timeout=URL_TIMEOUT)
+        return {"add": add, "remove": remove, "cart_remove": cart_remove, "cycle": _elapsed(cycle_start)}
+
+
+def _elapsed(start: float) -> float:
+    """Get ms since a perf_counter() start"""
+    return (time.perf_counter() - start) * 1000
+
+
+def growth(iterations: List[int], values: List[float]) -> float:
+    """Get least-squares slope of values per 1000 iterations, 0 with fewer than 3 points"""
+    if len(values) < 3 or len(set(iterations)) < 2:
+        return 0.0
+    return statistics.linear_regression(iterations, values).slope * PER
+
+
+def analyze(result: dict, thresholds: Thresholds = Thresholds()) -> List[dict]:
+    """Get memory growth and latency drift findings, leak set where a threshold is exceeded
+
+    Drift compares the median of the last tenth of the iterations with the first tenth, so a
+    few slow outliers don't count.
+    """
+    samples = result["samples"]
+    iterations = [sample["iteration"] for sample in samples]
+    findings = []
+    for metric, limit, scale, unit in (
+        ("JSHeapUsedSize", thresholds.heap_kb, 1 / 1024, "KB"),
+        ("Nodes", thresholds.nodes, 1, "nodes"),
+        ("JSEventListeners", thresholds.listeners, 1, "listeners")
+    ):
+        values = [sample[metric] * scale for sample in samples]
+        slope = growth(iterations, values)
+        findings.append({
+            "metric": metric,
+            "first": values[0] if values else 0.0,
+            "last": values[-1] if values else 0.0,
+            "growth": slope,
+            "unit": f"{unit}/{PER} it",
+            "limit": limit,
+            "leak": slope > limit
+        })
+    for step, latencies in result["latencies"].items():
+        if not latencies:
+            continue
+        window = max(len(latencies) // 10, 1)
+        first = statistics.median(latencies[:window])
+        last = statistics.median(latencies[-window:])
+        drift = last / first - 1 if first else 0.0
+        findings.append({
+            "metric": f"{step} ms",
+            "first": first,
+            "last": last,
+            "growth": growth(list(range(len(latencies))), latencies),
+            "unit": f"ms/{PER} it",
+            "drift": drift,
+            "limit": thresholds.drift,
+            "leak": drift > thresholds.drift
+        })
+    return findings
+
+
+def write_results(path: str, environment: dict, result: dict, findings: List[dict], thresholds: Thresholds):
+    """Write samples, latency summaries and findings with the environment they were measured in"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "environment": environment,
+        "thresholds": asdict(thresholds),
+        "findings": findings,
+        "samples": result["samples"],
+        "latencies": {
+            step: {"samples": latencies, "summary": summarize(latencies)}
+            for step, latencies in result["latencies"].items() if latencies
+        }
+    }, indent=2), encoding="utf-8")
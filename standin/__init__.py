@@ -0,0 +1,7 @@
+from standin.server import FaultProfile, RouteRule, StandinServer
+
+__all__ = [
+    "FaultProfile",
+    "RouteRule",
+    "StandinServer"
+]
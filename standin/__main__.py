@@ -0,0 +1,30 @@
+import argparse
+import asyncio
+
+from standin.server import FaultProfile, StandinServer
+
+
+def main():
+    """Run the stand-in server in the foreground"""
+    parser = argparse.ArgumentParser(description="Offline stand-in for www.saucedemo.com")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind, 0 picks a free port")
+    parser.add_argument("--config", help="JSON file with latency, jitter and error injection rules")
+    args = parser.parse_args()
+
+    profile = FaultProfile.load(args.config) if args.config else FaultProfile()
+    server = StandinServer(args.host, args.port, profile)
+
+    async def serve():
+        await server.open()
+        print(f"Serving SauceDemo stand-in at {server.url}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
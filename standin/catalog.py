@@ -0,0 +1,12 @@
+# Accounts and pricing of the stand-in shop, its products are in utils.products
+PASSWORD = "secret_sauce"
+USERS = (
+    "standard_user",
+    "locked_out_user",
+    "problem_user",
+    "performance_glitch_user",
+    "error_user",
+    "visual_user"
+)
+LOCKED_USERS = ("locked_out_user",)
+TAX_RATE = 0.08
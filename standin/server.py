@@ -0,0 +1,291 @@
+import asyncio
+import fnmatch
+import json
+import random
+import threading
+from dataclasses import dataclass, asdict
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import quote, unquote, urlsplit
+
+from standin.catalog import LOCKED_USERS, PASSWORD, TAX_RATE, USERS
+from utils.products import PRODUCTS
+
+
+SITE_DIR = Path(__file__).parent / "site"
+SESSION_COOKIE = "session-username"
+PROTECTED_PAGES = (
+    "/inventory.html",
+    "/cart.html",
+    "/checkout-step-one.html",
+    "/checkout-step-two.html",
+    "/checkout-complete.html"
+)
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".svg": "image/svg+xml",
+    ".json": "application/json"
+}
+READ_TIMEOUT = 30
+
+
+@dataclass
+class RouteRule:
+    """Latency, jitter and error injection for requests matching a path glob"""
+
+    path: str = "*"
+    latency_ms: float = 0
+    jitter_ms: float = 0
+    error_rate: float = 0.0
+    error_status: int = 500
+    user: Optional[str] = None
+
+    def matches(self, path: str, user: Optional[str]) -> bool:
+        """Check if rule applies to request path made by user"""
+        if self.user is not None and self.user != user:
+            return False
+        return fnmatch.fnmatch(path, self.path)
+
+
+# Reproduces the slow login of performance_glitch_user on www.saucedemo.com
+DEFAULT_RULES = (
+    RouteRule(path="/inventory.html", latency_ms=2500, user="performance_glitch_user"),
+)
+
+
+class FaultProfile:
+    """Ordered route rules, the first rule matching a request wins"""
+
+    def __init__(self, rules: List[RouteRule] = None, seed: int = 0, include_defaults: bool = True):
+        self.rules = list(rules or [])
+        if include_defaults:
+            self.rules.extend(DEFAULT_RULES)
+        self.seed = seed
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FaultProfile":
+        """Create profile from config dict"""
+        return cls(
+            rules=[RouteRule(**rule) for rule in data.get("rules", [])],
+            seed=data.get("seed", 0),
+            include_defaults=data.get("include_defaults", True)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "FaultProfile":
+        """Load profile from JSON config file"""
+        with open(path, encoding="utf-8") as config_file:
+            return cls.from_dict(json.load(config_file))
+
+    def to_dict(self) -> dict:
+        """Get profile as config dict"""
+        return {
+            "seed": self.seed,
+            "include_defaults": False,
+            "rules": [asdict(rule) for rule in self.rules]
+        }
+
+    def match(self, path: str, user: Optional[str]) -> Optional[RouteRule]:
+        """Get first rule matching the request"""
+        for rule in self.rules:
+            if rule.matches(path, user):
+                return rule
+        return None
+
+    def delay(self, rule: RouteRule) -> float:
+        """Get delay in seconds for one request"""
+        jitter = self._random.uniform(-rule.jitter_ms, rule.jitter_ms) if rule.jitter_ms else 0
+        return max(rule.latency_ms + jitter, 0) / 1000
+
+    def should_fail(self, rule: RouteRule) -> bool:
+        """Decide if one request gets an injected error"""
+        return rule.error_rate > 0 and self._random.random() < rule.error_rate
+
+
+class StandinServer:
+    """Local async stand-in for www.saucedemo.com serving the pages and data-test hooks of pages/"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, profile: FaultProfile = None):
+        self.host = host
+        self.port = port
+        self.profile = profile or FaultProfile()
+        self.requests = 0
+        self.injected_errors = 0
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server"""
+        return f"http://{self.host}:{self.port}/"
+
+    async def open(self):
+        """Start listening, binding a free port if none was given"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Serve until cancelled, opening the socket first if needed"""
+        if self._server is None:
+            await self.open()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self) -> str:
+        """Start serving from a background thread and return base URL"""
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.open())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="standin-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.url
+
+    def stop(self):
+        """Stop background server"""
+        if self._loop is None:
+            return
+
+        async def close():
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve a single request and close the connection"""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), READ_TIMEOUT)
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), READ_TIMEOUT)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            parts = request_line.decode("latin-1").split()
+            if len(parts) != 3:
+                return
+            method, target, _ = parts
+            self.requests += 1
+            status, response_headers, body = await self._respond(method, target, headers)
+            writer.write(self._encode(status, response_headers, body, include_body=method != "HEAD"))
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method: str, target: str, headers: dict):
+        """Apply fault rules and route the request"""
+        path = unquote(urlsplit(target).path) or "/"
+        user = self._session_user(headers.get("cookie", ""))
+        rule = self.profile.match(path, user)
+        if rule is not None:
+            delay = self.profile.delay(rule)
+            if delay:
+                await asyncio.sleep(delay)
+            if self.profile.should_fail(rule):
+                self.injected_errors += 1
+                return self._text(rule.error_status, f"Injected error for {path}")
+        if method not in ("GET", "HEAD"):
+            return self._text(HTTPStatus.METHOD_NOT_ALLOWED, "Method not allowed")
+        return self._route(path, user)
+
+    def _route(self, path: str, user: Optional[str]):
+        """Get response for path"""
+        if path == "/":
+            path = "/index.html"
+        if path in PROTECTED_PAGES and not self._is_valid_session(user):
+            # Same rule as the real app: protected pages send you back to login
+            return HTTPStatus.FOUND, {"Location": f"/?denied={quote(path)}"}, b""
+        if path == "/__standin/health":
+            return self._text(HTTPStatus.OK, "ok")
+        if path == "/static/catalog.js":
+            return self._ok(".js", self._catalog_script(), cache=True)
+        if path.startswith("/static/media/") and path.endswith(".svg"):
+            return self._product_image(path[len("/static/media/"):-len(".svg")])
+        file_path = (SITE_DIR / path.lstrip("/")).resolve()
+        if SITE_DIR.resolve() not in file_path.parents or not file_path.is_file():
+            return self._text(HTTPStatus.NOT_FOUND, "Not found")
+        return self._ok(file_path.suffix, file_path.read_bytes(), cache=path.startswith("/static/"))
+
+    def _product_image(self, slug: str):
+        """Get generated placeholder image for product slug"""
+        names = {product.slug: product.name for product in PRODUCTS}
+        if slug not in names:
+            return self._text(HTTPStatus.NOT_FOUND, "Not found")
+        svg = (
+            '<svg xmlns="http://www.w3.org/2000/svg" width="240" height="240" viewBox="0 0 240 240">'
+            '<rect width="240" height="240" fill="#e2231a"/>'
+            f'<text x="120" y="124" font-size="14" text-anchor="middle" fill="#fff">{names[slug]}</text>'
+            '</svg>'
+        )
+        return self._ok(".svg", svg.encode("utf-8"), cache=True)
+
+    @staticmethod
+    def _catalog_script() -> bytes:
+        """Get catalog as a script defining window.STANDIN_CATALOG"""
+        catalog = {
+            "products": [product.to_dict() for product in PRODUCTS],
+            "users": list(USERS),
+            "lockedUsers": list(LOCKED_USERS),
+            "password": PASSWORD,
+            "taxRate": TAX_RATE
+        }
+        return f"window.STANDIN_CATALOG = {json.dumps(catalog)};\n".encode("utf-8")
+
+    @staticmethod
+    def _session_user(cookie_header: str) -> Optional[str]:
+        """Get user from session cookie"""
+        cookies = SimpleCookie()
+        try:
+            cookies.load(cookie_header)
+        except Exception:
+            return None
+        morsel = cookies.get(SESSION_COOKIE)
+        return morsel.value if morsel else None
+
+    @staticmethod
+    def _is_valid_session(user: Optional[str]) -> bool:
+        """Check if session cookie belongs to a user allowed to shop"""
+        return user in USERS and user not in LOCKED_USERS
+
+    @staticmethod
+    def _ok(suffix: str, body: bytes, cache: bool = False):
+        """Get 200 response for body of given file type"""
+        headers = {
+            "Content-Type": CONTENT_TYPES.get(suffix, "application/octet-stream"),
+            "Cache-Control": "public, max-age=3600" if cache else "no-cache"
+        }
+        return HTTPStatus.OK, headers, body
+
+    @staticmethod
+    def _text(status: int, message: str):
+        """Get plain text response"""
+        return status, {"Content-Type": "text/plain; charset=utf-8"}, message.encode("utf-8")
+
+    @staticmethod
+    def _encode(status: int, headers: dict, body: bytes, include_body: bool = True) -> bytes:
+        """Serialize HTTP/1.1 response"""
+        status = HTTPStatus(status)
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        headers = dict(headers, **{"Content-Length": str(len(body)), "Connection": "close"})
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body if include_body else b"")
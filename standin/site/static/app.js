@@ -0,0 +1,258 @@
+(function () {
+    "use strict";
+
+    var catalog = window.STANDIN_CATALOG;
+    var CART_KEY = "cart-contents";
+    var SESSION_COOKIE = "session-username";
+    var SORTERS = {
+        az: function (a, b) { return a.name.localeCompare(b.name); },
+        za: function (a, b) { return b.name.localeCompare(a.name); },
+        lohi: function (a, b) { return a.price - b.price || a.name.localeCompare(b.name); },
+        hilo: function (a, b) { return b.price - a.price || a.name.localeCompare(b.name); }
+    };
+
+    function el(tag, attrs, children) {
+        var node = document.createElement(tag);
+        Object.keys(attrs || {}).forEach(function (name) {
+            node.setAttribute(name, attrs[name]);
+        });
+        (children || []).forEach(function (child) {
+            node.appendChild(typeof child === "string" ? document.createTextNode(child) : child);
+        });
+        return node;
+    }
+
+    function go(path) {
+        window.location.href = path;
+    }
+
+    function productById(id) {
+        return catalog.products.filter(function (product) { return product.id === id; })[0];
+    }
+
+    function formatPrice(value) {
+        return "$" + value.toFixed(2);
+    }
+
+    function readCart() {
+        try {
+            return JSON.parse(window.localStorage.getItem(CART_KEY)) || [];
+        } catch (error) {
+            return [];
+        }
+    }
+
+    function writeCart(ids) {
+        window.localStorage.setItem(CART_KEY, JSON.stringify(ids));
+        renderBadge();
+    }
+
+    function sessionUser() {
+        var match = document.cookie.match(new RegExp("(?:^|; )" + SESSION_COOKIE + "=([^;]*)"));
+        return match ? decodeURIComponent(match[1]) : null;
+    }
+
+    function showError(container, message) {
+        container.innerHTML = "";
+        container.appendChild(el("h3", {"data-test": "error"}, [message]));
+    }
+
+    function renderBadge() {
+        var link = document.querySelector(".shopping_cart_link");
+        if (!link) {
+            return;
+        }
+        var badge = link.querySelector(".shopping_cart_badge");
+        var count = readCart().length;
+        if (!count && badge) {
+            badge.remove();
+        } else if (count && !badge) {
+            link.appendChild(el("span", {"class": "shopping_cart_badge", "data-test": "shopping-cart-badge"}, [String(count)]));
+        } else if (badge) {
+            badge.textContent = String(count);
+        }
+    }
+
+    function cartButton(product, inCart, onChange) {
+        var action = inCart ? "remove" : "add-to-cart";
+        var button = el("button", {
+            "class": "btn btn_small btn_inventory " + (inCart ? "btn_secondary" : "btn_primary"),
+            "data-test": action + "-" + product.slug,
+            "id": action + "-" + product.slug,
+            "name": action + "-" + product.slug
+        }, [inCart ? "Remove" : "Add to cart"]);
+        button.addEventListener("click", function () {
+            var ids = readCart().filter(function (id) { return id !== product.id; });
+            if (!inCart) {
+                ids.push(product.id);
+            }
+            writeCart(ids);
+            onChange(button, !inCart);
+        });
+        return button;
+    }
+
+    function itemLabel(product) {
+        return [
+            el("a", {"href": "#", "id": "item_" + product.id + "_title_link", "data-test": "item-" + product.id + "-title-link"}, [
+                el("div", {"class": "inventory_item_name", "data-test": "inventory-item-name"}, [product.name])
+            ]),
+            el("div", {"class": "inventory_item_desc", "data-test": "inventory-item-desc"}, [product.description])
+        ];
+    }
+
+    function inventoryItem(product, inCart) {
+        var pricebar = el("div", {"class": "pricebar"}, [
+            el("div", {"class": "inventory_item_price", "data-test": "inventory-item-price"}, [formatPrice(product.price)])
+        ]);
+        function attach(inCartNow) {
+            pricebar.appendChild(cartButton(product, inCartNow, function (button, next) {
+                button.remove();
+                attach(next);
+            }));
+        }
+        attach(inCart);
+        var image = sessionUser() === "problem_user" ? "sl-404" : product.slug;
+        return el("div", {"class": "inventory_item", "data-test": "inventory-item"}, [
+            el("div", {"class": "inventory_item_img"}, [
+                el("img", {"alt": product.name, "class": "inventory_item_img", "src": "static/media/" + image + ".svg"})
+            ]),
+            el("div", {"class": "inventory_item_description", "data-test": "inventory-item-description"}, [
+                el("div", {"class": "inventory_item_label"}, itemLabel(product)),
+                pricebar
+            ])
+        ]);
+    }
+
+    function cartItem(product, removable) {
+        var pricebar = el("div", {"class": "item_pricebar"}, [
+            el("div", {"class": "inventory_item_price", "data-test": "inventory-item-price"}, [formatPrice(product.price)])
+        ]);
+        var row = el("div", {"class": "cart_item", "data-test": "inventory-item"}, [
+            el("div", {"class": "cart_quantity", "data-test": "item-quantity"}, ["1"]),
+            el("div", {"class": "cart_item_label"}, itemLabel(product).concat([pricebar]))
+        ]);
+        if (removable) {
+            pricebar.appendChild(cartButton(product, true, function () {
+                row.replaceWith(el("div", {"class": "removed_cart_item"}));
+            }));
+        }
+        return row;
+    }
+
+    var pages = {
+        login: function () {
+            var form = document.getElementById("login_form");
+            var errors = document.querySelector(".error-message-container");
+            var denied = new URLSearchParams(window.location.search).get("denied");
+            if (denied) {
+                showError(errors, "Epic sadface: You can only access '" + denied + "' when you are logged in.");
+            }
+            form.addEventListener("submit", function (event) {
+                event.preventDefault();
+                var username = document.querySelector("[data-test='username']").value;
+                var password = document.querySelector("[data-test='password']").value;
+                if (!username) {
+                    return showError(errors, "Epic sadface: Username is required");
+                }
+                if (!password) {
+                    return showError(errors, "Epic sadface: Password is required");
+                }
+                if (catalog.users.indexOf(username) < 0 || password !== catalog.password) {
+                    return showError(errors, "Epic sadface: Username and password do not match any user in this service");
+                }
+                if (catalog.lockedUsers.indexOf(username) >= 0) {
+                    return showError(errors, "Epic sadface: Sorry, this user has been locked out.");
+                }
+                document.cookie = SESSION_COOKIE + "=" + encodeURIComponent(username) + "; path=/";
+                go("inventory.html");
+            });
+        },
+
+        inventory: function () {
+            var list = document.querySelector(".inventory_list");
+            var select = document.querySelector(".product_sort_container");
+            var active = document.querySelector(".active_option");
+            function render() {
+                var cart = readCart();
+                list.innerHTML = "";
+                catalog.products.slice().sort(SORTERS[select.value]).forEach(function (product) {
+                    list.appendChild(inventoryItem(product, cart.indexOf(product.id) >= 0));
+                });
+                active.textContent = select.options[select.selectedIndex].text;
+            }
+            select.addEventListener("change", render);
+            render();
+        },
+
+        cart: function () {
+            var list = document.querySelector(".cart_list");
+            readCart().forEach(function (id) {
+                list.appendChild(cartItem(productById(id), true));
+            });
+            document.querySelector("[data-test='continue-shopping']").addEventListener("click", function () {
+                go("inventory.html");
+            });
+            document.querySelector("[data-test='checkout']").addEventListener("click", function () {
+                go("checkout-step-one.html");
+            });
+        },
+
+        "checkout-step-one": function () {
+            var form = document.getElementById("checkout_info_form");
+            var errors = document.querySelector(".error-message-container");
+            var fields = [["firstName", "First Name"], ["lastName", "Last Name"], ["postalCode", "Postal Code"]];
+            form.addEventListener("submit", function (event) {
+                event.preventDefault();
+                for (var i = 0; i < fields.length; i++) {
+                    if (!document.querySelector("[data-test='" + fields[i][0] + "']").value) {
+                        return showError(errors, "Error: " + fields[i][1] + " is required");
+                    }
+                }
+                go("checkout-step-two.html");
+            });
+            document.querySelector("[data-test='cancel']").addEventListener("click", function () {
+                go("cart.html");
+            });
+        },
+
+        "checkout-step-two": function () {
+            var list = document.querySelector(".cart_list");
+            var subtotal = 0;
+            readCart().forEach(function (id) {
+                var product = productById(id);
+                subtotal += product.price;
+                list.appendChild(cartItem(product, false));
+            });
+            var tax = Math.round(subtotal * catalog.taxRate * 100) / 100;
+            document.querySelector(".summary_subtotal_label").textContent = "Item total: " + formatPrice(subtotal);
+            document.querySelector(".summary_tax_label").textContent = "Tax: " + formatPrice(tax);
+            document.querySelector(".summary_total_label").textContent = "Total: " + formatPrice(subtotal + tax);
+            document.querySelector("[data-test='finish']").addEventListener("click", function () {
+                writeCart([]);
+                go("checkout-complete.html");
+            });
+            document.querySelector("[data-test='cancel']").addEventListener("click", function () {
+                go("inventory.html");
+            });
+        },
+
+        "checkout-complete": function () {
+            document.querySelector("[data-test='back-to-products']").addEventListener("click", function () {
+                go("inventory.html");
+            });
+        }
+    };
+
+    var logout = document.getElementById("logout_sidebar_link");
+    if (logout) {
+        logout.addEventListener("click", function (event) {
+            event.preventDefault();
+            document.cookie = SESSION_COOKIE + "=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT";
+            window.localStorage.removeItem(CART_KEY);
+            go("./");
+        });
+    }
+    pages[document.body.getAttribute("data-page")]();
+    renderBadge();
+}());
@@ -1,25 +1,11 @@
 import pytest
-from pages.login_page import LoginPage
-from pages.inventory_page import InventoryPage
 from pages.cart_page import CartPage
 
 
-class TestCart:
-    """Test cases for shopping cart functionality"""
-    
-    @pytest.fixture(autouse=True)
-    def login_and_add_products(self, page, base_url):
-        """Login and add products before each test"""
-        login_page = LoginPage(page)
-        login_page.navigate(base_url)
-        login_page.login("standard_user", "secret_sauce")
-        page.wait_for_url("**/inventory.html", timeout=5000)
-        
-        inventory_page = InventoryPage(page)
-        inventory_page.add_product_to_cart(0)
-        inventory_page.add_product_to_cart(1)
-        inventory_page.click_cart()
-        page.wait_for_url("**/cart.html", timeout=5000)
+@pytest.mark.read_only(cart=[0, 1], at="cart")
+@pytest.mark.auth("standard_user")
+class TestCartDisplay:
+    """Read-only checks of a cart with two products sharing one seeded page"""
     
     @pytest.mark.smoke
     @pytest.mark.cart
@@ -59,6 +45,35 @@ class TestCart:
         assert all(price for price in item_prices), "All item prices should be non-empty"
         assert all("$" in price for price in item_prices), "All prices should contain $"
     
+    @pytest.mark.regression
+    @pytest.mark.cart
+    def test_cart_snapshot(self, page):
+        """Test that cart snapshot returns typed records for every item"""
+        cart_page = CartPage(page)
+        
+        items = cart_page.get_cart_items()
+        
+        assert len(items) == 2, "Should have 2 cart records"
+        assert all(item.quantity == 1 for item in items), "Each item should have quantity 1"
+        assert all(item.price > 0 for item in items), "All prices should be parsed as positive numbers"
+        assert all(item.button_test_id.startswith("remove") for item in items), "Each item should have a remove button"
+    
+    @pytest.mark.regression
+    @pytest.mark.cart
+    def test_cart_structure(self, page, assert_dom_unchanged):
+        """Test that the cart list keeps its baseline DOM structure"""
+        assert_dom_unchanged(CartPage(page))
+
+
+@pytest.mark.auth("standard_user")
+class TestCart:
+    """Test cases for shopping cart functionality"""
+    
+    @pytest.fixture(autouse=True)
+    def login_and_add_products(self, seed_state):
+        """Seed session and two products, open cart before each test"""
+        seed_state(cart=[0, 1], at="cart")
+    
     @pytest.mark.regression
     @pytest.mark.cart
     def test_remove_item_from_cart(self, page):
@@ -79,6 +94,7 @@ class TestCart:
         
         cart_page.remove_item_from_cart(0)
         cart_page.remove_item_from_cart(0)
+        cart_page.wait_for_cart_empty()
         
         assert cart_page.is_cart_empty(), "Cart should be empty"
     
@@ -112,5 +128,6 @@ class TestCart:
         
         cart_page.remove_item_from_cart(0)
         cart_page.remove_item_from_cart(0)
+        cart_page.wait_for_cart_empty()
         
         assert cart_page.is_cart_empty(), "Should show empty cart message"
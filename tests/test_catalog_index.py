@@ -0,0 +1,104 @@
+import pytest
+
+from pages.catalog_index import CATALOG_SCRIPT, GENERATION_SCRIPT
+from pages.inventory_page import InventoryPage
+
+
+PRODUCTS = [(4, "Sauce Labs Backpack", "sauce-labs-backpack"), (0, "Sauce Labs Bike Light", "sauce-labs-bike-light")]
+
+
+class FakeLocator:
+    """Locator recording clicks on the page it belongs to"""
+    
+    def __init__(self, page, selector: str):
+        self.page = page
+        self.selector = selector
+    
+    def click(self):
+        self.page.clicks.append(self.selector)
+        self.page.toggle(self.selector)
+
+
+class FakePage:
+    """Inventory page whose rows show add or remove buttons, answering the catalog scripts"""
+    
+    def __init__(self, in_cart=()):
+        self.url = "https://www.saucedemo.com/inventory.html"
+        self.in_cart = set(in_cart)
+        self.clicks = []
+        self.reads = 0
+    
+    def toggle(self, selector: str):
+        for product_id, _, slug in PRODUCTS:
+            if f"add-to-cart-{slug}" in selector:
+                self.in_cart.add(product_id)
+            elif f"remove-{slug}" in selector:
+                self.in_cart.discard(product_id)
+    
+    def wait_for_selector(self, selector: str, timeout=None):
+        pass
+    
+    def locator(self, selector: str) -> FakeLocator:
+        return FakeLocator(self, selector)
+    
+    def evaluate(self, script: str, arg=None):
+        assert script == GENERATION_SCRIPT
+        return "token:0"
+    
+    def eval_on_selector_all(self, selector: str, script: str, arg=None):
+        assert script == CATALOG_SCRIPT
+        self.reads += 1
+        return {
+            "generation": "token:0",
+            "rows": [
+                {
+                    "name": name, "price": "$9.99", "slug": slug, "id": product_id,
+                    "inCart": product_id in self.in_cart
+                }
+                for product_id, name, slug in PRODUCTS
+            ]
+        }
+
+
+class TestCartButtons:
+    """Add and remove by catalog position check the button state before clicking"""
+    
+    def test_add_and_remove_click_the_indexed_buttons(self):
+        """Test that toggling keeps the index and tracks the button state"""
+        page = FakePage()
+        inventory_page = InventoryPage(page)
+        
+        inventory_page.add_product_to_cart(1)
+        inventory_page.remove_product_from_cart(1)
+        
+        assert page.clicks == ['[data-test="add-to-cart-sauce-labs-bike-light"]',
+                               '[data-test="remove-sauce-labs-bike-light"]']
+        assert page.reads == 1
+    
+    def test_add_in_cart_product_raises(self):
+        """Test that adding a product already in the cart raises without clicking"""
+        page = FakePage(in_cart=[4])
+        
+        with pytest.raises(ValueError, match="Sauce Labs Backpack is already in the cart"):
+            InventoryPage(page).add_product_by_id(4)
+        assert page.clicks == []
+    
+    def test_remove_product_outside_cart_raises(self):
+        """Test that removing a product outside the cart raises without clicking"""
+        page = FakePage()
+        
+        with pytest.raises(ValueError, match="Sauce Labs Backpack is not in the cart"):
+            InventoryPage(page).remove_product_from_cart(0)
+        assert page.clicks == []
+    
+    def test_stale_index_is_read_again(self):
+        """Test that a toggle made around the page object is picked up before raising"""
+        page = FakePage()
+        inventory_page = InventoryPage(page)
+        inventory_page.catalog()
+        page.in_cart.add(4)
+        
+        inventory_page.remove_product_from_cart(0)
+        
+        assert page.clicks == ['[data-test="remove-sauce-labs-backpack"]']
+        assert page.reads == 2
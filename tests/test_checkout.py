@@ -1,30 +1,14 @@
 import pytest
-from pages.login_page import LoginPage
 from pages.inventory_page import InventoryPage
 from pages.cart_page import CartPage
 from pages.checkout_page import CheckoutPage
+from utils.state_seeding import app_state
 
 
-class TestCheckout:
-    """Test cases for checkout functionality"""
-    
-    @pytest.fixture(autouse=True)
-    def setup_checkout(self, page, base_url):
-        """Setup: Login, add products, and navigate to checkout"""
-        login_page = LoginPage(page)
-        login_page.navigate(base_url)
-        login_page.login("standard_user", "secret_sauce")
-        page.wait_for_url("**/inventory.html", timeout=5000)
-        
-        inventory_page = InventoryPage(page)
-        inventory_page.add_product_to_cart(0)
-        inventory_page.add_product_to_cart(1)
-        inventory_page.click_cart()
-        page.wait_for_url("**/cart.html", timeout=5000)
-        
-        cart_page = CartPage(page)
-        cart_page.proceed_to_checkout()
-        page.wait_for_url("**/checkout-step-one.html", timeout=5000)
+@pytest.mark.read_only(cart=[0, 1], at="checkout-step-one")
+@pytest.mark.auth("standard_user")
+class TestCheckoutDisplay:
+    """Read-only checks of checkout step one sharing one seeded page"""
     
     @pytest.mark.smoke
     @pytest.mark.checkout
@@ -35,6 +19,16 @@ class TestCheckout:
         assert checkout_page.is_visible(checkout_page.FIRST_NAME_INPUT), "First name input should be visible"
         assert checkout_page.is_visible(checkout_page.LAST_NAME_INPUT), "Last name input should be visible"
         assert checkout_page.is_visible(checkout_page.POSTAL_CODE_INPUT), "Postal code input should be visible"
+
+
+@pytest.mark.auth("standard_user")
+class TestCheckout:
+    """Test cases for checkout functionality"""
+    
+    @pytest.fixture(autouse=True)
+    def setup_checkout(self, seed_state):
+        """Setup: Seed session and two products, open checkout step one"""
+        seed_state(cart=[0, 1], at="checkout-step-one")
     
     @pytest.mark.smoke
     @pytest.mark.checkout
@@ -106,6 +100,18 @@ class TestCheckout:
         assert total_price, "Total price should be displayed"
         assert "$" in total_price, "Total price should contain $"
     
+    @pytest.mark.regression
+    @pytest.mark.checkout
+    def test_checkout_summary_structure(self, page, assert_dom_unchanged):
+        """Test that the checkout overview summary keeps its baseline DOM structure"""
+        checkout_page = CheckoutPage(page)
+        
+        checkout_page.fill_checkout_info("John", "Doe", "12345")
+        checkout_page.continue_checkout()
+        page.wait_for_url("**/checkout-step-two.html", timeout=5000)
+        
+        assert_dom_unchanged(checkout_page, "summary")
+    
     @pytest.mark.regression
     @pytest.mark.checkout
     def test_complete_order_message(self, page):
@@ -141,3 +147,29 @@ class TestCheckout:
         page.wait_for_url("**/inventory.html", timeout=5000)
         
         assert "inventory" in page.url, "Should navigate back to inventory page"
+
+
+@pytest.mark.auth("standard_user")
+class TestCheckoutSetupPath:
+    """Test cases walking the UI path that TestCheckout seeds"""
+    
+    @pytest.mark.smoke
+    @pytest.mark.checkout
+    def test_ui_setup_matches_seeded_state(self, page, logged_in_page, seed_state):
+        """Test that login, add to cart, cart and checkout button produce the seeded state"""
+        products = ["Sauce Labs Backpack", "Sauce Labs Bike Light"]
+        inventory_page = InventoryPage(page)
+        for product in products:
+            inventory_page.add_product_by_name(product)
+        inventory_page.click_cart()
+        page.wait_for_url("**/cart.html", timeout=5000)
+        
+        cart_page = CartPage(page)
+        cart_page.proceed_to_checkout()
+        page.wait_for_url("**/checkout-step-one.html", timeout=5000)
+        ui_state = app_state(page)
+        
+        seeded = seed_state(cart=products, at="checkout-step-one")
+        
+        assert ui_state == app_state(page), "UI path and seeding should leave the same session and cart"
+        assert ui_state["cart"] == list(seeded.cart), "Cart should hold both products in the order added"
@@ -0,0 +1,64 @@
+import pytest
+from pages.async_api import AsyncCartPage, AsyncCheckoutPage, AsyncInventoryPage, AsyncLoginPage
+
+
+# Both tests share the async browser of the async_sessions fixture, launched once per worker
+@pytest.mark.xdist_group("async_sessions")
+class TestConcurrentSessions:
+    """Test cases for independent user sessions running concurrently"""
+    
+    @pytest.mark.regression
+    @pytest.mark.login
+    def test_concurrent_logins(self, async_sessions, base_url):
+        """Test that several users can log in at the same time"""
+        users = ["standard_user", "problem_user", "performance_glitch_user"]
+        
+        def login_as(username):
+            async def flow(page):
+                login_page = AsyncLoginPage(page)
+                await login_page.navigate(base_url)
+                await login_page.login(username, "secret_sauce")
+                await page.wait_for_url("**/inventory.html", timeout=10000)
+                return await AsyncInventoryPage(page).get_product_count()
+            return flow
+        
+        product_counts = async_sessions.run_sessions(*(login_as(user) for user in users))
+        
+        assert product_counts == [6, 6, 6], "Every session should see 6 products"
+    
+    @pytest.mark.regression
+    @pytest.mark.checkout
+    def test_concurrent_checkouts(self, async_sessions, base_url):
+        """Test that independent sessions keep separate carts through checkout"""
+        
+        def checkout_with(item_count):
+            async def flow(page):
+                login_page = AsyncLoginPage(page)
+                await login_page.navigate(base_url)
+                await login_page.login("standard_user", "secret_sauce")
+                await page.wait_for_url("**/inventory.html", timeout=5000)
+                
+                inventory_page = AsyncInventoryPage(page)
+                for i in range(item_count):
+                    await inventory_page.add_product_to_cart(i)
+                await inventory_page.click_cart()
+                await page.wait_for_url("**/cart.html", timeout=5000)
+                
+                cart_page = AsyncCartPage(page)
+                cart_size = await cart_page.get_cart_items_count()
+                await cart_page.proceed_to_checkout()
+                await page.wait_for_url("**/checkout-step-one.html", timeout=5000)
+                
+                checkout_page = AsyncCheckoutPage(page)
+                await checkout_page.fill_checkout_info("John", "Doe", "12345")
+                await checkout_page.continue_checkout()
+                await page.wait_for_url("**/checkout-step-two.html", timeout=5000)
+                await checkout_page.finish_checkout()
+                await page.wait_for_url("**/checkout-complete.html", timeout=5000)
+                return cart_size, await checkout_page.is_order_complete()
+            return flow
+        
+        results = async_sessions.run_sessions(checkout_with(1), checkout_with(2), checkout_with(3))
+        
+        assert [cart_size for cart_size, _ in results] == [1, 2, 3], "Each session should keep its own cart"
+        assert all(complete for _, complete in results), "Every order should be complete"
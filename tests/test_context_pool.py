@@ -0,0 +1,202 @@
+from urllib.parse import urlsplit
+
+from utils.context_pool import CLEAR_STORAGE_SCRIPT, ContextPool
+
+
+ORIGIN = "https://www.saucedemo.com"
+
+
+class FakePage:
+    """Page of a FakeContext, clearing its origin's storage like CLEAR_STORAGE_SCRIPT"""
+    
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+    
+    def goto(self, url: str):
+        self.url = url
+    
+    def route(self, url, handler):
+        pass
+    
+    def evaluate(self, script: str, arg=None):
+        if script == CLEAR_STORAGE_SCRIPT:
+            url = urlsplit(self.url)
+            self.context.storage.pop(f"{url.scheme}://{url.netloc}", None)
+    
+    def close(self):
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    """Browser context keeping cookies, localStorage per origin and route handlers in memory"""
+    
+    def __init__(self, **options):
+        self.options = options
+        self.cookie_jar = []
+        self.storage = {}
+        self.routes = []
+        self.pages = []
+        self.closed = False
+        self.init_scripts = []
+        self.offline = options.get("offline", False)
+        self.headers = options.get("extra_http_headers", {})
+        self.geolocation = options.get("geolocation")
+    
+    def route(self, url, handler, times=None):
+        self.routes.append((url, handler))
+    
+    def unroute(self, url, handler=None):
+        self.routes = [route for route in self.routes if route[0] != url or (handler and route[1] is not handler)]
+    
+    def route_from_har(self, har, **kwargs):
+        self.routes.append((har, None))
+    
+    def add_init_script(self, script: str):
+        self.init_scripts.append(script)
+    
+    def set_offline(self, offline: bool):
+        self.offline = offline
+    
+    def set_extra_http_headers(self, headers: dict):
+        self.headers = headers
+    
+    def set_geolocation(self, geolocation):
+        self.geolocation = geolocation
+    
+    def add_cookies(self, cookies: list):
+        self.cookie_jar.extend(cookies)
+    
+    def cookies(self) -> list:
+        return list(self.cookie_jar)
+    
+    def clear_cookies(self):
+        self.cookie_jar.clear()
+    
+    def clear_permissions(self):
+        pass
+    
+    def storage_state(self) -> dict:
+        return {
+            "cookies": self.cookies(),
+            "origins": [
+                {"origin": origin, "localStorage": [{"name": name, "value": value} for name, value in items.items()]}
+                for origin, items in self.storage.items()
+            ]
+        }
+    
+    def new_page(self) -> FakePage:
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+    
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    """Browser handing out FakeContexts"""
+    
+    def __init__(self):
+        self.contexts = []
+    
+    def new_context(self, **options) -> FakeContext:
+        context = FakeContext(**options)
+        self.contexts.append(context)
+        return context
+
+
+def setup_routes(context):
+    """Route installed by the pool for every context, like the resource router"""
+    context.route("**/*.png", lambda route: route.abort())
+
+
+class TestContextPool:
+    """Reset of pooled contexts between tests, against an in-memory browser"""
+    
+    def test_released_context_is_clean(self):
+        """Test that a reused context has no cookies, storage or test routes left"""
+        pool = ContextPool(FakeBrowser(), {}, size=1, setup=setup_routes)
+        pool.warm()
+        context = pool.acquire()
+        setup_handlers = list(context.routes)
+        context.add_cookies([{"name": "session-username", "value": "standard_user", "url": ORIGIN}])
+        page = context.new_page()
+        page.goto(f"{ORIGIN}/inventory.html")
+        context.storage[ORIGIN] = {"cart-contents": "[4]"}
+        context.route("**/inventory.html", lambda route: route.abort())
+        
+        pool.release(context)
+        reused = pool.acquire()
+        
+        assert reused is context, "Clean context should be reused"
+        assert reused.cookies() == [], "Cookies should be cleared"
+        assert reused.storage == {}, "Storage should be cleared"
+        assert reused.pages == [], "Pages should be closed"
+        assert reused.routes == setup_handlers, "Only the setup routes should be left"
+        assert pool.stats()["resets"] == 1
+    
+    def test_storage_without_open_page_is_cleared(self):
+        """Test that storage of an origin no page is on is cleared from a stub page"""
+        pool = ContextPool(FakeBrowser(), {}, size=1)
+        context = pool.acquire()
+        context.storage[ORIGIN] = {"cart-contents": "[4]"}
+        
+        pool.release(context)
+        
+        assert pool.acquire() is context, "Context should be reused"
+        assert context.storage == {}, "Storage should be cleared"
+    
+    def test_har_routed_context_is_replaced(self):
+        """Test that a context with a HAR router is closed instead of reused"""
+        browser = FakeBrowser()
+        pool = ContextPool(browser, {}, size=1, setup=setup_routes)
+        context = pool.acquire()
+        context.route_from_har("network.har")
+        
+        pool.release(context)
+        replacement = pool.acquire()
+        
+        assert context.closed, "HAR routed context should be closed"
+        assert replacement is not context, "A fresh context should be handed out"
+        assert len(replacement.routes) == 1, "Fresh context should only have the setup route"
+        assert pool.stats()["fresh_fallbacks"] == 1
+    
+    def test_changed_settings_are_restored(self):
+        """Test that offline mode, extra headers and geolocation go back to the pool options"""
+        home = {"latitude": 52.52, "longitude": 13.4}
+        pool = ContextPool(FakeBrowser(), {"geolocation": home}, size=1)
+        context = pool.acquire()
+        context.set_offline(True)
+        context.set_extra_http_headers({"x-test": "1"})
+        context.set_geolocation({"latitude": 0, "longitude": 0})
+        
+        pool.release(context)
+        
+        assert pool.acquire() is context, "Context should be reused"
+        assert context.offline is False, "Context should be online again"
+        assert context.headers == {}, "Extra headers should be cleared"
+        assert context.geolocation == home, "Geolocation should be the pool's"
+    
+    def test_init_script_context_is_replaced(self):
+        """Test that a context with a test's init script is closed instead of reused"""
+        pool = ContextPool(FakeBrowser(), {}, size=1, init=lambda context: context.add_init_script("pool"))
+        context = pool.acquire()
+        context.add_init_script("test")
+        
+        pool.release(context)
+        replacement = pool.acquire()
+        
+        assert context.closed, "Context with a test init script should be closed"
+        assert replacement.init_scripts == ["pool"], "Fresh context should only have the pool's init script"
+    
+    def test_geolocation_without_pool_option_is_replaced(self):
+        """Test that a geolocation the pool can't go back from replaces the context"""
+        pool = ContextPool(FakeBrowser(), {}, size=1)
+        context = pool.acquire()
+        context.set_geolocation({"latitude": 0, "longitude": 0})
+        
+        pool.release(context)
+        
+        assert pool.acquire() is not context, "A fresh context should be handed out"
+        assert pool.stats()["fresh_fallbacks"] == 1
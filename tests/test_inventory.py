@@ -1,18 +1,12 @@
 import pytest
-from pages.login_page import LoginPage
 from pages.inventory_page import InventoryPage
+from pages.read_only import ReadOnlyViolation
 
 
-class TestInventory:
-    """Test cases for inventory/products functionality"""
-    
-    @pytest.fixture(autouse=True)
-    def login(self, page, base_url):
-        """Login before each test"""
-        login_page = LoginPage(page)
-        login_page.navigate(base_url)
-        login_page.login("standard_user", "secret_sauce")
-        page.wait_for_url("**/inventory.html", timeout=5000)
+@pytest.mark.read_only(at="inventory")
+@pytest.mark.auth("standard_user")
+class TestInventoryDisplay:
+    """Read-only checks of the inventory sharing one seeded page"""
     
     @pytest.mark.smoke
     @pytest.mark.product
@@ -47,6 +41,46 @@ class TestInventory:
         assert all(price for price in product_prices), "All product prices should be non-empty"
         assert all("$" in price for price in product_prices), "All prices should contain $"
     
+    @pytest.mark.regression
+    @pytest.mark.product
+    def test_mutating_call_fails(self, page):
+        """Test that the shared page rejects page-object calls changing it"""
+        inventory_page = InventoryPage(page)
+        
+        with pytest.raises(ReadOnlyViolation):
+            inventory_page.add_product_to_cart(0)
+        assert inventory_page.get_cart_badge_count() == "0", "Cart should stay empty"
+    
+    @pytest.mark.regression
+    @pytest.mark.product
+    def test_inventory_structure(self, page, assert_dom_unchanged):
+        """Test that header and product grid keep their baseline DOM structure"""
+        assert_dom_unchanged(InventoryPage(page))
+
+
+@pytest.mark.auth("standard_user")
+class TestInventory:
+    """Test cases for inventory/products functionality"""
+    
+    @pytest.fixture(autouse=True)
+    def login(self, logged_in_page):
+        """Login before each test using the cached session"""
+    
+    @pytest.mark.regression
+    @pytest.mark.product
+    def test_product_snapshot(self, page):
+        """Test that product snapshot returns typed records for every product"""
+        inventory_page = InventoryPage(page)
+        
+        inventory_page.add_product_to_cart(0)
+        products = inventory_page.get_products()
+        
+        assert len(products) == 6, "Should have 6 product records"
+        assert all(product.price > 0 for product in products), "All prices should be parsed as positive numbers"
+        assert products[0].in_cart, "First product should show remove button"
+        assert not any(product.in_cart for product in products[1:]), "Other products should not be in cart"
+        assert [product.name for product in products] == inventory_page.get_product_names(), "Names should match getter"
+    
     @pytest.mark.regression
     @pytest.mark.product
     def test_add_single_product_to_cart(self, page):
@@ -85,6 +119,30 @@ class TestInventory:
         cart_count = inventory_page.get_cart_badge_count()
         assert cart_count == "1", "Cart should have 1 item"
     
+    @pytest.mark.regression
+    @pytest.mark.product
+    def test_catalog_lookups(self, page):
+        """Test product index lookups by name, slug, id and price range"""
+        inventory_page = InventoryPage(page)
+        
+        catalog = inventory_page.catalog()
+        assert len(catalog) == inventory_page.get_product_count(), "Index should hold every product"
+        
+        backpack = catalog.by_name("Sauce Labs Backpack")
+        assert catalog.by_slug("sauce-labs-backpack") is backpack, "Slug should find the same product"
+        assert catalog.by_id(backpack.id) is backpack, "Id should find the same product"
+        
+        cheap = catalog.in_price_range(high=10)
+        assert cheap and all(entry.price <= 10 for entry in cheap), "Price range should only hold cheap products"
+        
+        inventory_page.add_product_by_id(backpack.id)
+        assert inventory_page.get_cart_badge_count() == "1", "Cart should have 1 item"
+        assert inventory_page.catalog() is catalog, "Index should survive add to cart"
+        
+        inventory_page.sort_products("za")
+        assert inventory_page.catalog()[0].name == inventory_page.get_product_names()[0], \
+            "Index should follow the new sort order"
+    
     @pytest.mark.regression
     @pytest.mark.product
     def test_remove_product_from_cart(self, page):
@@ -99,6 +157,27 @@ class TestInventory:
         # Cart badge should disappear when empty
         assert not inventory_page.is_visible(inventory_page.CART_BADGE), "Cart badge should not be visible"
     
+    @pytest.mark.regression
+    @pytest.mark.product
+    def test_add_product_already_in_cart_fails_fast(self, page):
+        """Test that adding a product twice raises instead of waiting for its add button"""
+        inventory_page = InventoryPage(page)
+        
+        inventory_page.add_product_to_cart(0)
+        
+        with pytest.raises(ValueError, match="already in the cart"):
+            inventory_page.add_product_to_cart(0)
+        assert inventory_page.get_cart_badge_count() == "1", "Cart should still have 1 item"
+    
+    @pytest.mark.regression
+    @pytest.mark.product
+    def test_remove_product_not_in_cart_fails_fast(self, page):
+        """Test that removing a product outside the cart raises instead of waiting for its remove button"""
+        inventory_page = InventoryPage(page)
+        
+        with pytest.raises(ValueError, match="not in the cart"):
+            inventory_page.remove_product_from_cart(0)
+    
     @pytest.mark.regression
     @pytest.mark.product
     def test_sort_products_by_name_ascending(self, page):
@@ -109,7 +188,6 @@ class TestInventory:
         
         try:
             inventory_page.sort_products("az")
-            page.wait_for_timeout(1000)
             
             sorted_names = inventory_page.get_product_names()
             assert sorted_names == sorted(original_names), "Products should be sorted A to Z"
@@ -127,7 +205,6 @@ class TestInventory:
         
         try:
             inventory_page.sort_products("za")
-            page.wait_for_timeout(1000)
             
             sorted_names = inventory_page.get_product_names()
             assert sorted_names == sorted(original_names, reverse=True), "Products should be sorted Z to A"
@@ -143,7 +220,6 @@ class TestInventory:
         
         try:
             inventory_page.sort_products("lohi")
-            page.wait_for_timeout(1000)
             
             prices = inventory_page.get_product_prices()
             price_values = [float(price.replace("$", "")) for price in prices]
@@ -161,7 +237,6 @@ class TestInventory:
         
         try:
             inventory_page.sort_products("hilo")
-            page.wait_for_timeout(1000)
             
             prices = inventory_page.get_product_prices()
             price_values = [float(price.replace("$", "")) for price in prices]
@@ -171,6 +246,51 @@ class TestInventory:
             # Skip if sort dropdown not working as expected
             pytest.skip(f"Sort functionality not available: {str(e)}")
     
+    @pytest.mark.regression
+    @pytest.mark.product
+    def test_wait_for_order_change(self, page):
+        """Test that the order-change wait returns once the list is reordered"""
+        inventory_page = InventoryPage(page)
+        
+        original_names = inventory_page.get_product_names()
+        page.select_option(InventoryPage.SORT_DROPDOWN, "za")
+        inventory_page.wait_for_order_change(InventoryPage.PRODUCT_NAME, original_names)
+        
+        assert inventory_page.get_product_names() == sorted(original_names, reverse=True), "Products should be sorted Z to A"
+        description, strategy, _ = inventory_page.wait_log[-1]
+        assert description == f"order change of {InventoryPage.PRODUCT_NAME}", "Wait should be logged"
+        assert strategy == "mutation", "Waits should default to the MutationObserver strategy"
+    
+    @pytest.mark.regression
+    @pytest.mark.product
+    def test_polling_wait_strategy(self, page):
+        """Test that waits can poll instead of observing mutations"""
+        inventory_page = InventoryPage(page)
+        
+        inventory_page.add_product_to_cart(0)
+        inventory_page.wait_for_count(InventoryPage.CART_BADGE, 1, strategy="polling")
+        inventory_page.wait_until(
+            "() => document.querySelectorAll('.inventory_item').length % 2 === 0",
+            strategy="polling", description="even product count"
+        )
+        
+        assert [strategy for _, strategy, _ in inventory_page.wait_log[-2:]] == ["polling", "polling"], \
+            "Both waits should poll"
+        assert inventory_page.get_cart_badge_count() == "1", "Cart badge should show 1"
+    
+    @pytest.mark.regression
+    @pytest.mark.product
+    def test_wait_predicate_with_percent(self, page):
+        """Test that the MutationObserver wait accepts any predicate source"""
+        inventory_page = InventoryPage(page)
+        
+        inventory_page.wait_until(
+            "(count) => document.querySelectorAll('.inventory_item').length % count === 0",
+            arg=3, description="product count divisible by 3"
+        )
+        
+        assert inventory_page.wait_log[-1][:2] == ("product count divisible by 3", "mutation"), "Wait should be logged"
+    
     @pytest.mark.regression
     @pytest.mark.product
     def test_navigate_to_cart(self, page):
@@ -107,3 +107,16 @@ class TestLogin:
         page.wait_for_url("**/inventory.html", timeout=10000)
         
         assert "inventory" in page.url, "Should redirect to inventory page"
+    
+    @pytest.mark.regression
+    @pytest.mark.login
+    def test_rejected_cached_session_is_refreshed(self, page, auth_cache):
+        """Test that a rejected cached session logs in again"""
+        auth_cache.storage_state("standard_user")
+        invalidations = auth_cache.invalidations
+        
+        # This context was created without the cached session, so the app rejects it
+        auth_cache.open_inventory(page, "standard_user")
+        
+        assert "inventory" in page.url, "Should land on inventory page after logging in again"
+        assert auth_cache.invalidations == invalidations + 1, "Rejected session should be invalidated"
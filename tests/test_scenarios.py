@@ -0,0 +1,38 @@
+import pytest
+
+
+class TestScenarios:
+    """Data-driven login and checkout rows sharing one reset page per kind"""
+    
+    @pytest.mark.regression
+    @pytest.mark.login
+    @pytest.mark.scenarios("tests/data/login_scenarios.csv")
+    def test_login_scenario(self, scenario, scenario_pages):
+        """Test login with one row of credentials"""
+        login_page = scenario_pages.login_page()
+        
+        login_page.login(scenario["username"], scenario["password"])
+        
+        if scenario["error"]:
+            error_msg = login_page.get_error_message()
+            assert scenario["error"].lower() in error_msg.lower(), f"Should show {scenario['error']!r}"
+        else:
+            login_page.page.wait_for_url("**/inventory.html", timeout=10000)
+            assert "inventory" in login_page.get_url(), "Should redirect to inventory page"
+    
+    @pytest.mark.regression
+    @pytest.mark.checkout
+    @pytest.mark.scenarios("tests/data/checkout_scenarios.jsonl")
+    def test_checkout_info_scenario(self, scenario, scenario_pages):
+        """Test checkout step one with one row of customer information"""
+        checkout_page = scenario_pages.checkout_page("standard_user", cart=[0])
+        
+        checkout_page.fill_checkout_info(scenario["first_name"], scenario["last_name"], scenario["postal_code"])
+        checkout_page.continue_checkout()
+        
+        if scenario["error"]:
+            error_msg = checkout_page.get_error_message()
+            assert scenario["error"].lower() in error_msg.lower(), f"Should show {scenario['error']!r}"
+        else:
+            checkout_page.page.wait_for_url("**/checkout-step-two.html", timeout=5000)
+            assert "checkout-step-two" in checkout_page.get_url(), "Should navigate to checkout step two"
@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+from utils import selector_audit
+from utils.selector_audit import SelectorAuditPlugin
+
+
+def finish(plugin: SelectorAuditPlugin):
+    """Run the plugin's sessionfinish for a session that ran tests"""
+    plugin.pytest_sessionfinish(SimpleNamespace(config=SimpleNamespace(option=SimpleNamespace(collectonly=False))))
+
+
+class TestSelectorAuditPlugin:
+    """Audit failures after the tests are reported instead of crashing the run"""
+    
+    def test_missing_standin_config_is_reported(self, tmp_path):
+        """Test that an OSError before the stand-in starts becomes the audit error"""
+        plugin = SelectorAuditPlugin(str(tmp_path / "audit.json"), standin_config=str(tmp_path / "missing.json"))
+        
+        finish(plugin)
+        
+        assert "missing.json" in plugin.error
+        assert plugin.profiles is None
+    
+    def test_unwritable_report_is_reported(self, tmp_path, monkeypatch):
+        """Test that an OSError writing the report becomes the audit error"""
+        monkeypatch.setattr(selector_audit, "audit_browser", lambda browser, base_url, context_options: [])
+        blocker = tmp_path / "file"
+        blocker.write_text("", encoding="utf-8")
+        plugin = SelectorAuditPlugin(str(blocker / "audit.json"), base_url="http://127.0.0.1:1/", browser=object())
+        
+        finish(plugin)
+        
+        assert plugin.error
+        assert plugin.profiles == []
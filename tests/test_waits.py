@@ -0,0 +1,76 @@
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from pages.base_page import BasePage, COUNT_PREDICATE, MUTATION_WAIT_SCRIPT, ORDER_CHANGED_PREDICATE
+
+
+class FakePage:
+    """Page recording evaluate and wait_for_function calls, the observer wait resolves to met"""
+    
+    def __init__(self, met: bool = True):
+        self.met = met
+        self.calls = []
+    
+    def evaluate(self, script: str, arg=None):
+        self.calls.append(("evaluate", script, arg))
+        return self.met
+    
+    def wait_for_function(self, expression: str, arg=None, polling=None, timeout=None):
+        self.calls.append(("wait_for_function", expression, {"arg": arg, "polling": polling, "timeout": timeout}))
+
+
+class TestWaitStrategies:
+    """Dispatch of BasePage.wait_until to the MutationObserver and polling strategies"""
+    
+    def test_mutation_passes_predicate_as_argument(self):
+        """Test that the predicate reaches the page as data, so % in it can't break the script"""
+        page = FakePage()
+        base_page = BasePage(page)
+        predicate = "(count) => document.querySelectorAll('li').length % count === 0"
+        
+        base_page.wait_until(predicate, arg=2, timeout=100, description="even rows")
+        
+        assert page.calls == [("evaluate", MUTATION_WAIT_SCRIPT, {"predicate": predicate, "value": 2, "timeout": 100})]
+        assert base_page.wait_log[-1][:2] == ("even rows", "mutation")
+    
+    def test_mutation_timeout_raises(self):
+        """Test that an unmet observer wait raises a Playwright timeout"""
+        base_page = BasePage(FakePage(met=False))
+        
+        with pytest.raises(PlaywrightTimeoutError, match="even rows"):
+            base_page.wait_until("() => false", timeout=100, description="even rows")
+    
+    def test_polling_uses_wait_for_function(self):
+        """Test that polling hands the predicate to wait_for_function with the class interval"""
+        page = FakePage()
+        base_page = BasePage(page)
+        
+        base_page.wait_for_count(".cart_item", 0, timeout=100, strategy="polling")
+        
+        assert page.calls == [(
+            "wait_for_function", COUNT_PREDICATE,
+            {"arg": {"selector": ".cart_item", "count": 0}, "polling": BasePage.POLLING_INTERVAL, "timeout": 100}
+        )]
+        assert base_page.wait_log[-1][:2] == ("0 x .cart_item", "polling")
+    
+    def test_class_strategy_is_the_default(self):
+        """Test that WAIT_STRATEGY on a page class picks the strategy of its waits"""
+        class PollingPage(BasePage):
+            WAIT_STRATEGY = "polling"
+            POLLING_INTERVAL = 10
+        page = FakePage()
+        
+        PollingPage(page).wait_for_order_change(".inventory_item_name", ["a", "b"], timeout=100)
+        
+        assert page.calls == [(
+            "wait_for_function", ORDER_CHANGED_PREDICATE,
+            {"arg": {"selector": ".inventory_item_name", "previous": ["a", "b"]}, "polling": 10, "timeout": 100}
+        )]
+    
+    def test_unknown_strategy_raises(self):
+        """Test that a misspelled strategy fails instead of skipping the wait"""
+        page = FakePage()
+        
+        with pytest.raises(ValueError, match="raf"):
+            BasePage(page).wait_until("() => true", strategy="raf")
+        assert page.calls == []
@@ -0,0 +1,124 @@
+import textwrap
+
+import pytest
+
+from utils.watch import Watcher
+
+
+# A small tree shaped like this one: tests reach utils.auth only through conftest fixtures
+TREE = {
+    "pages/__init__.py": "",
+    "pages/login_page.py": "class LoginPage:\n    pass\n",
+    "pages/cart_page.py": "class CartPage:\n    pass\n",
+    "utils/__init__.py": "",
+    "utils/auth.py": "from pages.login_page import LoginPage\n\n\ndef login_state():\n    return LoginPage\n",
+    "utils/report.py": "def write_report():\n    pass\n",
+    "utils/unused.py": "",
+    "conftest.py": """
+        import pytest
+
+        from utils import unused
+        from utils.auth import login_state
+        from utils.report import write_report
+
+
+        @pytest.fixture
+        def page():
+            return "page"
+
+
+        @pytest.fixture
+        def logged_in_page(page):
+            return login_state()
+
+
+        @pytest.fixture
+        def shared(request):
+            return request.getfixturevalue("logged_in_page")
+
+
+        def pytest_terminal_summary(terminalreporter):
+            write_report()
+    """,
+    "tests/__init__.py": "",
+    "tests/test_login.py": """
+        from pages.login_page import LoginPage
+
+
+        def test_login(page):
+            assert LoginPage
+
+
+        def test_other(page):
+            assert page
+    """,
+    "tests/test_cart.py": """
+        from pages.cart_page import CartPage
+
+
+        def test_cart(logged_in_page):
+            assert CartPage
+    """,
+    "tests/test_shared.py": """
+        import pytest
+
+
+        @pytest.mark.usefixtures("shared")
+        class TestShared:
+            def test_shared(self):
+                pass
+    """,
+    "tests/test_plain.py": """
+        def test_plain(page):
+            pass
+    """
+}
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    """Watcher over a fresh copy of TREE"""
+    for name, source in TREE.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(source).lstrip(), encoding="utf-8")
+    return Watcher([], root=tmp_path)
+
+
+class TestWatchSelection:
+    """Tests picked by watch mode for a changed file"""
+    
+    def test_module_reached_through_fixture(self, watcher):
+        """Test that a module only conftest imports selects the tests requesting its fixtures"""
+        selection = watcher.selection({watcher.root / "utils/auth.py"})
+        
+        assert selection == ["tests/test_cart.py", "tests/test_shared.py"]
+    
+    def test_page_object_reached_by_import_and_fixture(self, watcher):
+        """Test that a page object selects tests importing it and tests reaching it through fixtures"""
+        selection = watcher.selection({watcher.root / "pages/login_page.py"})
+        
+        assert selection == ["tests/test_cart.py", "tests/test_login.py", "tests/test_shared.py"]
+    
+    def test_module_used_by_hook_runs_everything(self, watcher):
+        """Test that a module a conftest hook uses selects the whole suite"""
+        assert watcher.selection({watcher.root / "utils/report.py"}) is None
+    
+    def test_module_imported_but_unused_runs_everything(self, watcher):
+        """Test that a conftest import nothing uses selects the whole suite, it may act on import"""
+        assert watcher.selection({watcher.root / "utils/unused.py"}) is None
+    
+    def test_conftest_runs_everything(self, watcher):
+        """Test that a conftest change selects the whole suite"""
+        assert watcher.selection({watcher.root / "conftest.py"}) is None
+    
+    def test_changed_test_function_only(self, watcher):
+        """Test that editing one test function selects only that test"""
+        path = watcher.root / "tests/test_login.py"
+        path.write_text(path.read_text(encoding="utf-8").replace("assert page", "assert not not page"))
+        
+        assert watcher.selection({path}) == ["tests/test_login.py::test_other"]
+    
+    def test_unrelated_page_object(self, watcher):
+        """Test that a page object no fixture reaches selects only its importers"""
+        assert watcher.selection({watcher.root / "pages/cart_page.py"}) == ["tests/test_cart.py"]
@@ -0,0 +1 @@
+# Test harness utilities
@@ -0,0 +1,86 @@
+import html
+import json
+from pathlib import Path
+
+import pytest
+
+
+class ActionTimings:
+    """Run-wide aggregate of per-test action summaries produced by ActionRecorder, registered as a plugin"""
+
+    def __init__(self, json_path: str = None):
+        self.json_path = json_path
+        self.tests = {}
+        self.selectors = {}
+        self.slowest = []
+
+    def add(self, nodeid: str, summary: dict):
+        """Merge summary of one test"""
+        self.tests[nodeid] = {
+            "actions": summary["actions"],
+            "dropped": summary["dropped"],
+            "total_ms": summary["total_ms"]
+        }
+        for selector, (count, total, longest) in summary["by_selector"].items():
+            totals = self.selectors.setdefault(str(selector), [0, 0.0, 0.0])
+            totals[0] += count
+            totals[1] += total
+            totals[2] = max(totals[2], longest)
+        self.slowest.extend(dict(record, test=nodeid) for record in summary["slowest"])
+
+    def slowest_actions(self, limit: int = 20) -> list:
+        """Get slowest single actions of the run"""
+        return sorted(self.slowest, key=lambda record: record["ms"], reverse=True)[:limit]
+
+    def to_dict(self) -> dict:
+        """Get JSON serializable report"""
+        return {
+            "tests": self.tests,
+            "selectors": {
+                selector: {"count": count, "total_ms": total, "mean_ms": total / count, "max_ms": longest}
+                for selector, (count, total, longest) in sorted(
+                    self.selectors.items(), key=lambda item: item[1][1], reverse=True
+                )
+            },
+            "slowest": self.slowest_actions()
+        }
+
+    def write_json(self, path: str):
+        """Write report to path"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+    def html_table(self, limit: int = 20) -> str:
+        """Get HTML table of the slowest actions for the pytest-html summary"""
+        rows = "".join(
+            "<tr><td>{:.1f}</td><td>{}</td><td>{}</td><td><code>{}</code></td><td>{}</td></tr>".format(
+                record["ms"], html.escape(record["owner"]), html.escape(record["action"]),
+                html.escape(str(record["selector"])), html.escape(record["test"])
+            )
+            for record in self.slowest_actions(limit)
+        )
+        return (
+            "<h2>Slowest page actions</h2>"
+            "<table><tr><th>ms</th><th>Page object method</th><th>Action</th><th>Selector</th><th>Test</th></tr>"
+            f"{rows}</table>"
+        )
+
+    def pytest_runtest_logreport(self, report):
+        """Collect action timings recorded during test teardown, on this process or an xdist worker"""
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == "actions":
+                self.add(report.nodeid, value)
+
+    def pytest_sessionfinish(self):
+        """Export JSON report"""
+        if self.json_path and self.tests:
+            self.write_json(self.json_path)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_summary(self, prefix):
+        """Add slowest actions table to the HTML report"""
+        if self.slowest:
+            prefix.append(self.html_table())
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable, List
+
+from playwright.async_api import Page, async_playwright
+
+
+# An independent user session, gets its own context and page
+SessionFlow = Callable[[Page], Awaitable]
+
+
+class AsyncSessionRunner:
+    """Runs many async user sessions concurrently on one event loop in a background thread"""
+
+    def __init__(self, context_options: dict = None, headless: bool = True, timeout: float = 120):
+        self.context_options = context_options or {}
+        self.headless = headless
+        self.timeout = timeout
+        self.browser = None
+        self._playwright = None
+        self._loop = None
+        self._thread = None
+
+    def start(self):
+        """Start event loop thread and launch the async browser"""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-sessions", daemon=True)
+        self._thread.start()
+        self.run(self._launch())
+
+    def stop(self):
+        """Close browser and stop event loop thread"""
+        if self._loop is None:
+            return
+        self.run(self._shutdown())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def run(self, coroutine: Awaitable):
+        """Run coroutine on the session loop and return its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(self.timeout)
+
+    def run_sessions(self, *flows: SessionFlow) -> List:
+        """Run each flow in its own context concurrently and return their results in order"""
+        return self.run(self._gather(flows))
+
+    async def _gather(self, flows) -> List:
+        """Run flows concurrently, waiting for all of them before raising the first failure"""
+        results = await asyncio.gather(*(self._session(flow) for flow in flows), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def _session(self, flow: SessionFlow):
+        """Run one flow in a fresh context"""
+        context = await self.browser.new_context(**self.context_options)
+        try:
+            page = await context.new_page()
+            return await flow(page)
+        finally:
+            await context.close()
+
+    async def _launch(self):
+        """Start Playwright and launch Chromium"""
+        self._playwright = await async_playwright().start()
+        self.browser = await self._playwright.chromium.launch(headless=self.headless)
+
+    async def _shutdown(self):
+        """Close Chromium and stop Playwright"""
+        await self.browser.close()
+        await self._playwright.stop()
@@ -0,0 +1,80 @@
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urljoin
+
+from playwright.sync_api import Browser, BrowserContext, Page
+
+from pages.inventory_page import InventoryPage
+from pages.login_page import LoginPage
+
+
+DEFAULT_USER = "standard_user"
+DEFAULT_PASSWORD = "secret_sauce"
+INVENTORY_PATH = "inventory.html"
+LOGIN_TIMEOUT = 10000
+
+
+class AuthStateCache:
+    """Storage states of logged-in users, created once per worker and reused by every test"""
+
+    def __init__(self, browser: Browser, base_url: str, directory: Path, context_options: dict = None,
+                 context_setup: Callable[[BrowserContext, str], None] = None):
+        self.browser = browser
+        self.base_url = base_url
+        self.directory = Path(directory)
+        self.context_options = context_options or {}
+        self.context_setup = context_setup
+        self.logins = 0
+        self.invalidations = 0
+        self._paths = {}
+
+    def storage_state(self, username: str) -> str:
+        """Get storage state file for user, logging in through the UI on first use"""
+        path = self._paths.get(username)
+        if path is None:
+            context = self.browser.new_context(**self.context_options)
+            if self.context_setup is not None:
+                self.context_setup(context, f"auth-{username}")
+            try:
+                page = context.new_page()
+                LoginPage(page).navigate(self.base_url)
+                path = self._login(page, username)
+            finally:
+                context.close()
+        return str(path)
+
+    def invalidate(self, username: str):
+        """Forget cached session of user"""
+        path = self._paths.pop(username, None)
+        if path is not None:
+            path.unlink(missing_ok=True)
+            self.invalidations += 1
+
+    def open_inventory(self, page: Page, username: str):
+        """Open inventory page with cached session, logging in again if the session is rejected"""
+        page.goto(urljoin(self.base_url, INVENTORY_PATH))
+        if INVENTORY_PATH in page.url and InventoryPage(page).is_inventory_page():
+            return
+        # Session was rejected and the app redirected to login, refresh the cache from here
+        self.invalidate(username)
+        if not LoginPage(page).is_login_page():
+            LoginPage(page).navigate(self.base_url)
+        self._login(page, username)
+
+    def _login(self, page: Page, username: str) -> Path:
+        """Login through the UI on the current page and save resulting storage state"""
+        LoginPage(page).login(username, DEFAULT_PASSWORD)
+        page.wait_for_url(f"**/{INVENTORY_PATH}", timeout=LOGIN_TIMEOUT)
+        path = self.directory / f"{username}.json"
+        page.context.storage_state(path=str(path))
+        self._paths[username] = path
+        self.logins += 1
+        return path
+
+
+def auth_user(node) -> str:
+    """Get user requested by the closest auth marker"""
+    marker = node.get_closest_marker("auth")
+    if marker is None:
+        return DEFAULT_USER
+    return marker.args[0] if marker.args else marker.kwargs.get("user", DEFAULT_USER)
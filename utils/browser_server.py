@@ -0,0 +1,247 @@
+import hashlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from importlib.metadata import version
+from pathlib import Path
+
+import playwright
+from playwright.sync_api import Browser, Error as PlaywrightError, Playwright
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+STATE_FILE = ".cache/browser-server.json"
+LAUNCH_TIMEOUT = 60
+CONNECT_TIMEOUT = 5000
+# Servers older than this are replaced, so a browser leaking memory doesn't live forever
+MAX_AGE = 8 * 3600
+DRIVER_DIR = Path(playwright.__file__).parent / "driver"
+NODE = DRIVER_DIR / ("node.exe" if sys.platform == "win32" else "node")
+# Launched servers, referenced so they aren't reaped when this process is done with them
+_servers = []
+
+# Runs in Playwright's bundled node, argv: package dir, endpoint file, headless
+LAUNCH_SCRIPT = """
+const fs = require("fs");
+const { chromium } = require(process.argv[1]);
+const write = (data) => {
+    fs.writeFileSync(process.argv[2] + ".tmp", JSON.stringify(data));
+    fs.renameSync(process.argv[2] + ".tmp", process.argv[2]);
+};
+chromium.launchServer({ headless: process.argv[3] === "true" }).then(
+    (server) => write({ wsEndpoint: server.wsEndpoint() }),
+    (error) => { write({ error: error.message }); process.exit(1); }
+);
+"""
+
+
+class BrowserServerError(Exception):
+    """Browser server could not be started"""
+
+
+def read_state(path: Path) -> dict:
+    """Get recorded server state, empty when there is none"""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def write_state(path: Path, state: dict):
+    """Record server state"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+
+def is_running(pid: int) -> bool:
+    """Check if process pid exists"""
+    try:
+        os.kill(pid, 0)
+    except (OSError, TypeError):
+        return False
+    return True
+
+
+def process_identity(pid: int) -> str:
+    """Get a fingerprint of pid's start time and command line, empty when they can't be read"""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+        cmdline = Path(f"/proc/{pid}/cmdline").read_bytes()
+        # Start time is field 22, the fields are counted after the parenthesised process name
+        identity = stat.rsplit(")", 1)[1].split()[19].encode() + b" " + cmdline
+    except (OSError, IndexError):
+        try:
+            identity = subprocess.run(
+                ["ps", "-o", "lstart=,command=", "-p", str(pid)], capture_output=True, timeout=5
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ""
+    return hashlib.sha1(identity).hexdigest()[:16] if identity else ""
+
+
+def is_server(state: dict) -> bool:
+    """Check the recorded pid is still the server that was launched, not a reused pid"""
+    identity = state.get("identity")
+    return bool(identity) and is_running(state.get("pid")) and process_identity(state["pid"]) == identity
+
+
+def stale_reason(state: dict, headless: bool) -> str:
+    """Get why a recorded server can't be reused, empty when it looks fine"""
+    if not state:
+        return "no server"
+    if state.get("playwright") != version("playwright"):
+        return f"started by Playwright {state.get('playwright')}, running {version('playwright')}"
+    if state.get("headless") != headless:
+        return "headless mode differs"
+    if not is_running(state.get("pid")):
+        return "process is gone"
+    if not is_server(state):
+        return "pid belongs to another process"
+    if time.time() - state.get("launched_at", 0) > MAX_AGE:
+        return "older than the maximum age"
+    return ""
+
+
+@contextmanager
+def state_lock(path: Path):
+    """Serialize launches of xdist workers sharing one state file"""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def launch(path: Path, headless: bool = True) -> dict:
+    """Start a detached browser server that outlives this process and record its endpoint"""
+    endpoint_file = Path(f"{path}.endpoint")
+    endpoint_file.parent.mkdir(parents=True, exist_ok=True)
+    endpoint_file.unlink(missing_ok=True)
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [str(NODE), "-e", LAUNCH_SCRIPT, str(DRIVER_DIR / "package"), str(endpoint_file), str(headless).lower()],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    _servers.append(process)
+    deadline = time.monotonic() + LAUNCH_TIMEOUT
+    result = {}
+    while not result:
+        exited = process.poll() is not None
+        result = read_state(endpoint_file)
+        if not result and (exited or time.monotonic() > deadline):
+            process.kill()
+            raise BrowserServerError("Browser server did not start: " + ("it exited" if exited else "timed out"))
+        time.sleep(0.05)
+    endpoint_file.unlink()
+    if "error" in result:
+        raise BrowserServerError(f"Browser server did not start: {result['error'].splitlines()[0]}")
+    state = {
+        "ws_endpoint": result["wsEndpoint"],
+        "pid": process.pid,
+        "identity": process_identity(process.pid),
+        "playwright": version("playwright"),
+        "headless": headless,
+        "launched_at": time.time(),
+        "launch_seconds": time.perf_counter() - start,
+        "reuses": 0,
+        "saved_seconds": 0.0
+    }
+    write_state(path, state)
+    return state
+
+
+def stop(path: Path) -> bool:
+    """Stop the recorded server and forget it, False when none was running"""
+    state = read_state(path)
+    path.unlink(missing_ok=True)
+    if not is_server(state):
+        # After a reboot or pid reuse the pid can belong to anything, only the state is dropped
+        return False
+    # The server runs in its own session, its browser processes go with it
+    if hasattr(os, "killpg"):
+        os.killpg(state["pid"], signal.SIGTERM)
+    else:
+        os.kill(state["pid"], signal.SIGTERM)
+    return True
+
+
+def connect_browser(playwright_instance: Playwright, path: str = STATE_FILE, headless: bool = True):
+    """Connect to the recorded browser server, relaunching it when it is stale or unhealthy
+
+    Returns the browser and a dict with how the connection was made and the time saved.
+    """
+    path = Path(path)
+    with state_lock(path):
+        state = read_state(path)
+        reason = stale_reason(state, headless)
+        if not reason:
+            start = time.perf_counter()
+            try:
+                browser = playwright_instance.chromium.connect(state["ws_endpoint"], timeout=CONNECT_TIMEOUT)
+                check_health(browser)
+            except PlaywrightError as error:
+                reason = f"health check failed: {str(error).splitlines()[0]}"
+            else:
+                seconds = time.perf_counter() - start
+                saved = max(state["launch_seconds"] - seconds, 0.0)
+                state["reuses"] += 1
+                state["saved_seconds"] += saved
+                write_state(path, state)
+                return browser, {
+                    "reused": True, "endpoint": state["ws_endpoint"], "connect_seconds": seconds,
+                    "saved_seconds": saved, "total_saved_seconds": state["saved_seconds"], "reuses": state["reuses"]
+                }
+        if state:
+            stop(path)
+        state = launch(path, headless)
+        browser = playwright_instance.chromium.connect(state["ws_endpoint"], timeout=CONNECT_TIMEOUT)
+        return browser, {
+            "reused": False, "endpoint": state["ws_endpoint"], "relaunch_reason": reason,
+            "launch_seconds": state["launch_seconds"]
+        }
+
+
+def check_health(browser: Browser):
+    """Round-trip a context through the browser, raising when it can't serve tests"""
+    context = browser.new_context()
+    context.close()
+
+
+def main() -> int:
+    """Show or stop the recorded browser server"""
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    path = Path(sys.argv[2] if len(sys.argv) > 2 else STATE_FILE)
+    if command == "stop":
+        print("stopped" if stop(path) else "no server running")
+        return 0
+    if command != "status":
+        print("usage: python -m utils.browser_server [status|stop] [STATE_FILE]")
+        return 2
+    state = read_state(path)
+    reason = stale_reason(state, state.get("headless", True))
+    if reason:
+        print(f"not reusable: {reason}")
+    else:
+        print(
+            f"{state['ws_endpoint']} (pid {state['pid']}, Playwright {state['playwright']}), "
+            f"reused {state['reuses']} times, saved {state['saved_seconds']:.1f} s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+import json
+import time
+from typing import Callable
+
+from playwright.sync_api import Browser, BrowserContext, Error as PlaywrightError
+
+
+CLEAR_STORAGE_SCRIPT = "() => { localStorage.clear(); sessionStorage.clear(); }"
+
+
+class ContextPool:
+    """Pre-created browser contexts handed out per test and reset between tests"""
+
+    def __init__(self, browser: Browser, options: dict, size: int = 2,
+                 setup: Callable[[BrowserContext], None] = None, init: Callable[[BrowserContext], None] = None):
+        self.browser = browser
+        self.options = options
+        self.size = size
+        # Both run once per context. The routes and init scripts they add stay for every test using it
+        self.setup = setup
+        self.init = init
+        self.hits = 0
+        self.misses = 0
+        self.resets = 0
+        self.fresh_fallbacks = 0
+        self.reset_time = 0.0
+        self.create_time = 0.0
+        self.created = 0
+        self._idle = []
+        # Route handlers added to each context after setup, None for ones that can't be removed
+        self._routes = {}
+        # Context settings a test changed after setup, restored or replaced on release
+        self._changed = {}
+
+    def warm(self):
+        """Create contexts until the pool is full"""
+        while len(self._idle) < self.size:
+            self._idle.append(self._new_context())
+
+    def acquire(self, storage_state: str = None) -> BrowserContext:
+        """Get a clean context, optionally carrying the cookies of a storage state file"""
+        state = None
+        if storage_state is not None:
+            with open(storage_state, encoding="utf-8") as state_file:
+                state = json.load(state_file)
+            if any(origin.get("localStorage") for origin in state.get("origins", [])):
+                # Local storage can only be seeded when the context is created
+                self.misses += 1
+                return self._new_context(storage_state=storage_state)
+        if self._idle:
+            self.hits += 1
+            context = self._idle.pop()
+        else:
+            self.misses += 1
+            context = self._new_context()
+        if state is not None and state.get("cookies"):
+            context.add_cookies(state["cookies"])
+        return context
+
+    def release(self, context: BrowserContext):
+        """Reset context and return it to the pool, replacing it when it can't be reset"""
+        start = time.perf_counter()
+        if self._reset(context):
+            self.resets += 1
+            reusable = context
+        else:
+            self.fresh_fallbacks += 1
+            self._close(context)
+            reusable = self._new_context()
+        self.reset_time += time.perf_counter() - start
+        if len(self._idle) < self.size:
+            self._idle.append(reusable)
+        else:
+            self._close(reusable)
+
+    def close(self):
+        """Close every idle context"""
+        while self._idle:
+            self._close(self._idle.pop())
+
+    def stats(self) -> dict:
+        """Get hit/miss and reset-time counters"""
+        released = self.resets + self.fresh_fallbacks
+        avg_create = self.create_time / self.created if self.created else 0.0
+        avg_reset = self.reset_time / released if released else 0.0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "resets": self.resets,
+            "fresh_fallbacks": self.fresh_fallbacks,
+            "avg_create_ms": avg_create * 1000,
+            "avg_reset_ms": avg_reset * 1000,
+            "saved_ms": max(self.hits * (avg_create - avg_reset), 0.0) * 1000
+        }
+
+    def _new_context(self, **overrides) -> BrowserContext:
+        """Create a context with pool options"""
+        start = time.perf_counter()
+        context = self.browser.new_context(**dict(self.options, **overrides))
+        if self.init is not None:
+            self.init(context)
+        if self.setup is not None:
+            self.setup(context)
+        self._track_changes(context)
+        self.create_time += time.perf_counter() - start
+        self.created += 1
+        return context
+
+    def _reset(self, context: BrowserContext) -> bool:
+        """Clear test state from context, False when isolation can't be guaranteed"""
+        try:
+            if not self._clear_routes(context) or not self._restore_settings(context):
+                return False
+            for page in context.pages:
+                if page.url.startswith("http"):
+                    page.evaluate(CLEAR_STORAGE_SCRIPT)
+                page.close()
+            context.clear_cookies()
+            context.clear_permissions()
+            dirty_origins = self._dirty_origins(context)
+            if dirty_origins:
+                self._clear_local_storage(context, dirty_origins)
+                dirty_origins = self._dirty_origins(context)
+            return not dirty_origins and not context.cookies()
+        except PlaywrightError:
+            return False
+
+    @staticmethod
+    def _dirty_origins(context: BrowserContext) -> list:
+        """Get origins that still hold localStorage"""
+        state = context.storage_state()
+        return [origin["origin"] for origin in state["origins"] if origin.get("localStorage")]
+
+    @staticmethod
+    def _clear_local_storage(context: BrowserContext, origins: list):
+        """Clear localStorage of origins from a blank page stubbed at each origin, without network"""
+        page = context.new_page()
+        try:
+            page.route("**/*", lambda route: route.fulfill(status=200, content_type="text/html", body=""))
+            for origin in origins:
+                page.goto(f"{origin}/")
+                page.evaluate(CLEAR_STORAGE_SCRIPT)
+        finally:
+            page.close()
+
+    def _track_changes(self, context: BrowserContext):
+        """Make the context methods a test can change it with record what they changed"""
+        routes = self._routes[context] = []
+        changed = self._changed[context] = set()
+        route = context.route
+        route_from_har = context.route_from_har
+
+        def tracked_route(url, handler, **kwargs):
+            route(url, handler, **kwargs)
+            routes.append((url, handler))
+
+        def tracked_route_from_har(har, **kwargs):
+            route_from_har(har, **kwargs)
+            # A HAR router has no handler to unroute
+            routes.append(None)
+
+        def tracked(name: str):
+            method = getattr(context, name)
+
+            def wrapper(*args, **kwargs):
+                method(*args, **kwargs)
+                changed.add(name)
+            return wrapper
+
+        context.route = tracked_route
+        context.route_from_har = tracked_route_from_har
+        for name in ("add_init_script", "set_offline", "set_extra_http_headers", "set_geolocation"):
+            setattr(context, name, tracked(name))
+
+    def _clear_routes(self, context: BrowserContext) -> bool:
+        """Remove route handlers added by the test, False when some can't be removed"""
+        routes = self._routes.get(context)
+        if routes is None or None in routes:
+            return False
+        for url, handler in routes:
+            context.unroute(url, handler)
+        routes.clear()
+        return True
+
+    def _restore_settings(self, context: BrowserContext) -> bool:
+        """Put settings the test changed back to the pool options, False when some can't be undone"""
+        changed = self._changed.get(context)
+        if changed is None or "add_init_script" in changed:
+            # Init scripts can't be removed from a context
+            return False
+        if "set_geolocation" in changed and "geolocation" not in self.options:
+            # A context created without a geolocation has none to go back to
+            return False
+        if "set_offline" in changed:
+            context.set_offline(self.options.get("offline", False))
+        if "set_extra_http_headers" in changed:
+            context.set_extra_http_headers(self.options.get("extra_http_headers", {}))
+        if "set_geolocation" in changed:
+            context.set_geolocation(self.options["geolocation"])
+        changed.clear()
+        return True
+
+    def _close(self, context: BrowserContext):
+        """Close context, ignoring contexts that are already gone"""
+        self._routes.pop(context, None)
+        self._changed.pop(context, None)
+        try:
+            context.close()
+        except PlaywrightError:
+            pass
@@ -0,0 +1,97 @@
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List
+
+from pages.base_page import BasePage
+from pages.dom_snapshot import RegionSnapshot
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Serialize xdist workers merging regions into the same baseline file"""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class DomBaselines:
+    """Structural DOM baselines, one small JSON file per page object holding its regions"""
+
+    def __init__(self, directory, update: bool = False):
+        self.directory = Path(directory)
+        self.update = update
+        self.matched = 0
+        self.mismatched = 0
+        self.recorded = 0
+        self.missing = 0
+
+    def exist(self) -> bool:
+        """Check if any baseline was recorded for this target"""
+        return any(self.directory.glob("*.json"))
+
+    def path(self, page_name: str) -> Path:
+        """Get baseline file of a page object class"""
+        return self.directory / f"{page_name}.json"
+
+    def load(self, page_name: str) -> dict:
+        """Get stored region snapshots of a page object class"""
+        path = self.path(page_name)
+        if not path.exists():
+            return {}
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return {region: RegionSnapshot.from_dict(region, entry) for region, entry in data.items()}
+
+    def save(self, page_name: str, snapshots: dict):
+        """Merge snapshots into the baseline file of a page object class"""
+        path = self.path(page_name)
+        # xdist workers may save regions of the same page at once, each merge sees the one before it
+        with file_lock(path):
+            stored = {region: snapshot.to_dict() for region, snapshot in self.load(page_name).items()}
+            stored.update({region: snapshot.to_dict() for region, snapshot in snapshots.items()})
+            # Written whole and renamed, readers never see a partial file
+            temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            temporary.write_text(json.dumps(stored, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+            temporary.replace(path)
+
+    def check(self, page_object: BasePage, *regions: str) -> List[str]:
+        """Compare regions of page_object with their baselines, get an explanation per mismatch
+
+        With update, every region is recorded instead. Without it a region missing its
+        baseline is a problem too, so a deleted or never committed baseline can't pass.
+        """
+        page_name = type(page_object).__name__
+        current = page_object.dom_snapshot(*regions)
+        baselines = self.load(page_name)
+        problems, record = [], {}
+        for region, snapshot in current.items():
+            baseline = baselines.get(region)
+            if self.update:
+                record[region] = snapshot
+            elif baseline is None:
+                self.missing += 1
+                problems.append(f"{page_name}.{region}: no baseline in {self.path(page_name)}, "
+                                f"record it with --update-dom-baselines")
+            elif snapshot.hash == baseline.hash:
+                self.matched += 1
+            else:
+                self.mismatched += 1
+                header = f"{page_name}.{region}: hash {baseline.hash} -> {snapshot.hash}"
+                problems.append("\n".join([header] + snapshot.diff(baseline)))
+        if record:
+            self.save(page_name, record)
+            self.recorded += len(record)
+        return problems
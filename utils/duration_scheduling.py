@@ -0,0 +1,150 @@
+import heapq
+import statistics
+import time
+from typing import Iterable
+
+import pytest
+from xdist.scheduler import LoadGroupScheduling
+
+
+CACHE_KEY = "saucedemo/durations"
+# Used for tests without history when there is no history at all
+DEFAULT_DURATION = 1.0
+# Weight of the latest run in the stored moving average
+SMOOTHING = 0.5
+
+
+def base_nodeid(nodeid: str) -> str:
+    """Get node id without the @group suffix xdist adds for --dist=loadgroup"""
+    if nodeid.rfind("@") > nodeid.rfind("]"):
+        return nodeid.rsplit("@", 1)[0]
+    return nodeid
+
+
+def predict_makespan(durations: Iterable[float], workers: int) -> float:
+    """Get finish time of giving each unit, longest first, to the least loaded worker"""
+    loads = [0.0] * max(workers, 1)
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
+
+
+def group_shared_setup(items):
+    """Put tests of a read_only class in one xdist_group, so its class-scoped shared page is seeded once"""
+    for item in items:
+        if item.get_closest_marker("xdist_group") or not item.get_closest_marker("read_only"):
+            continue
+        cls = item.getparent(pytest.Class)
+        if cls is not None:
+            item.add_marker(pytest.mark.xdist_group(cls.nodeid))
+
+
+class DurationStore:
+    """Per-test durations of previous runs, kept in the pytest cache"""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.history = cache.get(CACHE_KEY, {})
+        self.current = {}
+        self._default = statistics.median(self.history.values()) if self.history else DEFAULT_DURATION
+
+    def estimate(self, nodeid: str) -> float:
+        """Get expected duration of test, the median of known tests when it has no history"""
+        return self.history.get(base_nodeid(nodeid), self._default)
+
+    def add(self, nodeid: str, seconds: float):
+        """Add time spent in one phase of a test of this run"""
+        nodeid = base_nodeid(nodeid)
+        self.current[nodeid] = self.current.get(nodeid, 0.0) + seconds
+
+    def save(self):
+        """Fold this run into the history"""
+        history = dict(self.history)
+        for nodeid, seconds in self.current.items():
+            previous = history.get(nodeid)
+            history[nodeid] = seconds if previous is None else SMOOTHING * seconds + (1 - SMOOTHING) * previous
+        self.cache.set(CACHE_KEY, history)
+
+
+class DurationScheduling(LoadGroupScheduling):
+    """Hands out work units longest-first, keeping xdist_group tests together on one worker"""
+
+    def __init__(self, config, log, store: DurationStore):
+        super().__init__(config, log)
+        self.store = store
+        self.predicted = None
+        self.started = None
+        self.finished = None
+        self.busy = {}
+        self._estimates = {}
+
+    def _assign_work_unit(self, node):
+        """Assign the longest waiting work unit to node"""
+        if self.predicted is None:
+            self.started = time.perf_counter()
+            self.predicted = predict_makespan(
+                (self._unit_estimate(scope) for scope in self.workqueue), len(self.nodes)
+            )
+        longest = max(self.workqueue, key=self._unit_estimate)
+        self.workqueue.move_to_end(longest, last=False)
+        super()._assign_work_unit(node)
+
+    def mark_test_complete(self, node, item_index, duration=0):
+        """Track busy time per worker and the end of the last test"""
+        super().mark_test_complete(node, item_index, duration)
+        name = node.gateway.id
+        self.busy[name] = self.busy.get(name, 0.0) + duration
+        self.finished = time.perf_counter()
+
+    @property
+    def actual(self) -> float:
+        """Get wall time from first assignment to last completed test"""
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+    def _unit_estimate(self, scope: str) -> float:
+        """Get expected duration of a work unit"""
+        estimate = self._estimates.get(scope)
+        if estimate is None:
+            estimate = self._estimates[scope] = sum(self.store.estimate(nodeid) for nodeid in self.workqueue[scope])
+        return estimate
+
+
+class DurationSchedulingPlugin:
+    """Records test durations and schedules xdist runs with them, registered on the controller"""
+
+    def __init__(self, config):
+        self.store = DurationStore(config.cache)
+        self.scheduler = None
+
+    def pytest_runtest_logreport(self, report):
+        """Add phase duration of a test"""
+        self.store.add(report.nodeid, report.duration)
+
+    @pytest.hookimpl(tryfirst=True, optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        """Replace load and loadgroup distribution"""
+        if config.getvalue("dist") not in ("load", "loadgroup"):
+            return None
+        self.scheduler = DurationScheduling(config, log, self.store)
+        return self.scheduler
+
+    def pytest_sessionfinish(self):
+        """Persist durations of this run"""
+        self.store.save()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Report predicted versus actual makespan"""
+        scheduler = self.scheduler
+        if scheduler is None or scheduler.predicted is None:
+            return
+        terminalreporter.write_sep("-", "duration scheduling")
+        known = sum(base_nodeid(nodeid) in self.store.history for nodeid in scheduler.collection or [])
+        terminalreporter.write_line(
+            f"predicted makespan: {scheduler.predicted:.1f} s, actual: {scheduler.actual:.1f} s "
+            f"({known}/{len(scheduler.collection or [])} tests with history)"
+        )
+        terminalreporter.write_line(
+            "busy per worker: " + ", ".join(f"{name} {busy:.1f} s" for name, busy in sorted(scheduler.busy.items()))
+        )
@@ -0,0 +1,146 @@
+import os
+import re
+import shutil
+import tempfile
+import time
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import List
+
+from playwright.sync_api import BrowserContext, Error as PlaywrightError
+
+
+# Memory-backed on Linux, so buffered chunks never touch the disk
+TMPFS_DIR = "/dev/shm"
+
+
+def spool_dir() -> str:
+    """Get a fresh directory for buffered trace chunks, on tmpfs when available"""
+    parent = TMPFS_DIR if os.access(TMPFS_DIR, os.W_OK) else None
+    return tempfile.mkdtemp(prefix="failure-traces-", dir=parent)
+
+
+def trace_name(nodeid: str) -> str:
+    """Get file name of the trace of a test"""
+    return re.sub(r"[^\w.-]+", "-", nodeid).strip("-")[-150:] + ".zip"
+
+
+class FailureTracer:
+    """Traces every test as a chunk of its context's trace, keeping chunks of failed tests only
+
+    Passing chunks are discarded without being exported. With history, the chunks of
+    the last passing tests stay in a bounded tmpfs ring and are saved next to a failure.
+    """
+
+    def __init__(self, output_dir: str, retain: int = 10, history: int = 0, buffer_bytes: int = 64 * 1024 * 1024):
+        self.output_dir = Path(output_dir)
+        self.retain = retain
+        self.history = history
+        self.buffer_bytes = buffer_bytes
+        self.saved = 0
+        self.dropped = 0
+        self.evicted = 0
+        self._tracing = weakref.WeakSet()
+        self._ring = deque()
+        self._ring_bytes = 0
+        self._spool = spool_dir() if history else None
+        self._sequence = 0
+
+    def begin(self, context: BrowserContext, nodeid: str) -> float:
+        """Start the trace chunk of a test, returning milliseconds spent"""
+        start = time.perf_counter()
+        if context not in self._tracing:
+            context.tracing.start(screenshots=True, snapshots=True)
+            self._tracing.add(context)
+        context.tracing.start_chunk(title=nodeid)
+        return (time.perf_counter() - start) * 1000
+
+    def end(self, context: BrowserContext, nodeid: str, failed: bool) -> dict:
+        """Stop the trace chunk of a test, saving it and the buffered history when it failed"""
+        start = time.perf_counter()
+        paths = []
+        dropped = failed and self.saved >= self.retain
+        try:
+            if dropped:
+                self.dropped += 1
+                context.tracing.stop_chunk()
+            elif failed:
+                paths = self._save(context, nodeid)
+            elif self.history:
+                self._buffer(context, nodeid)
+            else:
+                context.tracing.stop_chunk()
+        except PlaywrightError:
+            # The context died with the test, its trace can't be exported any more
+            self._tracing.discard(context)
+        return {"paths": paths, "dropped": dropped, "overhead_ms": (time.perf_counter() - start) * 1000}
+
+    def close(self):
+        """Remove buffered chunks"""
+        self._ring.clear()
+        if self._spool is not None:
+            shutil.rmtree(self._spool, ignore_errors=True)
+
+    def _save(self, context: BrowserContext, nodeid: str) -> List[str]:
+        """Export the failed chunk and move the buffered history next to it"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / trace_name(nodeid)
+        context.tracing.stop_chunk(path=str(path))
+        self.saved += 1
+        paths = [str(path)]
+        for distance, (previous, chunk, _) in enumerate(reversed(self._ring), start=1):
+            target = self.output_dir / f"{path.stem}.before-{distance}-{trace_name(previous)}"
+            shutil.move(chunk, target)
+            paths.append(str(target))
+        self._ring.clear()
+        self._ring_bytes = 0
+        return paths
+
+    def _buffer(self, context: BrowserContext, nodeid: str):
+        """Export a passing chunk into the ring, evicting the oldest beyond its limits"""
+        self._sequence += 1
+        chunk = os.path.join(self._spool, f"{self._sequence}.zip")
+        context.tracing.stop_chunk(path=chunk)
+        size = os.path.getsize(chunk)
+        self._ring.append((nodeid, chunk, size))
+        self._ring_bytes += size
+        while self._ring and (len(self._ring) > self.history or self._ring_bytes > self.buffer_bytes):
+            _, oldest, oldest_size = self._ring.popleft()
+            os.remove(oldest)
+            self._ring_bytes -= oldest_size
+            self.evicted += 1
+
+
+class FailureTraceSummary:
+    """Run-wide trace counts and tracing overhead, registered as a plugin on the controller"""
+
+    def __init__(self):
+        self.traces = {}
+        self.dropped = 0
+        self.overhead_ms = 0.0
+        self.test_ms = {}
+        self.traced = set()
+
+    @property
+    def test_total_ms(self) -> float:
+        """Get wall time of the traced tests, tracing included"""
+        return sum(self.test_ms.get(nodeid, 0.0) for nodeid in self.traced)
+
+    def overhead_percent(self) -> float:
+        """Get tracing time as a share of traced test time"""
+        total = self.test_total_ms
+        return 100 * self.overhead_ms / total if total else 0.0
+
+    def pytest_runtest_logreport(self, report):
+        """Collect tracing records attached to the teardown report, on this process or an xdist worker"""
+        self.test_ms[report.nodeid] = self.test_ms.get(report.nodeid, 0.0) + report.duration * 1000
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == "tracing":
+                self.traced.add(report.nodeid)
+                self.overhead_ms += value["overhead_ms"]
+                self.dropped += value["dropped"]
+                if value["paths"]:
+                    self.traces[report.nodeid] = value["paths"]
@@ -0,0 +1,142 @@
+import base64
+import json
+import re
+import shutil
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from playwright.sync_api import BrowserContext, Route
+
+
+MODES = ("live", "record", "replay")
+SCOPES = ("test", "shared")
+MATCHING = ("strict", "lenient")
+# Bodies are replayed decoded, so transport headers must not be replayed
+DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def archive_name(label: str) -> str:
+    """Get file-system safe HAR file name for a test id or label"""
+    return re.sub(r"[^\w.-]+", "_", label).strip("_") + ".har"
+
+
+def strip_query(url: str) -> str:
+    """Get URL without query string and fragment"""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+def merge_archives(paths: List[Path], target: Path):
+    """Merge HAR files into one, keeping the first entry for each method and URL"""
+    merged = None
+    seen = set()
+    for path in paths:
+        har = json.loads(path.read_text(encoding="utf-8"))
+        entries = har["log"]["entries"]
+        if merged is None:
+            merged = har
+            merged["log"]["entries"] = []
+        for entry in entries:
+            key = (entry["request"]["method"], entry["request"]["url"])
+            if key not in seen:
+                seen.add(key)
+                merged["log"]["entries"].append(entry)
+    if merged is not None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(merged), encoding="utf-8")
+
+
+class HarNetwork:
+    """Records live traffic to HAR archives or replays it without touching the network"""
+
+    def __init__(self, mode: str, directory: str, scope: str = "test", matching: str = "strict",
+                 worker_id: str = "master"):
+        self.mode = mode
+        self.directory = Path(directory)
+        self.scope = scope
+        self.matching = matching
+        self.worker_id = worker_id
+        self.unmatched = {}
+        # Unmatched requests per label already taken, for the summary
+        self.unmatched_counts = {}
+        self._lenient_index = None
+
+    @property
+    def parts_directory(self) -> Path:
+        """Directory for per-test recordings merged into the shared archive at the end"""
+        return self.directory / "parts" / self.worker_id
+
+    def attach(self, context: BrowserContext, label: str):
+        """Record or replay traffic of context for test id or label"""
+        if self.mode == "record":
+            self._record(context, label)
+        elif self.mode == "replay":
+            self._replay(context, label)
+
+    def take_unmatched(self, label: str) -> List[str]:
+        """Get and forget requests of label that had no recorded response, only their count is kept"""
+        requests = self.unmatched.pop(label, [])
+        if requests:
+            self.unmatched_counts[label] = self.unmatched_counts.get(label, 0) + len(requests)
+        return requests
+
+    def finish(self):
+        """Merge per-test recordings into this worker's shared archive"""
+        if self.mode != "record" or self.scope != "shared" or not self.parts_directory.exists():
+            return
+        parts = sorted(self.parts_directory.glob("*.har"))
+        merge_archives(parts, self.directory / f"shared-{self.worker_id}.har")
+        shutil.rmtree(self.parts_directory)
+
+    def _record(self, context: BrowserContext, label: str):
+        """Send requests to the network and write them to the archive when context closes"""
+        directory = self.parts_directory if self.scope == "shared" else self.directory
+        directory.mkdir(parents=True, exist_ok=True)
+        context.route_from_har(
+            directory / archive_name(label), update=True, update_content="embed", update_mode="minimal"
+        )
+
+    def _replay(self, context: BrowserContext, label: str):
+        """Serve requests from archives, sending unmatched ones to the fallback handler"""
+        # Registered first so it runs last, after every archive handler fell back
+        context.route("**/*", lambda route: self._unmatched(route, label))
+        for path in self._archives(label):
+            context.route_from_har(path, not_found="fallback")
+
+    def _archives(self, label: str) -> List[Path]:
+        """Get archives used to replay label"""
+        if self.scope == "shared":
+            return sorted(self.directory.glob("shared-*.har"))
+        path = self.directory / archive_name(label)
+        return [path] if path.exists() else []
+
+    def _unmatched(self, route: Route, label: str):
+        """Flag request missing from archives, serving a query-insensitive match in lenient mode"""
+        request = route.request
+        entry = self._lenient_entry(request.method, request.url) if self.matching == "lenient" else None
+        served = "served by lenient match" if entry is not None else "aborted"
+        self.unmatched.setdefault(label, []).append(f"{request.method} {request.url} ({served})")
+        if entry is None:
+            route.abort("internetdisconnected")
+            return
+        response = entry["response"]
+        content = response.get("content", {})
+        text = content.get("text", "")
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+        headers = {
+            header["name"]: header["value"] for header in response.get("headers", [])
+            if header["name"].lower() not in DROPPED_HEADERS
+        }
+        route.fulfill(status=response["status"], headers=headers, body=body)
+
+    def _lenient_entry(self, method: str, url: str) -> Optional[dict]:
+        """Find recorded entry by method and URL ignoring query string"""
+        if self._lenient_index is None:
+            self._lenient_index = {}
+            for path in sorted(self.directory.glob("*.har")):
+                har = json.loads(path.read_text(encoding="utf-8"))
+                for entry in har["log"]["entries"]:
+                    key = (entry["request"]["method"], strip_query(entry["request"]["url"]))
+                    self._lenient_index.setdefault(key, entry)
+        return self._lenient_index.get((method, strip_query(url)))
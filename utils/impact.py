@@ -0,0 +1,404 @@
+import ast
+import functools
+import importlib
+import inspect
+import json
+import pkgutil
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+import pytest
+
+import pages
+from pages.async_api.base_page import AsyncBasePage
+from pages.base_page import BasePage
+from pages.instrumentation import transparent_frames
+
+
+INDEX_FILE = "impact-index.json"
+PAGES_DIR = "pages/"
+TESTS_DIR = "tests/"
+# Changes here can't affect a test run, anything else outside pages/ and tests/ runs every test
+IGNORED = (
+    "README.md", "index.html", INDEX_FILE, "perf_budgets.example.json", ".gitignore",
+    ".github/", "benchmarks/", "loadgen/", "soak/", "dashboard/"
+)
+MODULE = "*"
+HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+CONSTANT = re.compile(r"^[A-Z][A-Z0-9_]*$")
+
+
+def page_classes() -> Dict[str, type]:
+    """Get every class defined in the pages package keyed by module:qualname"""
+    classes = {}
+    for module_info in pkgutil.walk_packages(pages.__path__, "pages."):
+        module = importlib.import_module(module_info.name)
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module.__name__:
+                classes[f"{cls.__module__}:{cls.__qualname__}"] = cls
+    return classes
+
+
+def page_object_classes() -> Dict[str, type]:
+    """Get the page objects, BasePage and AsyncBasePage and their subclasses, keyed by module:qualname"""
+    return {
+        symbol: cls for symbol, cls in page_classes().items()
+        if issubclass(cls, (BasePage, AsyncBasePage))
+    }
+
+
+def _recording(function, symbol: str, touched: Set[str]):
+    """Wrap function to add symbol to touched on every call"""
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            touched.add(symbol)
+            return await function(*args, **kwargs)
+    else:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            touched.add(symbol)
+            return function(*args, **kwargs)
+    # Action timing attributes actions to the page-object method above this frame
+    transparent_frames.add(wrapper.__code__)
+    return wrapper
+
+
+class ImpactRecorder:
+    """Records which page-object methods the current test calls, on every thread"""
+
+    def __init__(self):
+        self.touched = set()
+        self._installed = False
+
+    def install(self):
+        """Wrap every method defined on a page-object class"""
+        if self._installed:
+            return
+        for symbol, cls in page_object_classes().items():
+            for name, member in list(vars(cls).items()):
+                if name.startswith("__"):
+                    continue
+                method = f"{symbol}.{name}"
+                if isinstance(member, (classmethod, staticmethod)):
+                    setattr(cls, name, type(member)(_recording(member.__func__, method, self.touched)))
+                elif inspect.isfunction(member):
+                    setattr(cls, name, _recording(member, method, self.touched))
+        self._installed = True
+
+    def clear(self):
+        """Start recording a new test"""
+        self.touched.clear()
+
+    def take(self) -> list:
+        """Get methods called since clear()"""
+        return sorted(self.touched)
+
+
+class ImpactIndex:
+    """Page-object methods called by each test, persisted as JSON next to the suite"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        data = json.loads(self.path.read_text(encoding="utf-8")) if self.path.exists() else {}
+        self.tests = data.get("tests", {})
+
+    def update(self, nodeid: str, methods: list):
+        """Replace the recorded methods of a test"""
+        self.tests[nodeid] = methods
+
+    def save(self):
+        """Write the index, dropping tests whose file is gone"""
+        tests = {
+            nodeid: methods for nodeid, methods in sorted(self.tests.items())
+            if (self.path.parent / nodeid.split("::", 1)[0]).exists()
+        }
+        self.path.write_text(json.dumps({"tests": tests}, indent=1) + "\n", encoding="utf-8")
+
+
+class SourceSymbols:
+    """Line ranges of the classes, methods and constants of a module, and what each method reads"""
+
+    def __init__(self, source: str, module: str):
+        self.module = module
+        self.spans = []
+        self.self_reads = {}
+        self.class_reads = {}
+        self.aliases = {}
+        self.bases = {}
+        tree = ast.parse(source)
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                self._add_class(node)
+            elif not self._is_docstring(node):
+                self.spans.append((self._start(node), node.end_lineno, f"{module}:{MODULE}"))
+
+    def symbols_at(self, lines: Iterable[int]) -> Set[str]:
+        """Get symbols covering any of lines"""
+        lines = set(lines)
+        return {symbol for start, end, symbol in self.spans if any(start <= line <= end for line in lines)}
+
+    def _add_class(self, node: ast.ClassDef):
+        """Add spans of a class body, a change outside its members counts for the whole class"""
+        prefix = f"{self.module}:{node.name}"
+        self.bases[prefix] = [base.id for base in node.bases if isinstance(base, ast.Name)]
+        self.spans.append((self._start(node), node.lineno, prefix))
+        for member in node.body:
+            if self._is_docstring(member):
+                continue
+            start = self._start(member)
+            if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                symbol = f"{prefix}.{member.name}"
+                self.spans.append((start, member.end_lineno, symbol))
+                self._add_reads(symbol, member)
+            elif isinstance(member, (ast.Assign, ast.AnnAssign)):
+                targets = member.targets if isinstance(member, ast.Assign) else [member.target]
+                for target in targets:
+                    if not isinstance(target, ast.Name) or not CONSTANT.match(target.id):
+                        # Other class attributes aren't tracked one by one
+                        self.spans.append((start, member.end_lineno, prefix))
+                    else:
+                        symbol = f"{prefix}.{target.id}"
+                        self.spans.append((start, member.end_lineno, symbol))
+                        value = member.value
+                        if isinstance(value, ast.Attribute) and isinstance(value.value, ast.Name):
+                            # X = OtherPage.X, a change of the original changes this one too
+                            self.aliases[symbol] = (value.value.id, value.attr)
+            else:
+                self.spans.append((start, member.end_lineno, prefix))
+
+    def _add_reads(self, symbol: str, function: ast.AST):
+        """Record attributes a method reads from self and from named classes"""
+        self_reads, class_reads = set(), set()
+        for node in ast.walk(function):
+            if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+                if node.value.id in ("self", "cls"):
+                    self_reads.add(node.attr)
+                else:
+                    class_reads.add((node.value.id, node.attr))
+        self.self_reads[symbol] = self_reads
+        self.class_reads[symbol] = class_reads
+
+    @staticmethod
+    def _start(node: ast.AST) -> int:
+        """Get first line of node, decorators included"""
+        return min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", [])])
+
+    @staticmethod
+    def _is_docstring(node: ast.AST) -> bool:
+        """Check if node is a bare string, which can't change behaviour"""
+        return isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)
+
+
+def git(root: Path, *args: str) -> str:
+    """Run git in root and get its output"""
+    return subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, check=True).stdout
+
+
+def changed_lines(ref: str, root: Path) -> Dict[str, Optional[Set[int]]]:
+    """Get changed line numbers of the working tree against ref per file, None for whole files"""
+    changes = {}
+    old = path = None
+    for line in git(root, "diff", "--unified=0", "--no-color", "--no-renames", ref, "--").splitlines():
+        if line.startswith("--- "):
+            old = line[6:] if line != "--- /dev/null" else None
+        elif line.startswith("+++ "):
+            path = line[6:] if line != "+++ /dev/null" else None
+            if path is None:
+                # Deleted, the tests that used it change as a whole
+                changes[old] = None
+            elif old is None:
+                changes[path] = None
+            else:
+                changes.setdefault(path, set())
+        elif path is not None and changes.get(path) is not None:
+            match = HUNK.match(line)
+            if match:
+                start, count = int(match.group(1)), int(match.group(2) or 1)
+                if count == 0:
+                    # A pure deletion sits between line start and the next one
+                    count = 2
+                changes[path].update(range(start, start + count))
+    for new_file in git(root, "ls-files", "--others", "--exclude-standard", "--full-name").splitlines():
+        changes[new_file] = None
+    return changes
+
+
+def module_of(path: str) -> str:
+    """Get dotted module name of a repo-relative .py path"""
+    return path[:-3].replace("/", ".").replace(".__init__", "")
+
+
+class ImpactSelection:
+    """Keeps the tests a diff can affect according to the impact index, registered with --changed-since"""
+
+    def __init__(self, ref: str, index: ImpactIndex, root: Path, always: Iterable[str] = ("smoke",)):
+        self.ref = ref
+        self.root = Path(root)
+        self.index = index
+        self.always = [marker for marker in always if marker]
+        self.run_all = False
+        self.reason = ""
+        self.methods = set()
+        self.prefixes = set()
+        self.constants = set()
+        self.test_prefixes = set()
+        self.selected = 0
+        self.deselected = 0
+        self._analyze(changed_lines(ref, self.root))
+
+    def _analyze(self, changes: Dict[str, Optional[Set[int]]]):
+        """Turn changed lines into changed page symbols and test node id prefixes"""
+        classes = page_classes()
+        by_name = {cls.__name__: symbol for symbol, cls in classes.items()}
+        sources = {}
+        changed = set()
+        for path, lines in sorted(changes.items()):
+            if path.startswith(IGNORED):
+                continue
+            file = self.root / path
+            if path.startswith(PAGES_DIR) and path.endswith(".py") and not path.endswith("__init__.py"):
+                if lines is None or not file.exists():
+                    changed.add(f"{module_of(path)}:{MODULE}")
+                    continue
+                sources[path] = SourceSymbols(file.read_text(encoding="utf-8"), module_of(path))
+                changed |= sources[path].symbols_at(lines)
+            elif path.startswith(TESTS_DIR) and file.name.startswith("test_") and path.endswith(".py"):
+                if lines is None or not file.exists():
+                    self.test_prefixes.add(path)
+                    continue
+                for symbol in SourceSymbols(file.read_text(encoding="utf-8"), module_of(path)).symbols_at(lines):
+                    name = symbol.split(":", 1)[1]
+                    self.test_prefixes.add(path if name == MODULE else f"{path}::{name.replace('.', '::')}")
+            else:
+                self.run_all = True
+                self.reason = f"{path} changed"
+                return
+        for file in (self.root / PAGES_DIR).rglob("*.py"):
+            path = file.relative_to(self.root).as_posix()
+            if path not in sources:
+                sources[path] = SourceSymbols(file.read_text(encoding="utf-8"), module_of(path))
+        self._expand(changed, sources, classes, by_name)
+
+    def _expand(self, changed: Set[str], sources: Dict[str, SourceSymbols], classes: Dict[str, type], by_name: dict):
+        """Add methods reading changed constants, through aliases in other classes, to the changed methods"""
+        aliases = {}
+        for symbols in sources.values():
+            for symbol, (class_name, attr) in symbols.aliases.items():
+                if class_name in by_name:
+                    aliases.setdefault(f"{by_name[class_name]}.{attr}", set()).add(symbol)
+        constants = set()
+        stack = [symbol for symbol in changed if CONSTANT.match(symbol.rsplit(".", 1)[-1])]
+        while stack:
+            symbol = stack.pop()
+            if symbol not in constants:
+                constants.add(symbol)
+                stack.extend(aliases.get(symbol, ()))
+        for symbol in changed - constants:
+            module, name = symbol.split(":", 1)
+            if name == MODULE:
+                # Imports or helpers of the module, anything recorded from it
+                self.prefixes.add(module + ":")
+            elif "." not in name:
+                # Class-level change, every method of the class
+                self.prefixes.add(symbol + ".")
+            else:
+                self.methods.add(symbol)
+        for constant in constants:
+            owner, attr = constant.rsplit(".", 1)
+            self.constants.add(attr)
+            for symbols in sources.values():
+                for method, reads in symbols.self_reads.items():
+                    reader = classes.get(method.rsplit(".", 1)[0], object)
+                    defined = classes.get(owner, object)
+                    # Either class can be the one self is an instance of
+                    if attr in reads and (issubclass(reader, defined) or issubclass(defined, reader)):
+                        self.methods.add(method)
+                for method, reads in symbols.class_reads.items():
+                    if any(by_name.get(name) == owner and read == attr for name, read in reads):
+                        self.methods.add(method)
+
+    def is_impacted(self, item, test_reads: Set[str]) -> bool:
+        """Check if a test may behave differently after the change"""
+        if any(item.nodeid == prefix or item.nodeid.startswith(prefix + "::") or item.nodeid.startswith(prefix + "[")
+               for prefix in self.test_prefixes):
+            return True
+        if any(item.get_closest_marker(marker) for marker in self.always):
+            return True
+        recorded = self.index.tests.get(item.nodeid)
+        if recorded is None:
+            return True
+        if self.methods.intersection(recorded):
+            return True
+        if any(method.startswith(prefix) for method in recorded for prefix in self.prefixes):
+            return True
+        return bool(self.constants & test_reads)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        """Deselect tests the change can't affect"""
+        if self.run_all:
+            self.selected = len(items)
+            return
+        reads = {}
+        keep, drop = [], []
+        for item in items:
+            path = item.nodeid.split("::", 1)[0]
+            if path not in reads:
+                reads[path] = constant_reads(self.root / path)
+            key = "::".join(item.nodeid.split("[", 1)[0].split("::")[1:])
+            (keep if self.is_impacted(item, reads[path].get(key, set())) else drop).append(item)
+        if drop:
+            config.hook.pytest_deselected(items=drop)
+            items[:] = keep
+        self.selected, self.deselected = len(keep), len(drop)
+
+
+def constant_reads(path: Path) -> Dict[str, Set[str]]:
+    """Get constant-like attributes each test function reads, fixtures of its class included"""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    reads = {}
+
+    def constants(node: ast.AST) -> Set[str]:
+        """Get constant-like attribute names read in node"""
+        return {
+            child.attr for child in ast.walk(node)
+            if isinstance(child, ast.Attribute) and CONSTANT.match(child.attr)
+        }
+
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            reads[node.name] = constants(node)
+        elif isinstance(node, ast.ClassDef):
+            shared = set().union(*(
+                constants(member) for member in node.body
+                if isinstance(member, ast.FunctionDef) and not member.name.startswith("test")
+            ))
+            for member in node.body:
+                if isinstance(member, ast.FunctionDef) and member.name.startswith("test"):
+                    reads[f"{node.name}::{member.name}"] = constants(member) | shared
+    return reads
+
+
+class ImpactIndexWriter:
+    """Collects the methods each test called and saves them to the index, registered on the controller"""
+
+    def __init__(self, index: ImpactIndex):
+        self.index = index
+        self.recorded = 0
+
+    def pytest_runtest_logreport(self, report):
+        """Take methods attached to the teardown report, on this process or an xdist worker"""
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == "impact":
+                self.index.update(report.nodeid, value)
+                self.recorded += 1
+
+    def pytest_sessionfinish(self):
+        """Persist the index"""
+        if self.recorded:
+            self.index.save()
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Optional
+
+from playwright.sync_api import BrowserContext, Error as PlaywrightError, Route
+
+
+CACHEABLE_TYPES = ("image", "font", "stylesheet", "script", "media")
+# Bodies are stored decoded, so transport headers must not be replayed
+DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Write file through a temp file so concurrent workers never read partial data"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=path.parent)
+    with os.fdopen(handle, "wb") as temp_file:
+        temp_file.write(data)
+    os.replace(temp_path, path)
+
+
+class AssetCache:
+    """Content-addressed on-disk store of static responses, safe to share between workers"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.objects = self.directory / "objects"
+        self.index = self.directory / "index"
+
+    def get(self, url: str) -> Optional[tuple]:
+        """Get (entry, body) cached for URL"""
+        entry = self._entry(url)
+        if entry is None:
+            return None
+        body_path = self._object_path(entry["digest"])
+        if not body_path.exists():
+            return None
+        return entry, body_path.read_bytes()
+
+    def size(self, url: str) -> int:
+        """Get body size cached for URL, 0 if unknown"""
+        entry = self._entry(url)
+        return entry["size"] if entry else 0
+
+    def put(self, url: str, status: int, headers: dict, body: bytes) -> str:
+        """Store response body by digest and point URL at it"""
+        digest = hashlib.sha256(body).hexdigest()
+        body_path = self._object_path(digest)
+        if not body_path.exists():
+            _atomic_write(body_path, body)
+        headers = {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS}
+        entry = {"url": url, "digest": digest, "size": len(body), "status": status, "headers": headers}
+        _atomic_write(self._entry_path(url), json.dumps(entry).encode("utf-8"))
+        return digest
+
+    def _entry(self, url: str) -> Optional[dict]:
+        """Get index entry for URL"""
+        try:
+            return json.loads(self._entry_path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _entry_path(self, url: str) -> Path:
+        """Get index file for URL"""
+        return self.index / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def _object_path(self, digest: str) -> Path:
+        """Get object file for digest"""
+        return self.objects / digest[:2] / digest[2:]
+
+
+class ResourceRouter:
+    """Context route handler that blocks resource types and serves static assets from an AssetCache"""
+
+    def __init__(self, blocked_types: Iterable[str] = (), cache: AssetCache = None):
+        self.blocked_types = frozenset(blocked_types)
+        self.cache = cache
+        self.stats = self._empty_stats()
+        self.totals = self._empty_stats()
+
+    def install(self, context: BrowserContext):
+        """Route every request of context through this router"""
+        context.route("**/*", self._handle)
+
+    def take_stats(self) -> dict:
+        """Get stats collected since last call and start over"""
+        stats = self.stats
+        for name, value in stats.items():
+            self.totals[name] += value
+        self.stats = self._empty_stats()
+        return stats
+
+    def _handle(self, route: Route):
+        """Abort, serve from cache or pass the request on"""
+        request = route.request
+        resource_type = request.resource_type
+        self.stats["requests"] += 1
+        if resource_type in self.blocked_types:
+            self.stats["blocked"] += 1
+            if self.cache is not None:
+                self.stats["bytes_saved"] += self.cache.size(request.url)
+            route.abort("blockedbyclient")
+            return
+        if self.cache is None or resource_type not in CACHEABLE_TYPES or request.method != "GET":
+            route.fallback()
+            return
+        cached = self.cache.get(request.url)
+        if cached is not None:
+            entry, body = cached
+            self.stats["cache_hits"] += 1
+            self.stats["bytes_saved"] += len(body)
+            route.fulfill(status=entry["status"], headers=entry["headers"], body=body)
+            return
+        try:
+            response = route.fetch()
+            body = response.body()
+        except PlaywrightError:
+            route.fallback()
+            return
+        self.stats["cache_misses"] += 1
+        self.stats["bytes_fetched"] += len(body)
+        if response.status == 200:
+            self.cache.put(request.url, response.status, response.headers, body)
+        route.fulfill(response=response, body=body)
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        """Get zeroed counters"""
+        return {
+            "requests": 0,
+            "blocked": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "bytes_saved": 0,
+            "bytes_fetched": 0
+        }
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Product:
+    """Product sold by www.saucedemo.com, and served the same way by the stand-in"""
+
+    id: int
+    name: str
+    price: float
+    description: str
+
+    @property
+    def slug(self) -> str:
+        """Get slug used in data-test hooks, e.g. add-to-cart-<slug>"""
+        return self.name.lower().replace(" ", "-")
+
+    def to_dict(self) -> dict:
+        """Get JSON-serializable product"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "price": self.price,
+            "description": self.description,
+            "slug": self.slug
+        }
+
+
+# Same ids, names and prices as www.saucedemo.com, in its default (A to Z) order
+PRODUCTS = (
+    Product(4, "Sauce Labs Backpack", 29.99,
+            "carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising "
+            "style with unequaled laptop and tablet protection."),
+    Product(0, "Sauce Labs Bike Light", 9.99,
+            "A red light isn't the desired state in testing but it sure helps when riding your "
+            "bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included."),
+    Product(1, "Sauce Labs Bolt T-Shirt", 15.99,
+            "Get your testing superhero on with the Sauce Labs bolt T-shirt. From American "
+            "Apparel, 100% ringspun combed cotton, heather gray with red bolt."),
+    Product(5, "Sauce Labs Fleece Jacket", 49.99,
+            "It's not every day that you come across a midweight quarter-zip fleece jacket "
+            "capable of handling everything from a relaxing day outdoors to a busy day at the office."),
+    Product(2, "Sauce Labs Onesie", 7.99,
+            "Rib snap infant onesie for the junior automation engineer in development. Reinforced "
+            "3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel."),
+    Product(3, "Test.allTheThings() T-Shirt (Red)", 15.99,
+            "This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard "
+            "to automate a few tests. Super-soft and comfy ringspun combed cotton.")
+)
+
+
+def product_by_id(product_id: int) -> Product:
+    """Get product by its id"""
+    for product in PRODUCTS:
+        if product.id == product_id:
+            return product
+    raise KeyError(f"Unknown product id: {product_id}")
+
+
+def product_by_name(name: str) -> Product:
+    """Get product by its display name"""
+    for product in PRODUCTS:
+        if product.name == name:
+            return product
+    raise KeyError(f"Unknown product name: {name}")
@@ -0,0 +1,120 @@
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+
+from dashboard.merge import META_FILE, merge_results
+
+
+def new_run_id() -> str:
+    """Get a sortable, unique id for a test run"""
+    return time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+
+
+def outcome_of(reports: dict) -> str:
+    """Get outcome of a test from its setup, call and teardown reports"""
+    setup, call, teardown = (reports.get(when) for when in ("setup", "call", "teardown"))
+    if setup is not None and setup.failed:
+        return "error"
+    if call is not None and hasattr(call, "wasxfail"):
+        return "xfailed" if call.skipped else "xpassed"
+    if call is not None and call.failed:
+        return "failed"
+    if teardown is not None and teardown.failed:
+        return "error"
+    if any(report.skipped for report in reports.values()):
+        return "skipped"
+    return "passed"
+
+
+class ResultShardWriter:
+    """Appends one JSON line per finished test to the shard of this process, registered on every process"""
+
+    def __init__(self, run_dir: str, worker: str):
+        self.path = Path(run_dir) / f"shard-{worker}.jsonl"
+        self.worker = worker
+        self._pending = {}
+        self._file = None
+
+    def record(self, reports: dict) -> dict:
+        """Get the shard line of a test"""
+        last = reports["teardown"]
+        failing = [report for report in reports.values() if report.failed or report.skipped]
+        return {
+            "type": "test",
+            "nodeid": last.nodeid,
+            "outcome": outcome_of(reports),
+            "duration": round(sum(report.duration for report in reports.values()), 4),
+            "phases": {when: round(report.duration, 4) for when, report in reports.items()},
+            "start": round(min(report.start for report in reports.values()), 3),
+            "worker": self.worker,
+            "longrepr": failing[0].longreprtext if failing else None,
+            "properties": dict(last.user_properties)
+        }
+
+    def write(self, record: dict):
+        """Append one line and flush it, so a merge during the run sees every finished test"""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+
+    def pytest_runtest_logreport(self, report):
+        """Write the test once its teardown report is in"""
+        if hasattr(report, "node"):
+            # Forwarded by an xdist worker, which writes its own shard
+            return
+        reports = self._pending.setdefault(report.nodeid, {})
+        reports[report.when] = report
+        if report.when == "teardown":
+            self.write(self.record(self._pending.pop(report.nodeid)))
+
+    def pytest_unconfigure(self):
+        """Close the shard"""
+        if self._file is not None:
+            self._file.close()
+
+
+class ResultRun:
+    """Creates the run directory shared by all shards and merges it into the dashboard, registered on the controller"""
+
+    def __init__(self, config, results_dir: str, dashboard_dir: str = None):
+        self.run_id = new_run_id()
+        self.run_dir = Path(results_dir) / self.run_id
+        self.dashboard_dir = dashboard_dir
+        self.meta = {
+            "id": self.run_id,
+            "started": time.time(),
+            "finished": None,
+            "exitstatus": None,
+            "args": list(config.invocation_params.args),
+            "commit": os.environ.get("GITHUB_SHA"),
+            "branch": os.environ.get("GITHUB_REF_NAME")
+        }
+
+    def write_meta(self):
+        """Write run metadata next to the shards"""
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        (self.run_dir / META_FILE).write_text(json.dumps(self.meta, indent=2), encoding="utf-8")
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        """Tell an xdist worker where to write its shard"""
+        node.workerinput["results_run_dir"] = str(self.run_dir)
+
+    def pytest_sessionstart(self):
+        """Mark the run as started"""
+        self.write_meta()
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        """Mark the run as finished and update the dashboard"""
+        self.meta["finished"] = time.time()
+        self.meta["exitstatus"] = int(exitstatus)
+        self.write_meta()
+        if self.dashboard_dir:
+            merge_results(self.run_dir.parent, self.dashboard_dir)
@@ -0,0 +1,176 @@
+import csv
+import json
+from pathlib import Path
+from typing import Callable, Iterator, Sequence, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from playwright.sync_api import Browser, BrowserContext, Error as PlaywrightError, Page
+
+from pages.checkout_page import CheckoutPage
+from pages.login_page import LoginPage
+from utils.auth_cache import DEFAULT_USER
+from utils.state_seeding import PAGES, seed
+
+
+FORMATS = (".csv", ".jsonl")
+
+
+class ScenarioSource:
+    """CSV or JSONL file of scenario rows, indexed by byte offset and read one row at a time"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        if self.path.suffix not in FORMATS:
+            raise ValueError(f"Unsupported scenario file {self.path}, expected one of {', '.join(FORMATS)}")
+        self._header = None
+
+    def rows(self) -> Iterator["ScenarioRow"]:
+        """Get a reference to every row without keeping more than one line in memory"""
+        with open(self.path, "rb") as file:
+            lines = _OffsetLines(file)
+            # A CSV record can span lines when a field is quoted
+            records = csv.reader(lines) if self.path.suffix == ".csv" else lines
+            if self.path.suffix == ".csv":
+                self._header = next(records, [])
+            number = 0
+            while True:
+                offset = lines.offset
+                record = next(records, None)
+                if record is None:
+                    return
+                number += 1
+                blank = not any(record) if isinstance(record, list) else not record.strip()
+                if not blank:
+                    yield ScenarioRow(self, number, offset)
+
+    def read(self, offset: int) -> dict:
+        """Parse the row starting at offset"""
+        with open(self.path, "rb") as file:
+            file.seek(offset)
+            if self.path.suffix == ".jsonl":
+                return json.loads(file.readline())
+            record = next(csv.reader(_OffsetLines(file)))
+        return dict(zip(self.header(), record))
+
+    def header(self) -> list:
+        """Get CSV column names"""
+        if self._header is None:
+            with open(self.path, "rb") as file:
+                self._header = next(csv.reader(_OffsetLines(file)), [])
+        return self._header
+
+
+class _OffsetLines:
+    """Line iterator over a binary file tracking the offset after the last line handed out"""
+
+    def __init__(self, file):
+        self.file = file
+        self.offset = file.tell()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = self.file.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode("utf-8")
+
+
+class ScenarioRow:
+    """Reference to one row of a scenario file, parsed only when its test runs"""
+
+    __slots__ = ("source", "number", "offset")
+
+    def __init__(self, source: ScenarioSource, number: int, offset: int):
+        self.source = source
+        self.number = number
+        self.offset = offset
+
+    @property
+    def id(self) -> str:
+        """Get test id of the row"""
+        return f"{self.source.path.stem}-{self.number}"
+
+    def load(self) -> dict:
+        """Read and parse the row"""
+        return self.source.read(self.offset)
+
+
+class ScenarioPages:
+    """Long-lived pages scenario rows run on, one per kind, reset in place between rows"""
+
+    def __init__(self, browser: Browser, base_url: str, context_options: dict = None,
+                 context_setup: Callable[[BrowserContext, str], None] = None):
+        self.browser = browser
+        self.base_url = base_url
+        self.context_options = context_options or {}
+        self.context_setup = context_setup
+        self.rows = 0
+        self.resets = 0
+        self.reloads = 0
+        self._pages = {}
+
+    def login_page(self) -> LoginPage:
+        """Get the login page, logged out and without an error"""
+        self.rows += 1
+        page, fresh = self._page("login")
+        if fresh or urlsplit(page.url).path != urlsplit(self.base_url).path:
+            # A row logged in, drop the session instead of the context
+            page.context.clear_cookies()
+            self._reload(page, self.base_url, fresh)
+        else:
+            self._reset(LoginPage(page), self.base_url)
+        return LoginPage(page)
+
+    def checkout_page(self, user: str = DEFAULT_USER, cart: Sequence[int] = (0,)) -> CheckoutPage:
+        """Get checkout step one of user with cart, without an error"""
+        self.rows += 1
+        page, fresh = self._page(("checkout", user, tuple(cart)))
+        url = urljoin(self.base_url, PAGES["checkout-step-one"])
+        if fresh:
+            seed(page, self.base_url, user, cart, "checkout-step-one")
+        elif page.url != url:
+            # A row continued to step two, the seeded cart is still in the tab
+            self._reload(page, url, fresh)
+        else:
+            self._reset(CheckoutPage(page), url)
+        return CheckoutPage(page)
+
+    def stats(self) -> dict:
+        """Get rows run, in-page resets, reloads and pages created"""
+        return {"rows": self.rows, "resets": self.resets, "reloads": self.reloads, "pages": len(self._pages)}
+
+    def close(self):
+        """Close every page's context"""
+        for page in self._pages.values():
+            page.context.close()
+        self._pages.clear()
+
+    def _page(self, kind) -> Tuple[Page, bool]:
+        """Get page of kind and whether it was just created"""
+        page = self._pages.get(kind)
+        if page is not None and not page.is_closed():
+            return page, False
+        context = self.browser.new_context(**self.context_options)
+        if self.context_setup is not None:
+            self.context_setup(context, f"scenarios-{kind if isinstance(kind, str) else kind[0]}")
+        page = context.new_page()
+        self._pages[kind] = page
+        return page, True
+
+    def _reset(self, page_object, url: str):
+        """Clear the previous row's error, reloading url when the page can't do it"""
+        try:
+            page_object.dismiss_error()
+            self.resets += 1
+        except PlaywrightError:
+            page_object.page.goto(url)
+            self.reloads += 1
+
+    def _reload(self, page: Page, url: str, fresh: bool):
+        """Open url, a reload unless the page is new"""
+        page.goto(url)
+        if not fresh:
+            self.reloads += 1
@@ -0,0 +1,329 @@
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urljoin
+
+from playwright.sync_api import Browser, Error as PlaywrightError, Page, sync_playwright
+
+from standin import FaultProfile, StandinServer
+from utils.auth_cache import DEFAULT_USER
+from utils.impact import CONSTANT, page_classes
+from utils.settings import CONTEXT_OPTIONS, LIVE_BASE_URL
+from utils.state_seeding import PAGES, seed
+
+
+# Characters no plain word has, so plain-word constants aren't taken for selectors
+SELECTOR_HINT = re.compile(r"[.#\[\]:>=]|^//|^xpath=")
+PLAYWRIGHT_ONLY = re.compile(r"^(text=|internal:|role=)|>>|:has-text\(|:text\(|:visible")
+SUBSTRING_ATTRIBUTE = re.compile(r"\[[\w-]+\s*[*^$~|]=")
+# Constants named like a single control, more than one match makes the action pick one at random
+SINGLE_ELEMENT = ("_BUTTON", "_INPUT", "_LINK", "_DROPDOWN", "_BADGE", "_MESSAGE", "_HEADER", "CONTAINER")
+ROUNDTRIPS = 5
+
+# Resolves every selector repeat times in the page, timing it with the page clock
+PROFILE_SCRIPT = """
+({selectors, repeat}) => selectors.map(({selector, engine}) => {
+    const resolve = engine === "xpath"
+        ? () => document.evaluate(selector.replace(/^xpath=/, ""), document, null,
+                                  XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength
+        : () => document.querySelectorAll(selector).length;
+    try {
+        let count = resolve();
+        const start = performance.now();
+        for (let i = 0; i < repeat; i++) count = resolve();
+        return {count, us: (performance.now() - start) * 1000 / repeat, error: null};
+    } catch (error) {
+        return {count: 0, us: 0, error: error.message};
+    }
+})
+"""
+
+
+@dataclass
+class SelectorProfile:
+    """Cost and matches of one selector constant of a page object"""
+    owner: str
+    name: str
+    selector: str
+    engine: str
+    matches: Dict[str, int] = field(default_factory=dict)
+    dom_us: List[float] = field(default_factory=list)
+    roundtrip_ms: List[float] = field(default_factory=list)
+    error: str = None
+    flags: List[str] = field(default_factory=list)
+
+    @property
+    def cost_us(self) -> float:
+        """Get median in-page resolution time, the Playwright round-trip for selectors only it can run"""
+        if self.engine == "playwright":
+            return statistics.median(self.roundtrip_ms) * 1000 if self.roundtrip_ms else 0.0
+        return statistics.median(self.dom_us) if self.dom_us else 0.0
+
+    @property
+    def most_matches(self) -> int:
+        """Get the largest match count over the audited pages"""
+        return max(self.matches.values(), default=0)
+
+    def to_dict(self) -> dict:
+        """Get JSON-friendly form"""
+        return dict(asdict(self), cost_us=self.cost_us)
+
+
+def engine_of(selector: str) -> str:
+    """Get which engine resolves selector: css, xpath or playwright"""
+    if selector.startswith(("//", "xpath=", "(//")):
+        return "xpath"
+    if PLAYWRIGHT_ONLY.search(selector):
+        return "playwright"
+    return "css"
+
+
+def selector_constants(cls: type) -> Dict[str, str]:
+    """Get selector constants and regions a page-object class defines itself"""
+    selectors = {}
+    for name, value in vars(cls).items():
+        if CONSTANT.match(name) and isinstance(value, str) and SELECTOR_HINT.search(value):
+            selectors[name] = value
+    for region, selector in vars(cls).get("REGIONS", {}).items():
+        selectors[f"REGIONS[{region}]"] = selector
+    return selectors
+
+
+def audited_classes() -> Dict[str, type]:
+    """Get sync page-object classes that own at least one URL path, by class name"""
+    return {
+        cls.__name__: cls for symbol, cls in page_classes().items()
+        if not symbol.startswith("pages.async_api") and getattr(cls, "PATHS", ())
+    }
+
+
+class SelectorAudit:
+    """Measures every selector constant of the page objects on the pages they own"""
+
+    def __init__(self, page: Page, base_url: str, user: str = DEFAULT_USER, cart=(0, 1), repeat: int = 200,
+                 slow_us: float = 20.0):
+        self.page = page
+        self.base_url = base_url
+        self.user = user
+        self.cart = tuple(cart)
+        self.repeat = repeat
+        self.slow_us = slow_us
+
+    def run(self, classes: Dict[str, type] = None) -> List[SelectorProfile]:
+        """Profile the classes and get their selectors, most expensive first"""
+        profiles = []
+        for owner, cls in sorted((classes or audited_classes()).items()):
+            selectors = {
+                name: SelectorProfile(owner, name, selector, engine_of(selector))
+                for name, selector in selector_constants(cls).items()
+            }
+            for path in cls.PATHS:
+                self.open(path)
+                self.measure(path, list(selectors.values()))
+            profiles.extend(selectors.values())
+        for profile in profiles:
+            profile.flags = self.flags(profile)
+        return sorted(profiles, key=lambda profile: (profile.cost_us, len(profile.flags)), reverse=True)
+
+    def open(self, path: str):
+        """Open a page-object path in the state tests see it in"""
+        name = path.strip("/")
+        if not name:
+            self.page.context.clear_cookies()
+            self.page.goto(self.base_url)
+            return
+        at = next((key for key, page_path in PAGES.items() if page_path == name), None)
+        if at is None:
+            self.page.goto(urljoin(self.base_url, name))
+        else:
+            seed(self.page, self.base_url, self.user, self.cart, at)
+
+    def measure(self, path: str, profiles: List[SelectorProfile]):
+        """Resolve the selectors on the open page"""
+        in_page = [profile for profile in profiles if profile.engine != "playwright"]
+        results = self.page.evaluate(PROFILE_SCRIPT, {
+            "selectors": [{"selector": profile.selector, "engine": profile.engine} for profile in in_page],
+            "repeat": self.repeat
+        })
+        for profile, result in zip(in_page, results):
+            profile.matches[path] = result["count"]
+            profile.dom_us.append(result["us"])
+            profile.error = profile.error or result["error"]
+        for profile in profiles:
+            # What an action pays before it starts, the IPC hop included
+            timings = []
+            try:
+                for _ in range(ROUNDTRIPS):
+                    start = time.perf_counter()
+                    count = self.page.locator(profile.selector).count()
+                    timings.append((time.perf_counter() - start) * 1000)
+            except PlaywrightError as error:
+                profile.error = profile.error or str(error)
+                count = 0
+            if timings:
+                profile.roundtrip_ms.append(statistics.median(timings))
+            if profile.engine == "playwright":
+                profile.matches[path] = count
+
+    def flags(self, profile: SelectorProfile) -> List[str]:
+        """Get what is wrong with a selector"""
+        flags = []
+        if profile.error:
+            flags.append(f"invalid: {profile.error.splitlines()[0]}")
+        if profile.engine == "xpath":
+            flags.append("xpath")
+            if "ancestor" in profile.selector:
+                flags.append("ancestor axis")
+        if profile.most_matches == 0 and not profile.error:
+            flags.append(f"no match in the seeded state of {', '.join(profile.matches) or 'any page'}")
+        if SUBSTRING_ATTRIBUTE.search(profile.selector) and profile.most_matches > 1:
+            flags.append(f"substring match hits {profile.most_matches} elements")
+        elif profile.name.endswith(SINGLE_ELEMENT) and profile.most_matches > 1:
+            flags.append(f"ambiguous: {profile.most_matches} matches")
+        if profile.cost_us > self.slow_us:
+            flags.append(f"slow: {profile.cost_us:.1f} us")
+        return flags
+
+
+def report_lines(profiles: List[SelectorProfile]) -> List[str]:
+    """Get the ranked report as text lines"""
+    lines = [f"{'us':>8} {'rtt ms':>7} {'matches':>8}  selector"]
+    for profile in profiles:
+        roundtrip = statistics.median(profile.roundtrip_ms) if profile.roundtrip_ms else 0.0
+        lines.append(
+            f"{profile.cost_us:>8.1f} {roundtrip:>7.2f} {profile.most_matches:>8}  "
+            f"{profile.owner}.{profile.name} = {profile.selector}"
+        )
+        lines.extend(f"{'':>27}! {flag}" for flag in profile.flags)
+    return lines
+
+
+def write_report(path, base_url: str, profiles: List[SelectorProfile]):
+    """Write the ranked profiles as JSON"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "base_url": base_url,
+        "selectors": [profile.to_dict() for profile in profiles]
+    }, indent=2), encoding="utf-8")
+
+
+def audit_browser(browser: Browser, base_url: str, context_options: dict = None) -> List[SelectorProfile]:
+    """Audit the selectors in a new context of browser"""
+    context = browser.new_context(**(context_options or {}))
+    try:
+        return SelectorAudit(context.new_page(), base_url).run()
+    finally:
+        context.close()
+
+
+class SelectorAuditPlugin:
+    """Audits the selectors once per run on the controller, after the tests, registered with --audit-selectors"""
+
+    def __init__(self, output: str, base_url: str = None, context_options: dict = None, standin_config: str = None,
+                 browser: Browser = None):
+        self.output = output
+        # None audits a stand-in server started for the audit
+        self.base_url = base_url
+        self.context_options = context_options
+        self.standin_config = standin_config
+        # A browser that outlives the run, like the watch runner's, instead of launching one
+        self.browser = browser
+        self.profiles = None
+        self.error = None
+        self.seconds = 0.0
+
+    def pytest_sessionfinish(self, session):
+        """Audit once the tests, and the browsers they used, are done"""
+        if session.config.option.collectonly:
+            return
+        start = time.perf_counter()
+        server = None
+        base_url = self.base_url
+        try:
+            if base_url is None:
+                profile = FaultProfile.load(self.standin_config) if self.standin_config else FaultProfile()
+                server = StandinServer(profile=profile)
+                server.start()
+                base_url = server.url
+            if self.browser is not None:
+                self.profiles = audit_browser(self.browser, base_url, self.context_options)
+            else:
+                with sync_playwright() as p:
+                    browser = p.chromium.launch(headless=True)
+                    self.profiles = audit_browser(browser, base_url, self.context_options)
+                    browser.close()
+            write_report(self.output, base_url, self.profiles)
+        except (PlaywrightError, OSError) as error:
+            # The tests already passed or failed on their own, an audit that can't run must not crash the run
+            self.error = (str(error).splitlines() or [type(error).__name__])[0]
+        finally:
+            if server is not None:
+                server.stop()
+        self.seconds = time.perf_counter() - start
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Rank the ten most expensive selectors and every flagged one"""
+        if self.error is not None:
+            terminalreporter.write_sep("-", "selector audit failed")
+            terminalreporter.write_line(self.error)
+            return
+        if self.profiles is None:
+            return
+        flagged = [profile for profile in self.profiles if profile.flags]
+        terminalreporter.write_sep(
+            "-", f"selector audit: {len(self.profiles)} selectors, {len(flagged)} flagged, {self.seconds:.1f} s"
+        )
+        top = self.profiles[:10]
+        for line in report_lines(top + [profile for profile in flagged if profile not in top]):
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"details: {self.output}")
+
+
+def main() -> int:
+    """Audit the page-object selectors against a running app"""
+    parser = argparse.ArgumentParser(description="Profile and audit the selector constants of the page objects")
+    parser.add_argument("--target", choices=("live", "local"), default="local",
+                        help="Audit www.saucedemo.com (live) or the bundled stand-in server (local)")
+    parser.add_argument("--base-url", help="Audit the app at this URL instead of --target")
+    parser.add_argument("--user", default=DEFAULT_USER, help="User whose session is seeded")
+    parser.add_argument("--repeat", type=int, default=200, help="In-page resolutions averaged per selector")
+    parser.add_argument("--slow-us", type=float, default=20.0, help="Flag selectors resolving slower than this")
+    parser.add_argument("--output", default="reports/selector-audit.json", help="Where to write the JSON report")
+    parser.add_argument("--strict", action="store_true", help="Exit with 1 when any selector is flagged")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url or LIVE_BASE_URL
+    if args.base_url is None and args.target == "local":
+        server = StandinServer(profile=FaultProfile())
+        server.start()
+        base_url = server.url
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=not args.headed)
+            page = browser.new_context(**CONTEXT_OPTIONS).new_page()
+            base_url = base_url if base_url.endswith("/") else base_url + "/"
+            audit = SelectorAudit(page, base_url, args.user, repeat=args.repeat, slow_us=args.slow_us)
+            profiles = audit.run()
+            browser.close()
+    finally:
+        if server is not None:
+            server.stop()
+
+    write_report(args.output, base_url, profiles)
+    print("\n".join(report_lines(profiles)))
+    flagged = [profile for profile in profiles if profile.flags]
+    print(f"\n{len(profiles)} selectors, {len(flagged)} flagged, details: {args.output}")
+    return 1 if args.strict and flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
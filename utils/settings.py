@@ -0,0 +1,6 @@
+# Shared by conftest and the command-line runners, which can't import conftest
+LIVE_BASE_URL = "https://www.saucedemo.com/"
+CONTEXT_OPTIONS = {
+    "viewport": {"width": 1280, "height": 720},
+    "ignore_https_errors": True
+}
@@ -0,0 +1,102 @@
+import json
+import uuid
+from dataclasses import dataclass
+from typing import Sequence, Tuple, Union
+from urllib.parse import urljoin, urlsplit
+
+from playwright.sync_api import Page
+
+from pages.cart_page import CartPage
+from pages.inventory_page import InventoryPage
+from utils.auth_cache import DEFAULT_USER
+from utils.products import PRODUCTS, product_by_name
+
+
+SESSION_COOKIE = "session-username"
+CART_KEY = "cart-contents"
+# Seedable pages -> path below base_url
+PAGES = {
+    "inventory": "inventory.html",
+    "cart": "cart.html",
+    "checkout-step-one": "checkout-step-one.html",
+    "checkout-step-two": "checkout-step-two.html",
+    "checkout-complete": "checkout-complete.html"
+}
+URL_TIMEOUT = 10000
+
+# Writes the cart once per seed, later reloads in the same tab keep whatever the test did to it
+SEED_CART_SCRIPT = """
+(() => {
+    const seed = %s;
+    if (window.top !== window || location.origin !== seed.origin) return;
+    if (sessionStorage.getItem("__seed") === seed.token) return;
+    sessionStorage.setItem("__seed", seed.token);
+    localStorage.setItem(seed.key, JSON.stringify(seed.cart));
+})();
+"""
+APP_STATE_SCRIPT = "(key) => ({cart: JSON.parse(localStorage.getItem(key) || '[]')})"
+
+
+@dataclass(frozen=True)
+class SeededState:
+    """Client-side state written by seed()"""
+    user: str
+    cart: Tuple[int, ...]
+    at: str
+    url: str
+
+    @property
+    def cart_names(self) -> list:
+        """Get product names in cart order"""
+        names = {product.id: product.name for product in PRODUCTS}
+        return [names[product_id] for product_id in self.cart]
+
+
+def product_id(product: Union[int, str]) -> int:
+    """Get id of a product given by inventory position (default A to Z order) or name"""
+    if isinstance(product, int):
+        return PRODUCTS[product].id
+    return product_by_name(product).id
+
+
+def seed(page: Page, base_url: str, user: str = DEFAULT_USER, cart: Sequence[Union[int, str]] = (),
+         at: str = "inventory") -> SeededState:
+    """Write session cookie and cart for user and deep-link to a page, skipping the UI steps
+
+    Cart items are inventory positions, like InventoryPage.add_product_to_cart, or product names.
+    """
+    if at not in PAGES:
+        raise ValueError(f"Unknown page {at!r}, expected one of {', '.join(PAGES)}")
+    parts = urlsplit(base_url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    state = SeededState(user, tuple(product_id(product) for product in cart), at, urljoin(base_url, PAGES[at]))
+    page.context.add_cookies([{"name": SESSION_COOKIE, "value": user, "url": origin}])
+    seed_data = {"origin": origin, "token": uuid.uuid4().hex, "key": CART_KEY, "cart": list(state.cart)}
+    page.add_init_script(SEED_CART_SCRIPT % json.dumps(seed_data))
+    page.goto(state.url)
+    page.wait_for_url(f"**/{PAGES[at]}", timeout=URL_TIMEOUT)
+    return state
+
+
+def app_state(page: Page) -> dict:
+    """Get session user and cart ids the application currently holds"""
+    cookies = {cookie["name"]: cookie["value"] for cookie in page.context.cookies(page.url)}
+    state = page.evaluate(APP_STATE_SCRIPT, CART_KEY)
+    state["user"] = cookies.get(SESSION_COOKIE)
+    return state
+
+
+def verify_seeded(page: Page, state: SeededState):
+    """Check the app accepted the seeded state the way it would after walking the UI"""
+    current = app_state(page)
+    assert current["user"] == state.user, f"Session should belong to {state.user}, got {current['user']}"
+    assert current["cart"] == list(state.cart), f"Cart should hold ids {list(state.cart)}, got {current['cart']}"
+    assert page.url.endswith(PAGES[state.at]), f"Should stay on {PAGES[state.at]}, got redirected to {page.url}"
+    if state.at == "checkout-complete":
+        return
+    # The header badge is rendered from the cart on every page behind login
+    badge = InventoryPage(page).get_cart_badge_count()
+    assert badge == str(len(state.cart)), f"Cart badge should show {len(state.cart)}, got {badge}"
+    if state.at in ("cart", "checkout-step-two"):
+        names = CartPage(page).get_cart_item_names()
+        assert names == state.cart_names, f"Cart should list {state.cart_names}, got {names}"
@@ -0,0 +1,101 @@
+import math
+import statistics
+from typing import Sequence
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    """Get percentile of samples by linear interpolation, fraction in 0..1"""
+    ordered = sorted(samples)
+    if not ordered:
+        raise ValueError("percentile of empty samples")
+    position = (len(ordered) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(samples: Sequence[float]) -> dict:
+    """Get count, median, p95, mean, variance, min and max of samples"""
+    return {
+        "count": len(samples),
+        "median": statistics.median(samples),
+        "p95": percentile(samples, 0.95),
+        "mean": statistics.fmean(samples),
+        "variance": statistics.variance(samples) if len(samples) > 1 else 0.0,
+        "min": min(samples),
+        "max": max(samples)
+    }
+
+
+def mann_whitney_u(baseline: Sequence[float], current: Sequence[float]) -> tuple:
+    """Get (U, one-sided p) that current tends to be larger than baseline
+
+    Uses the normal approximation with tie correction, which is reasonable from
+    about 8 samples per side.
+    """
+    n1 = len(baseline)
+    n2 = len(current)
+    if not n1 or not n2:
+        raise ValueError("mann_whitney_u needs samples on both sides")
+    combined = sorted([(value, 0) for value in baseline] + [(value, 1) for value in current])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        # Tied values share the average of their ranks
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tied = j - i + 1
+        tie_term += tied ** 3 - tied
+        i = j + 1
+    rank_sum = sum(rank for rank, (_, side) in zip(ranks, combined) if side == 1)
+    u = rank_sum - n2 * (n2 + 1) / 2
+    n = n1 + n2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))) if n > 1 else 0.0
+    if sigma == 0:
+        return u, 1.0
+    # Continuity correction towards the mean
+    z = (u - n1 * n2 / 2 - 0.5) / sigma
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram in ms, mergeable across processes, percentiles within 4%"""
+
+    GROWTH = 1.04
+    _LOG_GROWTH = math.log(GROWTH)
+
+    def __init__(self, counts: dict = None):
+        self.counts = {int(bucket): count for bucket, count in (counts or {}).items()}
+        self.total = sum(self.counts.values())
+
+    def record(self, ms: float):
+        """Add one latency"""
+        bucket = 0 if ms <= 1 else math.ceil(math.log(ms) / self._LOG_GROWTH)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add every latency of other"""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total += other.total
+
+    def percentile(self, fraction: float) -> float:
+        """Get upper bound of the bucket holding the percentile, fraction in 0..1"""
+        if not self.total:
+            return 0.0
+        rank = max(math.ceil(self.total * fraction), 1)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return self.GROWTH ** bucket
+        return self.GROWTH ** max(self.counts)
+
+    def to_dict(self) -> dict:
+        """Get JSON serializable bucket counts"""
+        return {str(bucket): count for bucket, count in sorted(self.counts.items())}
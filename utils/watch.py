@@ -0,0 +1,423 @@
+import argparse
+import ast
+import hashlib
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set
+
+import pytest
+from playwright.sync_api import sync_playwright
+
+
+ROOT = Path(__file__).resolve().parent.parent
+WATCHED = ("pages", "tests", "utils", "standin", "conftest.py")
+TESTS = "tests"
+CONFTEST = "conftest"
+# Plugin name conftest looks up to use the warm browser, standin and auth states
+WARM_SESSION = "warm-session"
+# Run these before the selection, after pytest.ini addopts are dropped
+DEFAULT_ARGS = ["-o", "addopts=", "-p", "no:html", "--tb=short", "-q"]
+SETTLE = 0.1
+
+
+def module_name(path: Path, root: Path = ROOT) -> str:
+    """Get dotted module name of a file below root"""
+    parts = list(path.relative_to(root).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def source_files(root: Path = ROOT) -> Dict[Path, float]:
+    """Get modification time of every watched Python file"""
+    files = {}
+    for entry in WATCHED:
+        path = root / entry
+        for source in ([path] if path.is_file() else path.rglob("*.py")):
+            try:
+                files[source] = source.stat().st_mtime
+            except FileNotFoundError:
+                continue
+    return files
+
+
+def imported_modules(path: Path, name: str) -> Set[str]:
+    """Get absolute names of everything path imports, submodules of from-imports included"""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    package = name if path.name == "__init__.py" else name.rpartition(".")[0]
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                anchor = package.split(".")[:len(package.split(".")) - node.level + 1]
+                base = ".".join(part for part in anchor + [base] if part)
+            names.add(base)
+            names.update(f"{base}.{alias.name}" for alias in node.names)
+    return names
+
+
+class ImportGraph:
+    """Which project modules each project module imports, directly or through others"""
+
+    def __init__(self, files: Iterable[Path], root: Path = ROOT):
+        self.paths = {module_name(path, root): path for path in files}
+        self.imports = {}
+        for name, path in self.paths.items():
+            try:
+                self.imports[name] = {module for module in imported_modules(path, name) if module in self.paths}
+            except SyntaxError:
+                # Mid-edit, the next save triggers another run
+                self.imports[name] = set()
+        self._closures = {}
+
+    def closure(self, name: str) -> Set[str]:
+        """Get every project module name imports, itself included"""
+        if name not in self._closures:
+            seen, stack = set(), [name]
+            while stack:
+                module = stack.pop()
+                if module not in seen:
+                    seen.add(module)
+                    stack.extend(self.imports.get(module, ()))
+            self._closures[name] = seen
+        return self._closures[name]
+
+    def test_modules(self) -> list:
+        """Get names of the test modules"""
+        return sorted(
+            name for name, path in self.paths.items()
+            if name.startswith(TESTS + ".") and path.name.startswith("test_")
+        )
+
+    def affected(self, changed: Set[str]) -> Optional[Set[str]]:
+        """Get test modules depending on changed modules, None when every test is affected
+
+        A test module depends on what it imports and on the modules the conftest fixtures it
+        requests reach. Modules used directly by conftest hooks, autouse fixtures or module-level
+        code affect every test, and so does anything else conftest imports that no test or
+        fixture reaches.
+        """
+        if CONFTEST in changed:
+            return None
+        tests = {name for name in self.test_modules() if self.closure(name) & changed}
+        if not changed & self.closure(CONFTEST):
+            return tests
+        usage = FixtureUsage(self.paths[CONFTEST], self)
+        fixtures = usage.affected(changed)
+        if fixtures is None:
+            return None
+        covered = usage.reached().union(*(self.closure(name) for name in self.test_modules()))
+        if changed & self.closure(CONFTEST) - covered:
+            return None
+        return tests | {name for name in self.test_modules() if requested_fixtures(self.paths[name]) & fixtures}
+
+
+def requested_fixtures(path: Path) -> Set[str]:
+    """Get names a test module may request as fixtures
+
+    Parameters of tests and fixtures, strings in decorators (usefixtures, indirect parametrize)
+    and getfixturevalue() arguments.
+    """
+    names = set()
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            for decorator in node.decorator_list:
+                names.update(
+                    constant.value for constant in ast.walk(decorator)
+                    if isinstance(constant, ast.Constant) and isinstance(constant.value, str)
+                )
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and (
+                node.name.startswith("test") or any("fixture" in ast.dump(decorator) for decorator in node.decorator_list)):
+            names.update(arg.arg for arg in node.args.args)
+        elif isinstance(node, ast.Call) and getattr(node.func, "attr", None) == "getfixturevalue" and node.args:
+            names.add(getattr(node.args[0], "value", None))
+    return names
+
+
+def referenced_names(node: ast.AST) -> Set[str]:
+    """Get names used below node, type parameters of subscripts aside"""
+    names = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, ast.Name):
+            names.add(current.id)
+        elif isinstance(current, ast.Subscript):
+            # pytest.StashKey[ContextPool]() only names a type
+            stack.append(current.value)
+            continue
+        stack.extend(ast.iter_child_nodes(current))
+    return names
+
+
+class FixtureUsage:
+    """Which project modules each conftest fixture reaches, through the helpers and fixtures it uses"""
+
+    def __init__(self, path: Path, graph: ImportGraph):
+        self.graph = graph
+        self.imported = {}
+        self.functions = {}
+        self.fixtures = set()
+        self.autouse = set()
+        self.module_level = set()
+        for node in ast.parse(path.read_text(encoding="utf-8")).body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                self._add_import(node)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.functions[node.name] = node
+                for decorator in node.decorator_list:
+                    target = decorator.func if isinstance(decorator, ast.Call) else decorator
+                    if getattr(target, "attr", getattr(target, "id", None)) != "fixture":
+                        continue
+                    self.fixtures.add(node.name)
+                    keywords = decorator.keywords if isinstance(decorator, ast.Call) else []
+                    if any(keyword.arg == "autouse" and getattr(keyword.value, "value", False) for keyword in keywords):
+                        self.autouse.add(node.name)
+            else:
+                self.module_level |= referenced_names(node)
+        self._uses = {}
+
+    def dependencies(self, name: str) -> Set[str]:
+        """Get helpers name refers to and fixtures it requests, by parameter or getfixturevalue()"""
+        node = self.functions[name]
+        helpers = {used for used in referenced_names(node) if used in self.functions and used not in self.fixtures}
+        requested = {arg.arg for arg in node.args.args} if name in self.fixtures else set()
+        for call in ast.walk(node):
+            if (isinstance(call, ast.Call) and getattr(call.func, "attr", None) == "getfixturevalue"
+                    and call.args and isinstance(call.args[0], ast.Constant)):
+                requested.add(call.args[0].value)
+        return helpers | (requested & self.fixtures)
+
+    def uses(self, name: str) -> Set[str]:
+        """Get conftest functions name depends on, directly or through others, itself included"""
+        if name not in self._uses:
+            seen, stack = set(), [name]
+            while stack:
+                current = stack.pop()
+                if current not in seen:
+                    seen.add(current)
+                    stack.extend(self.dependencies(current))
+            self._uses[name] = seen
+        return self._uses[name]
+
+    def modules(self, names: Set[str]) -> Set[str]:
+        """Get project modules the functions in names, and what they use, refer to"""
+        functions = set().union(*(self.uses(name) for name in names & set(self.functions)))
+        referenced = (names - set(self.functions)).union(*(referenced_names(self.functions[name]) for name in functions))
+        return {self.imported[name] for name in referenced & set(self.imported)}
+
+    def affected(self, changed: Set[str]) -> Optional[Set[str]]:
+        """Get fixtures reaching changed modules, None when hooks, autouse fixtures or module-level code use one"""
+        everywhere = {name for name in self.functions if name.startswith("pytest_")} | self.autouse
+        if self.modules(self.module_level | everywhere) & changed:
+            return None
+        fixtures = {
+            name for name in self.fixtures
+            if any(self.graph.closure(module) & changed for module in self.modules({name}))
+        }
+        if fixtures & self.autouse:
+            return None
+        return fixtures
+
+    def reached(self) -> Set[str]:
+        """Get project modules some fixture depends on"""
+        return set().union(*(self.graph.closure(module) for module in self.modules(self.fixtures)))
+
+    def _add_import(self, node):
+        """Map names bound by an import to the project module they come from"""
+        for alias in node.names:
+            if isinstance(node, ast.Import):
+                module, bound = alias.name, alias.asname or alias.name.partition(".")[0]
+            else:
+                base = node.module or ""
+                module = f"{base}.{alias.name}" if f"{base}.{alias.name}" in self.graph.paths else base
+                bound = alias.asname or alias.name
+            if module in self.graph.paths:
+                self.imported[bound] = module
+
+
+def test_shapes(path: Path) -> dict:
+    """Get a hash of every test function of a test module and one of everything else
+
+    Comments and formatting don't change the hashes.
+    """
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    tests, rest = {}, []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name.startswith("test"):
+            tests[node.name] = ast.dump(node)
+        elif isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
+            members = []
+            for member in node.body:
+                if isinstance(member, ast.FunctionDef) and member.name.startswith("test"):
+                    tests[f"{node.name}::{member.name}"] = ast.dump(member)
+                else:
+                    members.append(ast.dump(member))
+            rest.append(ast.dump(ast.ClassDef(
+                name=node.name, bases=node.bases, keywords=node.keywords, body=[], decorator_list=node.decorator_list
+            )) + "".join(members))
+        else:
+            rest.append(ast.dump(node))
+    return {"module": digest("".join(rest)), "tests": {key: digest(text) for key, text in tests.items()}}
+
+
+def digest(text: str) -> str:
+    """Get short stable hash of text"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class WarmSession:
+    """Browser, stand-in servers and login states kept open across the runs of the watch runner"""
+
+    __name__ = WARM_SESSION
+
+    def __init__(self, headless: bool = True):
+        self.directory = Path(tempfile.mkdtemp(prefix="watch-"))
+        self.playwright = sync_playwright().start()
+        self.browser = self.playwright.chromium.launch(headless=headless)
+        self._kept = {}
+
+    def keep(self, key, create: Callable):
+        """Get object kept under key, creating it on first use"""
+        if key not in self._kept:
+            self._kept[key] = create()
+        return self._kept[key]
+
+    def new_directory(self) -> Path:
+        """Get an empty directory that lives as long as the runner"""
+        return Path(tempfile.mkdtemp(dir=self.directory))
+
+    def close(self):
+        """Stop kept servers and the browser"""
+        for kept in self._kept.values():
+            stop = getattr(kept, "stop", None)
+            if stop is not None:
+                stop()
+        self.browser.close()
+        self.playwright.stop()
+
+
+class Watcher:
+    """Reruns the tests affected by each save in one warm process"""
+
+    def __init__(self, pytest_args: list, interval: float = 0.2, root: Path = ROOT, headless: bool = True):
+        self.pytest_args = pytest_args
+        self.interval = interval
+        self.root = root
+        self.headless = headless
+        self.warm = None
+        self.mtimes = source_files(root)
+        self.shapes = {path: self._shape(path) for path in self.mtimes if self._is_test(path)}
+
+    def selection(self, changed: Set[Path]) -> Optional[list]:
+        """Get node ids or files to run for changed files, None for the whole suite"""
+        graph = ImportGraph(self.mtimes, self.root)
+        modules = {module_name(path, self.root) for path in changed}
+        affected = graph.affected(modules)
+        if affected is None:
+            return None
+        selection = []
+        for name in sorted(affected):
+            path = graph.paths[name]
+            relative = path.relative_to(self.root).as_posix()
+            previous, current = self.shapes.get(path), self._shape(path)
+            self.shapes[path] = current
+            imports_changed = graph.closure(name) & (modules - {name})
+            only_tests_changed = (
+                path in changed and not imports_changed and previous is not None and current is not None
+                and previous["module"] == current["module"]
+            )
+            if not only_tests_changed:
+                selection.append(relative)
+                continue
+            # Only test functions of this file changed, run just those
+            selection.extend(
+                f"{relative}::{key}" for key, digest in sorted(current["tests"].items())
+                if previous["tests"].get(key) != digest
+            )
+        return selection
+
+    def run(self, selection: Optional[list]) -> int:
+        """Run selection in this process with the warm browser, fresh project modules and a fresh conftest"""
+        if self.warm is None:
+            self.warm = WarmSession(self.headless)
+        for name in [name for name, module in sys.modules.items() if self._is_project_module(module)]:
+            del sys.modules[name]
+        start = time.perf_counter()
+        args = DEFAULT_ARGS + self.pytest_args + (selection if selection is not None else [TESTS])
+        exit_code = pytest.main(args, plugins=[self.warm])
+        print(f"\n[watch] {'all tests' if selection is None else ' '.join(selection)} "
+              f"finished in {time.perf_counter() - start:.2f} s, waiting for changes")
+        return exit_code
+
+    def changes(self) -> Set[Path]:
+        """Get files added, modified or removed since the last call, once saving has settled"""
+        current = source_files(self.root)
+        changed = {path for path in current.keys() | self.mtimes.keys() if current.get(path) != self.mtimes.get(path)}
+        if changed:
+            time.sleep(SETTLE)
+            current = source_files(self.root)
+        self.mtimes = current
+        return {path for path in changed if path in current}
+
+    def loop(self, run_first: bool = False):
+        """Watch until interrupted"""
+        print(f"[watch] watching {len(self.mtimes)} files below {self.root}")
+        if run_first:
+            self.run(None)
+        try:
+            while True:
+                changed = self.changes()
+                if changed:
+                    selection = self.selection(changed)
+                    if selection == []:
+                        print(f"[watch] no test affected by {', '.join(sorted(path.name for path in changed))}")
+                    else:
+                        self.run(selection)
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if self.warm is not None:
+                self.warm.close()
+
+    def _is_test(self, path: Path) -> bool:
+        """Check if path is a test module"""
+        return path.name.startswith("test_") and path.parent.name == TESTS
+
+    def _shape(self, path: Path) -> Optional[dict]:
+        """Get test shapes of a test module, None when it can't be parsed or is gone"""
+        try:
+            return test_shapes(path) if self._is_test(path) else None
+        except (OSError, SyntaxError):
+            return None
+
+    def _is_project_module(self, module) -> bool:
+        """Check if module was loaded from the watched tree and should be re-imported, this module aside"""
+        path = getattr(module, "__file__", None)
+        if path is None or module is sys.modules.get(__name__):
+            return False
+        path = Path(path).resolve()
+        return any(path == self.root / entry or (self.root / entry) in path.parents for entry in WATCHED)
+
+
+def main() -> int:
+    """Watch the tree and rerun affected tests on every save"""
+    parser = argparse.ArgumentParser(
+        description="Rerun affected tests on save with a warm browser, other arguments go to pytest"
+    )
+    parser.add_argument("--interval", type=float, default=0.2, help="Seconds between scans of the tree")
+    parser.add_argument("--run-first", action="store_true", help="Run the whole suite before watching")
+    parser.add_argument("--headed", action="store_true", help="Show the warm browser")
+    args, pytest_args = parser.parse_known_args()
+    Watcher(pytest_args, args.interval, headless=not args.headed).loop(args.run_first)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import json
+import time
+from pathlib import Path
+from typing import List
+
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutPage
+from pages.inventory_page import InventoryPage
+from pages.login_page import LoginPage
+from utils.stats import percentile
+
+
+PAGE_OBJECTS = (LoginPage, InventoryPage, CartPage, CheckoutPage)
+# Record fields summarized per page, times in ms
+METRICS = ("ttfb", "domContentLoaded", "load", "render", "lcp", "cls", "longTaskMs", "resourceBytes")
+ANY_PAGE = "*"
+
+
+def page_object_name(path: str) -> str:
+    """Get name of the page object owning URL path, the path itself when none does"""
+    for page_object in PAGE_OBJECTS:
+        if path in page_object.PATHS:
+            return page_object.__name__
+    return path
+
+
+class PerformanceBudgets:
+    """Upper limits per page object, URL path or every page ("*") for web vitals metrics"""
+
+    def __init__(self, budgets: dict):
+        unknown = {
+            metric for limits in budgets.values() for metric in limits if metric not in METRICS
+        }
+        if unknown:
+            raise ValueError(f"Unknown budget metrics {sorted(unknown)}, expected some of {METRICS}")
+        self.budgets = budgets
+
+    @classmethod
+    def load(cls, path: str) -> "PerformanceBudgets":
+        """Load budgets from a JSON file"""
+        with open(path, encoding="utf-8") as budgets_file:
+            return cls(json.load(budgets_file))
+
+    def violations(self, records: List[dict]) -> List[str]:
+        """Get a message for every metric of every record over its budget"""
+        messages = []
+        for record in records:
+            page = page_object_name(record["path"])
+            for key in (ANY_PAGE, page, record["path"]):
+                for metric, limit in self.budgets.get(key, {}).items():
+                    value = record.get(metric)
+                    if value is not None and value > limit:
+                        messages.append(
+                            f"{page} {record['kind']} navigation to {record['path']}: "
+                            f"{metric} {round(value, 3):g} over budget {limit:g}"
+                        )
+        return messages
+
+
+class WebVitalsSummary:
+    """Run-wide web vitals per page object, registered as a plugin on the controller"""
+
+    def __init__(self, json_path: str, history_path: str = None):
+        self.json_path = Path(json_path)
+        self.history_path = Path(history_path) if history_path else None
+        self.records = []
+
+    def add(self, nodeid: str, records: List[dict]):
+        """Keep records of one test"""
+        self.records.extend(dict(record, test=nodeid, page=page_object_name(record["path"])) for record in records)
+
+    def pages(self) -> dict:
+        """Get navigation count and median/p95/max of every metric per page object"""
+        grouped = {}
+        for record in self.records:
+            grouped.setdefault(record["page"], []).append(record)
+        pages = {}
+        for page, records in sorted(grouped.items()):
+            summary = {
+                "navigations": len(records),
+                "hard": sum(record["kind"] == "hard" for record in records),
+                "paths": sorted({record["path"] for record in records})
+            }
+            for metric in METRICS:
+                values = [record[metric] for record in records if record.get(metric) is not None]
+                if values:
+                    summary[metric] = {
+                        "median": percentile(values, 0.5),
+                        "p95": percentile(values, 0.95),
+                        "max": max(values)
+                    }
+            pages[page] = summary
+        return pages
+
+    def write(self):
+        """Write run summary with raw records and append medians to the history file"""
+        pages = self.pages()
+        self.json_path.parent.mkdir(parents=True, exist_ok=True)
+        self.json_path.write_text(json.dumps({"pages": pages, "records": self.records}, indent=2), encoding="utf-8")
+        if self.history_path is not None:
+            entry = {
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "pages": {
+                    page: {metric: values["median"] for metric, values in summary.items() if metric in METRICS}
+                    for page, summary in pages.items()
+                }
+            }
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.history_path.open("a", encoding="utf-8") as history:
+                history.write(json.dumps(entry) + "\n")
+
+    def pytest_runtest_logreport(self, report):
+        """Collect records attached to the teardown report, on this process or an xdist worker"""
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == "web_vitals":
+                self.add(report.nodeid, value)
+
+    def pytest_sessionfinish(self):
+        """Export run summary"""
+        if self.records:
+            self.write()